@@ -46,6 +46,12 @@ def run_migrations_online() -> None:
     In this mode, the migrations are run directly against the database,
     making actual changes to the schema.
     """
+    # Callers (e.g. tests) may hand us an open connection to migrate
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_migrations_with(connection)
+        return
+
     # Create an engine configuration with our settings
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
@@ -54,16 +60,19 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        # Configure the migration context with our connection
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            render_as_batch=True  # Enable SQLite batch mode for alterations
-        )
+        run_migrations_with(connection)
+
+def run_migrations_with(connection) -> None:
+    # Configure the migration context with our connection
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=True  # Enable SQLite batch mode for alterations
+    )
 
-        # Run the migrations within a transaction
-        with context.begin_transaction():
-            context.run_migrations()
+    # Run the migrations within a transaction
+    with context.begin_transaction():
+        context.run_migrations()
 
 # Determine how to run the migrations
 if context.is_offline_mode():
@@ -0,0 +1,55 @@
+"""add_notification_retry_tables
+
+Revision ID: 3b7d1f9a2c41
+Revises: e0ac2030be76
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d1f9a2c41'
+down_revision: Union[str, None] = 'e0ac2030be76'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_retries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=64), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=32), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notification_retries_id', 'notification_retries', ['id'])
+    op.create_index('ix_notification_retries_next_attempt_at', 'notification_retries', ['next_attempt_at'])
+    op.create_index('ix_notification_retries_locked_by', 'notification_retries', ['locked_by'])
+
+    op.create_table(
+        'notification_dead_letters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=64), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('failed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notification_dead_letters_id', 'notification_dead_letters', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_table('notification_dead_letters')
+    op.drop_table('notification_retries')
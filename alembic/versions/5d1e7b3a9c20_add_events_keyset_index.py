@@ -0,0 +1,26 @@
+"""add_events_keyset_index
+
+Revision ID: 5d1e7b3a9c20
+Revises: 8c2e4a6f1d93
+Create Date: 2026-10-19 11:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e7b3a9c20'
+down_revision: Union[str, None] = '8c2e4a6f1d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_events_user_id_start_time_id', 'events', ['user_id', 'start_time', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_user_id_start_time_id', table_name='events')
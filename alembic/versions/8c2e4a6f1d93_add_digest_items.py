@@ -0,0 +1,41 @@
+"""add_digest_items
+
+Revision ID: 8c2e4a6f1d93
+Revises: 3b7d1f9a2c41
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2e4a6f1d93'
+down_revision: Union[str, None] = '3b7d1f9a2c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'digest_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('event_title', sa.String(length=255), nullable=False),
+        sa.Column('event_time', sa.DateTime(), nullable=False),
+        sa.Column('attendee_name', sa.String(length=255), nullable=True),
+        sa.Column('attendee_email', sa.String(length=255), nullable=True),
+        sa.Column('detail', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_digest_items_id', 'digest_items', ['id'])
+    op.create_index('ix_digest_items_user_id', 'digest_items', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_table('digest_items')
@@ -0,0 +1,31 @@
+"""add_hot_path_indexes
+
+Revision ID: a4f08c6e2b17
+Revises: 5d1e7b3a9c20
+Create Date: 2026-10-19 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f08c6e2b17'
+down_revision: Union[str, None] = '5d1e7b3a9c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Overlap checks per host and per event type
+    op.create_index('ix_events_user_id_end_time_start_time', 'events', ['user_id', 'end_time', 'start_time'])
+    op.create_index(
+        'ix_events_event_type_id_end_time_start_time', 'events', ['event_type_id', 'end_time', 'start_time']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_event_type_id_end_time_start_time', table_name='events')
+    op.drop_index('ix_events_user_id_end_time_start_time', table_name='events')
@@ -0,0 +1,83 @@
+"""scrub_notification_payloads
+
+Revision ID: a6c1e8f3b925
+Revises: f7d2a9c4e183
+Create Date: 2026-10-20 09:00:00.000000
+
+Retry payloads used to carry the host's email_settings/sms_settings,
+SMTP password and Twilio token included. Senders now take the host's
+user_id instead, so those keys are removed. Pending retries that had them
+cannot be sent without the host id and become dead letters.
+"""
+import json
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c1e8f3b925'
+down_revision: Union[str, None] = 'f7d2a9c4e183'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SECRET_ARGUMENTS = ('email_settings', 'sms_settings')
+
+retries = sa.table(
+    'notification_retries',
+    sa.column('id', sa.Integer),
+    sa.column('kind', sa.String),
+    sa.column('payload', sa.JSON),
+    sa.column('attempts', sa.Integer),
+    sa.column('last_error', sa.Text),
+    sa.column('created_at', sa.DateTime),
+)
+dead_letters = sa.table(
+    'notification_dead_letters',
+    sa.column('id', sa.Integer),
+    sa.column('kind', sa.String),
+    sa.column('payload', sa.JSON),
+    sa.column('attempts', sa.Integer),
+    sa.column('last_error', sa.Text),
+    sa.column('created_at', sa.DateTime),
+    sa.column('failed_at', sa.DateTime),
+)
+
+
+def _load(payload):
+    return json.loads(payload) if isinstance(payload, str) else payload
+
+
+def _scrub(payload: dict) -> dict:
+    return {key: value for key, value in payload.items() if key not in SECRET_ARGUMENTS}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    now = datetime.utcnow()
+
+    for row in conn.execute(sa.select(retries)).all():
+        payload = _load(row.payload)
+        if not any(key in payload for key in SECRET_ARGUMENTS):
+            continue
+        conn.execute(dead_letters.insert().values(
+            kind=row.kind,
+            payload=_scrub(payload),
+            attempts=row.attempts,
+            last_error=f"Stored credentials removed, resend manually (last error: {row.last_error})",
+            created_at=row.created_at,
+            failed_at=now
+        ))
+        conn.execute(retries.delete().where(retries.c.id == row.id))
+
+    for row in conn.execute(sa.select(dead_letters.c.id, dead_letters.c.payload)).all():
+        payload = _load(row.payload)
+        if any(key in payload for key in SECRET_ARGUMENTS):
+            conn.execute(dead_letters.update().where(dead_letters.c.id == row.id).values(payload=_scrub(payload)))
+
+
+def downgrade() -> None:
+    # The removed credentials are gone for good
+    pass
@@ -0,0 +1,31 @@
+"""add_digest_item_leases
+
+Revision ID: b4d8f2a6c310
+Revises: a6c1e8f3b925
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d8f2a6c310'
+down_revision: Union[str, None] = 'a6c1e8f3b925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('digest_items', sa.Column('locked_by', sa.String(length=32), nullable=True))
+    op.add_column('digest_items', sa.Column('locked_until', sa.DateTime(), nullable=True))
+    op.create_index('ix_digest_items_locked_by', 'digest_items', ['locked_by'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_digest_items_locked_by', table_name='digest_items')
+    with op.batch_alter_table('digest_items') as batch_op:
+        batch_op.drop_column('locked_until')
+        batch_op.drop_column('locked_by')
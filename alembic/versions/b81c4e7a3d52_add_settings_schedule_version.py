@@ -0,0 +1,28 @@
+"""add_settings_schedule_version
+
+Revision ID: b81c4e7a3d52
+Revises: f3a9d2c8b614
+Create Date: 2026-10-19 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81c4e7a3d52'
+down_revision: Union[str, None] = 'f3a9d2c8b614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('settings') as batch_op:
+        batch_op.add_column(sa.Column('schedule_version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('settings') as batch_op:
+        batch_op.drop_column('schedule_version')
@@ -0,0 +1,62 @@
+"""add_events_full_text_search
+
+Revision ID: c7b25e9d4f61
+Revises: a4f08c6e2b17
+Create Date: 2026-10-19 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7b25e9d4f61'
+down_revision: Union[str, None] = 'a4f08c6e2b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "title, description, attendee_name, attendee_email"
+# user_id is indexed too (with zero rank weight) so searches can be scoped to one host
+FTS_COLUMNS = f"user_id, {COLUMNS}"
+NEW_VALUES = "new.user_id, new.title, new.description, new.attendee_name, new.attendee_email"
+OLD_VALUES = "old.user_id, old.title, old.description, old.attendee_name, old.attendee_email"
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+            f"{FTS_COLUMNS}, content='events', content_rowid='id')"
+        )
+        op.execute("INSERT INTO events_fts(events_fts, rank) VALUES ('rank', 'bm25(0.0, 1.0, 1.0, 1.0, 1.0)')")
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN "
+            f"INSERT INTO events_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN "
+            f"INSERT INTO events_fts(events_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF {FTS_COLUMNS} ON events BEGIN "
+            f"INSERT INTO events_fts(events_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES}); "
+            f"INSERT INTO events_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+        )
+        # Index the events that already exist
+        op.execute("INSERT INTO events_fts(events_fts) VALUES ('rebuild')")
+    elif dialect in ('mysql', 'mariadb'):
+        op.execute(f"CREATE FULLTEXT INDEX ft_events_search ON events ({COLUMNS})")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS events_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS events_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS events_fts_ai")
+        op.execute("DROP TABLE IF EXISTS events_fts")
+    elif dialect in ('mysql', 'mariadb'):
+        op.drop_index('ft_events_search', table_name='events')
@@ -0,0 +1,90 @@
+"""make_event_ids_monotonic
+
+Revision ID: c8f1a5e3d207
+Revises: b4d8f2a6c310
+Create Date: 2026-10-20 11:00:00.000000
+
+Archived events keep their id, but SQLite reused the ids of rows deleted
+from the top of `events`, so a new event could take an archived event's
+id. Archiving it then failed on the archive's primary key. Archive rows
+that already collide with a live event get fresh ids, and `events`
+switches to AUTOINCREMENT (on MySQL/PostgreSQL the counter is moved past
+the archive) so no id is handed out twice again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f1a5e3d207'
+down_revision: Union[str, None] = 'b4d8f2a6c310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FTS_COLUMNS = "user_id, title, description, attendee_name, attendee_email"
+NEW_VALUES = "new.user_id, new.title, new.description, new.attendee_name, new.attendee_email"
+OLD_VALUES = "old.user_id, old.title, old.description, old.attendee_name, old.attendee_email"
+
+
+def _highest_id(conn) -> int:
+    return conn.execute(sa.text(
+        "SELECT max(coalesce((SELECT max(id) FROM events), 0), coalesce((SELECT max(id) FROM events_archive), 0))"
+    )).scalar()
+
+
+def _create_fts_triggers() -> None:
+    # Dropped along with the old table when SQLite rebuilds `events`
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN "
+        f"INSERT INTO events_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN "
+        f"INSERT INTO events_fts(events_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF {FTS_COLUMNS} ON events BEGIN "
+        f"INSERT INTO events_fts(events_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES}); "
+        f"INSERT INTO events_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    dialect = conn.dialect.name
+
+    # The live event keeps the id its attendees know; the shadowed archive row moves
+    colliding = conn.execute(sa.text(
+        "SELECT events_archive.id FROM events_archive JOIN events ON events.id = events_archive.id"
+    )).scalars().all()
+    next_id = _highest_id(conn)
+    for old_id in colliding:
+        next_id += 1
+        conn.execute(sa.text("UPDATE events_archive SET id = :new WHERE id = :old"), {"new": next_id, "old": old_id})
+    if colliding and dialect == 'sqlite':
+        # The FTS triggers don't fire on id changes
+        op.execute("INSERT INTO events_archive_fts(events_archive_fts) VALUES ('rebuild')")
+
+    highest = _highest_id(conn)
+    if dialect == 'sqlite':
+        with op.batch_alter_table('events', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+        _create_fts_triggers()
+        op.execute("DELETE FROM sqlite_sequence WHERE name = 'events'")
+        conn.execute(sa.text("INSERT INTO sqlite_sequence (name, seq) VALUES ('events', :seq)"), {"seq": highest})
+    elif dialect in ('mysql', 'mariadb'):
+        op.execute(f"ALTER TABLE events AUTO_INCREMENT = {int(highest) + 1}")
+    elif dialect == 'postgresql':
+        conn.execute(
+            sa.text("SELECT setval(pg_get_serial_sequence('events', 'id'), :seq)"), {"seq": max(highest, 1)}
+        )
+
+
+def downgrade() -> None:
+    # Renumbered archive rows keep their new ids
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('events', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+            pass
+        _create_fts_triggers()
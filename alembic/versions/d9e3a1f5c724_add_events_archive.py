@@ -0,0 +1,93 @@
+"""add_events_archive
+
+Revision ID: d9e3a1f5c724
+Revises: b81c4e7a3d52
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e3a1f5c724'
+down_revision: Union[str, None] = 'b81c4e7a3d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "title, description, attendee_name, attendee_email"
+FTS_COLUMNS = f"user_id, {COLUMNS}"
+NEW_VALUES = "new.user_id, new.title, new.description, new.attendee_name, new.attendee_email"
+OLD_VALUES = "old.user_id, old.title, old.description, old.attendee_name, old.attendee_email"
+
+
+def upgrade() -> None:
+    op.create_table(
+        'events_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('event_type_id', sa.Integer(), nullable=True),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('attendee_name', sa.String(length=255), nullable=True),
+        sa.Column('attendee_email', sa.String(length=255), nullable=True),
+        sa.Column('attendee_phone', sa.String(length=255), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('answers', sa.JSON(), nullable=True),
+        sa.Column('is_confirmed', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_events_archive_user_id_start_time_id', 'events_archive', ['user_id', 'start_time', 'id']
+    )
+
+    # The archiver selects by end_time; databases bootstrapped by create_all lack this index
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('events')}
+    if 'ix_events_end_time' not in existing:
+        op.create_index('ix_events_end_time', 'events', ['end_time'])
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS events_archive_fts USING fts5("
+            f"{FTS_COLUMNS}, content='events_archive', content_rowid='id')"
+        )
+        op.execute(
+            "INSERT INTO events_archive_fts(events_archive_fts, rank) "
+            "VALUES ('rank', 'bm25(0.0, 1.0, 1.0, 1.0, 1.0)')"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS events_archive_fts_ai AFTER INSERT ON events_archive BEGIN "
+            f"INSERT INTO events_archive_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS events_archive_fts_ad AFTER DELETE ON events_archive BEGIN "
+            f"INSERT INTO events_archive_fts(events_archive_fts, rowid, {FTS_COLUMNS}) "
+            f"VALUES ('delete', old.id, {OLD_VALUES}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS events_archive_fts_au AFTER UPDATE OF {FTS_COLUMNS} ON events_archive BEGIN "
+            f"INSERT INTO events_archive_fts(events_archive_fts, rowid, {FTS_COLUMNS}) "
+            f"VALUES ('delete', old.id, {OLD_VALUES}); "
+            f"INSERT INTO events_archive_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+        )
+    elif dialect in ('mysql', 'mariadb'):
+        op.execute(f"CREATE FULLTEXT INDEX ft_events_archive_search ON events_archive ({COLUMNS})")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS events_archive_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS events_archive_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS events_archive_fts_ai")
+        op.execute("DROP TABLE IF EXISTS events_archive_fts")
+    op.drop_index('ix_events_archive_user_id_start_time_id', table_name='events_archive')
+    op.drop_table('events_archive')
@@ -0,0 +1,68 @@
+"""hash_api_tokens
+
+Revision ID: e2c6f4a8b935
+Revises: d9e3a1f5c724
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c6f4a8b935'
+down_revision: Union[str, None] = 'd9e3a1f5c724'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREFIX_LENGTH = 8
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tokens') as batch_op:
+        batch_op.add_column(sa.Column('prefix', sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column('token_hash', sa.String(length=64), nullable=True))
+
+    # Backfill digests from the plaintext tokens, which are then dropped
+    bind = op.get_bind()
+    tokens = sa.table(
+        'tokens', sa.column('id'), sa.column('token'), sa.column('prefix'), sa.column('token_hash')
+    )
+    rows = bind.execute(sa.select(tokens.c.id, tokens.c.token).where(tokens.c.token.isnot(None))).all()
+    if rows:
+        bind.execute(
+            tokens.update().where(tokens.c.id == sa.bindparam('token_id')).values(
+                prefix=sa.bindparam('new_prefix'), token_hash=sa.bindparam('new_hash')
+            ),
+            [
+                {
+                    'token_id': token_id,
+                    'new_prefix': token[:PREFIX_LENGTH],
+                    'new_hash': hashlib.sha256(token.encode()).hexdigest()
+                }
+                for token_id, token in rows
+            ]
+        )
+    bind.execute(tokens.delete().where(tokens.c.token_hash.is_(None)))
+
+    with op.batch_alter_table('tokens') as batch_op:
+        batch_op.drop_index('ix_tokens_token')
+        batch_op.drop_column('token')
+        batch_op.alter_column('prefix', existing_type=sa.String(length=16), nullable=False)
+        batch_op.alter_column('token_hash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_index('ix_tokens_prefix', ['prefix'])
+
+
+def downgrade() -> None:
+    # Plaintext tokens cannot be recovered; existing tokens stop working
+    bind = op.get_bind()
+    bind.execute(sa.text("DELETE FROM tokens"))
+    with op.batch_alter_table('tokens') as batch_op:
+        batch_op.drop_index('ix_tokens_prefix')
+        batch_op.drop_column('token_hash')
+        batch_op.drop_column('prefix')
+        batch_op.add_column(sa.Column('token', sa.String(length=255), nullable=True))
+        batch_op.create_index('ix_tokens_token', ['token'], unique=True)
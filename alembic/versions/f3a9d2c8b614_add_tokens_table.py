@@ -0,0 +1,46 @@
+"""add_tokens_table
+
+Revision ID: f3a9d2c8b614
+Revises: c7b25e9d4f61
+Create Date: 2026-10-19 13:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9d2c8b614'
+down_revision: Union[str, None] = 'c7b25e9d4f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases that were bootstrapped by create_all at import already have the
+    # table (but not the user_id index, which create_all never adds afterwards)
+    inspector = sa.inspect(op.get_bind())
+    if 'tokens' not in inspector.get_table_names():
+        op.create_table(
+            'tokens',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('token', sa.String(length=255), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_tokens_id', 'tokens', ['id'])
+        op.create_index('ix_tokens_token', 'tokens', ['token'], unique=True)
+
+    existing = {index['name'] for index in inspector.get_indexes('tokens')}
+    if 'ix_tokens_user_id' not in existing:
+        op.create_index('ix_tokens_user_id', 'tokens', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tokens_user_id', table_name='tokens')
+    op.drop_index('ix_tokens_token', table_name='tokens')
+    op.drop_index('ix_tokens_id', table_name='tokens')
+    op.drop_table('tokens')
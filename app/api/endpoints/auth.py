@@ -1,24 +1,48 @@
 # backend/app/api/endpoints/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from typing import Annotated, Any
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, Any, Optional
 from ...db.database import get_db
-from ...core.auth import verify_password, create_access_token, get_password_hash, get_current_user
-from ...schemas.auth import User, UserCreate, Token, UserMe
+from ...core.auth import create_access_token, get_current_user, get_current_user_with_profile, token_family
+from ...core.config import get_settings
+from ...core.refresh_tokens import (
+    RefreshTokenError, family_of_refresh_token, issue_refresh_token, new_family_id, revoke_family, rotate_refresh_token
+)
+from ...core.rate_limit import limit_login, limit_signup
+from ...core.password_hashing import PasswordHashingBusy, hash_password, verify_password
+from ...schemas.auth import User, UserCreate, Token, UserMe, RefreshRequest
 from ...models.user import User as UserModel
-from ...schemas.token import Token as TokenSchema
+from ...core.api_tokens import forget_api_token, new_api_token
+from ...schemas.token import Token as TokenSchema, NewToken as NewTokenSchema
 from ...models.token import Token as TokenModel
-import secrets
 
 router = APIRouter()
+settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
-@router.post("/signup", response_model=User)
-async def signup(user: UserCreate, db: Session = Depends(get_db)):
+def _token_pair(email: str, family_id: str, refresh_token: str) -> dict:
+    return {
+        "access_token": create_access_token(data={"sub": email, "fam": family_id}),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, try again shortly",
+        headers={"Retry-After": "1"}
+    )
+
+@router.post("/signup", response_model=User, dependencies=[Depends(limit_signup)])
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_db)):
     try:
         # Check if user already exists
-        db_user = db.query(UserModel).filter(UserModel.email == user.email).first()
+        db_user = await db.scalar(select(UserModel).where(UserModel.email == user.email).limit(1))
         if db_user:
             raise HTTPException(
                 status_code=400,
@@ -26,7 +50,7 @@ async def signup(user: UserCreate, db: Session = Depends(get_db)):
             )
         
         # Create new user
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await hash_password(user.password)
         db_user = UserModel(
             email=user.email,
             hashed_password=hashed_password,
@@ -34,24 +58,34 @@ async def signup(user: UserCreate, db: Session = Depends(get_db)):
         )
         
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         
         return db_user
+    except HTTPException:
+        raise
+    except PasswordHashingBusy:
+        raise _busy()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=str(e)
         )
 
-@router.post("/token", response_model=Token)
+@router.post("/token", response_model=Token, dependencies=[Depends(limit_login)])
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    user = db.query(UserModel).filter(UserModel.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await db.scalar(select(UserModel).where(UserModel.email == form_data.username).limit(1))
+    matches, new_hash = False, None
+    if user:
+        try:
+            matches, new_hash = await verify_password(form_data.password, user.hashed_password)
+        except PasswordHashingBusy:
+            raise _busy()
+    if not matches:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -65,8 +99,54 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = create_access_token(data={"sub": user.email})
-    return {"access_token": access_token, "token_type": "bearer"}
+    # Stored with a different bcrypt cost than configured: keep the fresh hash
+    if new_hash:
+        user.hashed_password = new_hash
+
+    # A new session: refreshing it from here on needs no password
+    family_id = new_family_id()
+    refresh_token = issue_refresh_token(db, user.id, family_id)
+    await db.commit()
+    return _token_pair(user.email, family_id, refresh_token)
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    body: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Exchange a refresh token for a new access/refresh token pair"""
+    try:
+        email, family_id, refresh_token = await rotate_refresh_token(db, body.refresh_token)
+    except RefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return _token_pair(email, family_id, refresh_token)
+
+@router.post("/logout")
+async def logout(
+    body: Optional[RefreshRequest] = None,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    """End the session of the given refresh token, or of the bearer access token"""
+    family_id = None
+    if body:
+        family_id = await family_of_refresh_token(db, body.refresh_token)
+    elif token:
+        family_id = token_family(token)
+    if not family_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No session to log out of",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    await revoke_family(db, family_id)
+    await db.commit()
+    return {"message": "Logged out"}
 
 @router.get("/verify-token", response_model=dict)
 async def verify_token(
@@ -86,18 +166,19 @@ async def verify_token(
 
 @router.get("/me", response_model=UserMe)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: UserModel = Depends(get_current_user_with_profile)
 ) -> Any:
     """
     Get current user information
     """
     try:
+        profile = current_user.profile
         return {
             "valid": True,
             "id": current_user.id,
             "email": current_user.email,
-            "name": current_user.profile.full_name if current_user.profile else None,
-            "phone": current_user.profile.phone if current_user.profile else None,
+            "name": profile.full_name if profile else None,
+            "phone": profile.phone if profile else None,
             "is_active": current_user.is_active
         }
     except Exception as e:
@@ -106,29 +187,30 @@ async def get_current_user_info(
             detail=f"Error fetching user data: {str(e)}"
         )
         
-@router.post("/generate-permanent-token", response_model=TokenSchema)
+@router.post("/generate-permanent-token", response_model=NewTokenSchema)
 async def generate_permanent_token(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Generate a permanent API token for external applications"""
     try:
-        # Generate a secure random token
-        token_str = secrets.token_hex(32)
+        # Generate a secure random token; only its digest is stored
+        token_str, prefix, token_hash = new_api_token()
         
         # Create token record
         token = TokenModel(
             user_id=current_user.id,
-            token=token_str
+            prefix=prefix,
+            token_hash=token_hash
         )
         
         db.add(token)
-        db.commit()
-        db.refresh(token)
+        await db.commit()
+        await db.refresh(token)
         
-        return token
+        return {"id": token.id, "user_id": token.user_id, "prefix": token.prefix, "token": token_str}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error generating token: {str(e)}"
@@ -137,25 +219,25 @@ async def generate_permanent_token(
 @router.get("/list-tokens", response_model=list[TokenSchema])
 async def list_tokens(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """List all permanent tokens for the current user"""
-    tokens = db.query(TokenModel).filter(
+    tokens = (await db.scalars(select(TokenModel).where(
         TokenModel.user_id == current_user.id
-    ).all()
+    ))).all()
     return tokens
 
 @router.delete("/revoke-token/{token_id}")
 async def revoke_token(
     token_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Revoke a specific permanent token"""
-    token = db.query(TokenModel).filter(
+    token = await db.scalar(select(TokenModel).where(
         TokenModel.id == token_id,
         TokenModel.user_id == current_user.id
-    ).first()
+    ).limit(1))
     
     if not token:
         raise HTTPException(
@@ -164,11 +246,12 @@ async def revoke_token(
         )
     
     try:
-        db.delete(token)
-        db.commit()
+        await db.delete(token)
+        await db.commit()
+        forget_api_token(token.token_hash)
         return {"message": "Token revoked successfully"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error revoking token: {str(e)}"
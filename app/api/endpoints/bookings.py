@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Any
 from datetime import datetime, timedelta
 from ...db.database import get_db
@@ -13,11 +14,11 @@ router = APIRouter()
 
 
 @router.post("/bookings", response_model=BookingResponse)
-async def create_booking(booking: BookingCreate, db: Session = Depends(get_db)) -> Any:
+async def create_booking(booking: BookingCreate, db: AsyncSession = Depends(get_db)) -> Any:
     """Create a new booking"""
     # Get event type
     event_type = (
-        db.query(EventType).filter(EventType.id == booking.event_type_id).first()
+        await db.scalar(select(EventType).where(EventType.id == booking.event_type_id).limit(1))
     )
     if not event_type:
         raise HTTPException(
@@ -30,14 +31,14 @@ async def create_booking(booking: BookingCreate, db: Session = Depends(get_db))
     end_time = start_time + timedelta(minutes=event_type.duration)
 
     # Check if time slot is available
-    existing_event = (
-        db.query(Event)
-        .filter(
+    existing_event = await db.scalar(
+        select(Event)
+        .where(
             Event.event_type_id == event_type.id,
             Event.start_time < end_time,
             Event.end_time > start_time,
         )
-        .first()
+        .limit(1)
     )
 
     if existing_event:
@@ -62,8 +63,8 @@ async def create_booking(booking: BookingCreate, db: Session = Depends(get_db))
 
     try:
         db.add(event_details)
-        db.commit()
-        db.refresh(event_details)
+        await db.commit()
+        await db.refresh(event_details)
 
         calendar_links = generate_calendar_links(event_details)
         event_details.update(calendar_links)
@@ -75,6 +76,6 @@ async def create_booking(booking: BookingCreate, db: Session = Depends(get_db))
 
         return db_event
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Failed to send confirmation email: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
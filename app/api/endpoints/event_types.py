@@ -1,26 +1,29 @@
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
 from typing import List
 import string
 import random
 from ...db.database import get_db
+from ...db.replicas import get_read_db
 from ...core.auth import get_current_user
 from ...models.user import User
 from ...models.event_type import EventType as EventTypeModel
 from ...models.event import Event as EventModel
 from ...models.settings import Settings as SettingsModel
+from ...core.schedule import ScheduleError, get_schedule
+from ...core import public_cache
 from ...schemas.event_type import EventType, EventTypeCreate, EventTypeUpdate, AvailabilityResponse, TimeSlot, BookingRequest
 
 router = APIRouter()
 
-def generate_slug(name: str, user_id: int, db: Session) -> str:
+async def generate_slug(name: str, user_id: int, db: AsyncSession) -> str:
     """Generate a unique slug for the event type"""
     base_slug = "-".join(name.lower().split())
     slug = base_slug
     
-    while db.query(EventTypeModel).filter(EventTypeModel.slug == slug).first():
+    while await db.scalar(select(EventTypeModel).where(EventTypeModel.slug == slug).limit(1)):
         # If slug exists, append random string
         random_string = ''.join(random.choices(string.ascii_lowercase + string.digits, k=4))
         slug = f"{base_slug}-{random_string}"
@@ -30,21 +33,21 @@ def generate_slug(name: str, user_id: int, db: Session) -> str:
 @router.get("/event-types", response_model=List[EventType])
 async def get_event_types(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all event types for the current user"""
-    return db.query(EventTypeModel).filter(
+    return (await db.scalars(select(EventTypeModel).where(
         EventTypeModel.user_id == current_user.id
-    ).all()
+    ))).all()
 
 @router.post("/event-types", response_model=EventType)
 async def create_event_type(
     event_type: EventTypeCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new event type"""
-    slug = generate_slug(event_type.name, current_user.id, db)
+    slug = await generate_slug(event_type.name, current_user.id, db)
     
     db_event_type = EventTypeModel(
         **event_type.dict(),
@@ -54,11 +57,11 @@ async def create_event_type(
     
     try:
         db.add(db_event_type)
-        db.commit()
-        db.refresh(db_event_type)
+        await db.commit()
+        await db.refresh(db_event_type)
         return db_event_type
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -68,13 +71,13 @@ async def create_event_type(
 async def get_event_type(
     event_type_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific event type"""
-    event_type = db.query(EventTypeModel).filter(
+    event_type = await db.scalar(select(EventTypeModel).where(
         EventTypeModel.id == event_type_id,
         EventTypeModel.user_id == current_user.id
-    ).first()
+    ).limit(1))
     
     if not event_type:
         raise HTTPException(
@@ -89,13 +92,13 @@ async def update_event_type(
     event_type_id: int,
     event_type_update: EventTypeUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update an event type"""
-    event_type = db.query(EventTypeModel).filter(
+    event_type = await db.scalar(select(EventTypeModel).where(
         EventTypeModel.id == event_type_id,
         EventTypeModel.user_id == current_user.id
-    ).first()
+    ).limit(1))
     
     if not event_type:
         raise HTTPException(
@@ -106,17 +109,18 @@ async def update_event_type(
     # Update slug if name is changed
     update_data = event_type_update.dict(exclude_unset=True)
     if 'name' in update_data:
-        update_data['slug'] = generate_slug(update_data['name'], current_user.id, db)
+        update_data['slug'] = await generate_slug(update_data['name'], current_user.id, db)
     
     for key, value in update_data.items():
         setattr(event_type, key, value)
     
     try:
-        db.commit()
-        db.refresh(event_type)
+        await db.commit()
+        public_cache.invalidate_event_type(event_type_id)
+        await db.refresh(event_type)
         return event_type
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -126,13 +130,13 @@ async def update_event_type(
 async def delete_event_type(
     event_type_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete an event type"""
-    event_type = db.query(EventTypeModel).filter(
+    event_type = await db.scalar(select(EventTypeModel).where(
         EventTypeModel.id == event_type_id,
         EventTypeModel.user_id == current_user.id
-    ).first()
+    ).limit(1))
     
     if not event_type:
         raise HTTPException(
@@ -141,11 +145,12 @@ async def delete_event_type(
         )
     
     try:
-        db.delete(event_type)
-        db.commit()
+        await db.delete(event_type)
+        await db.commit()
+        public_cache.invalidate_event_type(event_type_id)
         return {"message": "Event type deleted successfully"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -157,14 +162,14 @@ async def get_event_type_availability(
     start_date: datetime = Query(...),
     end_date: datetime = Query(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get availability for an event type within a date range"""
     # Verify event type exists and belongs to user
-    event_type = db.query(EventTypeModel).filter(
+    event_type = await db.scalar(select(EventTypeModel).where(
         EventTypeModel.id == event_type_id,
         EventTypeModel.user_id == current_user.id
-    ).first()
+    ).limit(1))
     
     if not event_type:
         raise HTTPException(
@@ -173,9 +178,9 @@ async def get_event_type_availability(
         )
 
     # Get user settings for working hours
-    settings = db.query(SettingsModel).filter(
+    settings = await db.scalar(select(SettingsModel).where(
         SettingsModel.user_id == current_user.id
-    ).first()
+    ).limit(1))
     
     if not settings or not settings.working_hours:
         raise HTTPException(
@@ -184,29 +189,32 @@ async def get_event_type_availability(
         )
 
     # Get existing events within the date range
-    existing_events = db.query(EventModel).filter(
+    existing_events = (await db.scalars(select(EventModel).where(
         and_(
             EventModel.user_id == current_user.id,
             EventModel.start_time >= start_date,
             EventModel.end_time <= end_date
         )
-    ).all()
+    ))).all()
+
+    try:
+        schedule = get_schedule(settings)
+    except ScheduleError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid working hours: {str(e)}"
+        )
 
     # Calculate available time slots
     available_slots: List[TimeSlot] = []
     current_date = start_date.date()
     
     while current_date <= end_date.date():
-        day_name = current_date.strftime('%A').lower()
-        day_settings = settings.working_hours.get(day_name)
-        
-        if day_settings and day_settings.get('enabled'):
-            start_time = datetime.strptime(day_settings['start'], '%H:%M').time()
-            end_time = datetime.strptime(day_settings['end'], '%H:%M').time()
-            
-            # Create time slots for the day
-            current_time = datetime.combine(current_date, start_time)
-            day_end = datetime.combine(current_date, end_time)
+        midnight = datetime.combine(current_date, time.min)
+        for window_start, window_end in schedule.windows(current_date):
+            # Create time slots for the window
+            current_time = midnight + timedelta(minutes=window_start)
+            day_end = midnight + timedelta(minutes=window_end)
             
             while current_time + timedelta(minutes=event_type.duration) <= day_end:
                 slot_end = current_time + timedelta(minutes=event_type.duration)
@@ -237,14 +245,14 @@ async def create_booking(
     event_type_id: int,
     booking: BookingRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new booking for an event type"""
     # Verify event type exists and belongs to user
-    event_type = db.query(EventTypeModel).filter(
+    event_type = await db.scalar(select(EventTypeModel).where(
         EventTypeModel.id == event_type_id,
         EventTypeModel.user_id == current_user.id
-    ).first()
+    ).limit(1))
     
     if not event_type:
         raise HTTPException(
@@ -256,13 +264,13 @@ async def create_booking(
     start_time = datetime.fromisoformat(booking.start_time)
     end_time = start_time + timedelta(minutes=event_type.duration)
     
-    existing_event = db.query(EventModel).filter(
+    existing_event = await db.scalar(select(EventModel).where(
         and_(
             EventModel.user_id == current_user.id,
             EventModel.start_time < end_time,
             EventModel.end_time > start_time
         )
-    ).first()
+    ).limit(1))
     
     if existing_event:
         raise HTTPException(
@@ -285,11 +293,11 @@ async def create_booking(
 
     try:
         db.add(new_event)
-        db.commit()
-        db.refresh(new_event)
+        await db.commit()
+        await db.refresh(new_event)
         return new_event
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -1,23 +1,31 @@
-from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, timedelta, timezone, time, date
+import heapq
 import pytz
 from ...schemas.timeslot import TimeSlot
 from ...db.database import get_db
+from ...db.replicas import get_read_db
 from ...core.auth import get_current_user
+from ...core.api_tokens import get_api_token_user_id
 from ...models.user import User
-from ...models.profile import Profile
-from ...models.settings import Settings
 from ...models.event import Event as EventModel
-from ...models.token import Token as TokenModel
-from ...schemas.event import EventList, Event, EventCreate
+from ...models.event_archive import EventArchive
+from ...schemas.event import EventList, Event, EventCreate, BulkCancelRequest, BulkCancelItem, BulkCancelResult
 from ...models.event_type import EventType as EventTypeModel  # Add this import
 from ...schemas.event_type import EventType as EventTypeSchema  # If needed for response
-from ...utils.notifications import send_notifications, send_cancellation_email
-from sqlalchemy import or_
+from ...utils.notifications import cancellation_channels, send_bulk_notifications, send_notifications
+from ...core.digest import digest_enabled, record_digest_item
+from ...core.pagination import decode_cursor, encode_cursor
+from ...db.queries import load_host_context
+from ...db.search import apply_event_search
+from ...core.config import get_settings
+from ...core.responses import ORJSONResponse, row_dicts
+from sqlalchemy import and_, delete, func, or_, select
 
 router = APIRouter()
+app_settings = get_settings()
 
 external_router = APIRouter(
     prefix="/events",
@@ -25,72 +33,141 @@ external_router = APIRouter(
     dependencies=[]  # Explicitly empty dependencies
 )
 
-@router.get("/events", response_model=EventList)
-async def get_scheduled_events(
-    status: Optional[str] = None,
-    page: int = 1,
-    q: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+# EventResponse fields, selected as plain columns so listings skip the ORM and Pydantic
+EVENT_LIST_COLUMNS = (
+    "id", "user_id", "title", "start_time", "end_time", "description", "attendee_name",
+    "attendee_email", "attendee_phone", "location", "answers", "is_confirmed", "created_at"
+)
+
+def _filtered_events(model, user_id: int, status: Optional[str], q: Optional[str], dialect: str):
+    """Status and search filters over `model` (Event or EventArchive), plus the search rank if any"""
     now = datetime.now()
     today_start = datetime.combine(now.date(), time.min)
     today_end = datetime.combine(now.date(), time.max)
     
-    query = db.query(EventModel).filter(EventModel.user_id == current_user.id)
+    query = select(*(getattr(model, name) for name in EVENT_LIST_COLUMNS)).where(model.user_id == user_id)
     
     # Add status filter
     if status:
         if status == "today":
-            query = query.filter(
-                EventModel.start_time >= today_start,
-                EventModel.start_time <= today_end
+            query = query.where(
+                model.start_time >= today_start,
+                model.start_time <= today_end
             )
         elif status == "upcoming":
-            query = query.filter(EventModel.start_time > today_end)
+            query = query.where(model.start_time > today_end)
         elif status == "past":
-            query = query.filter(EventModel.start_time < today_start)
+            query = query.where(model.start_time < today_start)
     
-    # Add search filter
+    # Full-text search ranks results; without it events are newest first
+    rank = None
     if q:
-        query = query.filter(
-            or_(
-                EventModel.title.ilike(f"%{q}%"),
-                EventModel.description.ilike(f"%{q}%")
+        query, rank = apply_event_search(query, model, dialect, q, user_id)
+    return query, rank
+
+async def _list_events(
+    db: AsyncSession,
+    user_id: int,
+    status: Optional[str],
+    q: Optional[str],
+    cursor: Optional[str],
+    limit: Optional[int],
+    include_total: bool
+) -> ORJSONResponse:
+    """Newest-first event listing with keyset pagination on (start_time, id).
+
+    Archived events are past, so events_archive is read whenever the status
+    filter can match past rows (none or "past"): each table is paged on its
+    own and the two pages are merged, so the cursor works across both.
+    Rows are serialized straight to an EventList-shaped body.
+    """
+    models = [EventModel] if status in ("today", "upcoming") else [EventModel, EventArchive]
+    dialect = db.bind.dialect.name
+    filtered = [(model,) + _filtered_events(model, user_id, status, q, dialect) for model in models]
+    ranked = filtered[0][2] is not None
+    
+    # Counting walks every matching row, so it is opt-in
+    total = None
+    if include_total:
+        total = 0
+        for _, query, _ in filtered:
+            total += await db.scalar(select(func.count()).select_from(query.subquery()))
+    
+    position = None
+    if cursor:
+        try:
+            position, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            position = None
+        # A cursor from a ranked search can't continue a time-ordered listing and vice versa
+        if not isinstance(position, float if ranked else datetime):
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid cursor"
             )
-        )
     
-    # Calculate pagination
-    items_per_page = 10
-    total = query.count()
-    total_pages = (total + items_per_page - 1) // items_per_page
+    # Fetch one extra row to know whether another page exists
+    limit = min(limit or app_settings.EVENTS_PAGE_SIZE, app_settings.EVENTS_MAX_PAGE_SIZE)
+    pages = []
+    for model, query, rank in filtered:
+        if ranked:
+            if position is not None:
+                query = query.where(
+                    or_(rank > position, and_(rank == position, model.id > cursor_id))
+                )
+            query = query.add_columns(rank).order_by(rank, model.id)
+        else:
+            if position is not None:
+                query = query.where(
+                    or_(
+                        model.start_time < position,
+                        and_(model.start_time == position, model.id < cursor_id)
+                    )
+                )
+            query = query.add_columns(model.start_time).order_by(
+                model.start_time.desc(), model.id.desc()
+            )
+        pages.append((await db.execute(query.limit(limit + 1))).all())
     
-    # Add sorting and pagination
-    query = query.order_by(EventModel.start_time.desc())
-    query = query.offset((page - 1) * items_per_page).limit(items_per_page)
+    # Archived rows keep their event id, so (position, id) is unique across both tables
+    rows = list(heapq.merge(*pages, key=lambda row: (row[-1], row[0]), reverse=not ranked))[:limit + 1]
     
-    events = query.all()
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(rows[limit - 1][-1], rows[limit - 1][0])
     
-    return EventList(
-        items=events,
-        total=total,
-        page=page,
-        pages=total_pages
-    )
+    return ORJSONResponse({
+        "items": row_dicts(EVENT_LIST_COLUMNS, rows[:limit]),
+        "next_cursor": next_cursor,
+        "limit": limit,
+        "total": total
+    })
+
+@router.get("/events", response_model=EventList)
+async def get_scheduled_events(
+    status: Optional[str] = None,
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    include_total: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await _list_events(db, current_user.id, status, q, cursor, limit, include_total)
 
 @router.post("/events", response_model=Event)
 async def create_event(
     event: EventCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new event"""
     # Check for time slot availability
-    existing_event = db.query(EventModel).filter(
+    existing_event = await db.scalar(select(EventModel).where(
         EventModel.user_id == current_user.id,
         EventModel.start_time < event.end_time,
         EventModel.end_time > event.start_time
-    ).first()
+    ).limit(1))
     
     if existing_event:
         raise HTTPException(
@@ -105,11 +182,11 @@ async def create_event(
     
     try:
         db.add(db_event)
-        db.commit()
-        db.refresh(db_event)
+        await db.commit()
+        await db.refresh(db_event)
         return db_event
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -119,13 +196,20 @@ async def create_event(
 async def get_event(
     event_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific event"""
-    event = db.query(EventModel).filter(
+    event = await db.scalar(select(EventModel).where(
         EventModel.id == event_id,
         EventModel.user_id == current_user.id
-    ).first()
+    ).limit(1))
+    if not event:
+        # Old events live in the archive under the same id (read-only); ids are
+        # never reused, so at most one of the two tables has it
+        event = await db.scalar(select(EventArchive).where(
+            EventArchive.id == event_id,
+            EventArchive.user_id == current_user.id
+        ).limit(1))
     
     if not event:
         raise HTTPException(
@@ -140,13 +224,13 @@ async def update_event(
     event_id: int,
     event_update: EventCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update an event"""
-    event = db.query(EventModel).filter(
+    event = await db.scalar(select(EventModel).where(
         EventModel.id == event_id,
         EventModel.user_id == current_user.id
-    ).first()
+    ).limit(1))
     
     if not event:
         raise HTTPException(
@@ -156,12 +240,12 @@ async def update_event(
     
     # Check for time slot availability if time is being updated
     if event_update.start_time != event.start_time or event_update.end_time != event.end_time:
-        existing_event = db.query(EventModel).filter(
+        existing_event = await db.scalar(select(EventModel).where(
             EventModel.user_id == current_user.id,
             EventModel.id != event_id,
             EventModel.start_time < event_update.end_time,
             EventModel.end_time > event_update.start_time
-        ).first()
+        ).limit(1))
         
         if existing_event:
             raise HTTPException(
@@ -173,11 +257,11 @@ async def update_event(
         setattr(event, key, value)
     
     try:
-        db.commit()
-        db.refresh(event)
+        await db.commit()
+        await db.refresh(event)
         return event
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -186,15 +270,16 @@ async def update_event(
 @router.delete("/events/{event_id}/cancel")
 async def cancel_and_notify_event(
     event_id: int,
+    background_tasks: BackgroundTasks,
     reason: str = Body(..., embed=True),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Cancel event, delete it, and notify user"""
-    event = db.query(EventModel).filter(
+    event = await db.scalar(select(EventModel).where(
         EventModel.id == event_id,
         EventModel.user_id == current_user.id
-    ).first()
+    ).limit(1))
     
     if not event:
         raise HTTPException(
@@ -203,36 +288,132 @@ async def cancel_and_notify_event(
         )
 
     # Get settings for SMS notification
-    settings = db.query(Settings).filter(Settings.user_id == current_user.id).first()
-    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
+    host = await load_host_context(db, current_user.id)
+    settings, profile = host.settings, host.profile
     
     try:
-        # Send notifications (email and optional SMS)
-        notification_results = await send_notifications(
-            event=event,
-            user_settings=settings,
+        if digest_enabled(settings):
+            record_digest_item(
+                db,
+                user_id=current_user.id,
+                kind="cancellation",
+                event_title=event.title,
+                event_time=event.start_time,
+                attendee_name=event.attendee_name,
+                attendee_email=event.attendee_email,
+                detail=reason
+            )
+        
+        await db.delete(event)
+        await db.commit()
+
+        # Notices go out after the response, where they may wait on the provider throttle
+        background_tasks.add_task(
+            send_notifications,
+            user_id=current_user.id,
+            event_title=event.title,
+            event_time=event.start_time,
             reason=reason,
+            user_settings=settings,
             profile=profile,
-            attendee_email=event.attendee_email,
-            attendee_phone=event.attendee_phone,
+            attendee_email=event.attendee_email
         )
-        notification = {
-            "message": "Event cancelled, deleted, and notifications sent",
-            "notifications": notification_results
+        return {
+            "message": "Event cancelled and deleted; notifications queued",
+            "notifications": cancellation_channels(settings, profile, event.attendee_email)
         }
-        
-        db.delete(event)
-        db.commit()
-        return notification
-        # Delete the event
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to cancel event: {str(e)}"
         )
 
 
+@router.post("/events/bulk-cancel", response_model=BulkCancelResult)
+async def bulk_cancel_events(
+    request: BulkCancelRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Cancel many events in one transaction; attendees are notified after the response"""
+    query = select(EventModel).where(EventModel.user_id == current_user.id)
+    if request.event_ids is not None:
+        if len(request.event_ids) > app_settings.BULK_CANCEL_MAX_EVENTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {app_settings.BULK_CANCEL_MAX_EVENTS} events can be cancelled at once"
+            )
+        query = query.where(EventModel.id.in_(request.event_ids))
+    else:
+        query = query.where(
+            EventModel.start_time >= request.start,
+            EventModel.start_time < request.end
+        )
+    events = (await db.scalars(
+        query.order_by(EventModel.start_time, EventModel.id).limit(app_settings.BULK_CANCEL_MAX_EVENTS + 1)
+    )).all()
+    if len(events) > app_settings.BULK_CANCEL_MAX_EVENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"More than {app_settings.BULK_CANCEL_MAX_EVENTS} events in range, narrow it down"
+        )
+
+    host = await load_host_context(db, current_user.id)
+    settings, profile = host.settings, host.profile
+
+    try:
+        if digest_enabled(settings):
+            for event in events:
+                record_digest_item(
+                    db,
+                    user_id=current_user.id,
+                    kind="cancellation",
+                    event_title=event.title,
+                    event_time=event.start_time,
+                    attendee_name=event.attendee_name,
+                    attendee_email=event.attendee_email,
+                    detail=request.reason
+                )
+        if events:
+            await db.execute(delete(EventModel).where(EventModel.id.in_([event.id for event in events])))
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to cancel events: {str(e)}"
+        )
+
+    # Notices go out after the response: at the provider's rate a large batch
+    # takes far longer than a request may. Failures land in the retry queue.
+    if settings is not None and profile is not None:
+        background_tasks.add_task(
+            send_bulk_notifications,
+            user_id=current_user.id,
+            events=[(event.title, event.start_time, event.attendee_email) for event in events],
+            reason=request.reason,
+            user_settings=settings,
+            profile=profile
+        )
+    results = [
+        BulkCancelItem(
+            id=event.id,
+            status="cancelled",
+            **cancellation_channels(settings, profile, event.attendee_email)
+        )
+        for event in events
+    ]
+    if request.event_ids is not None:
+        found = {event.id for event in events}
+        results += [
+            BulkCancelItem(id=event_id, status="not_found")
+            for event_id in dict.fromkeys(request.event_ids) if event_id not in found
+        ]
+    return BulkCancelResult(cancelled=len(events), results=results)
+
+
 @router.get("/timeslots", response_model=List[TimeSlot])
 async def get_available_timeslots(
     start_date: datetime,
@@ -240,12 +421,12 @@ async def get_available_timeslots(
     event_type_id: int = Query(..., description="Event type ID is required"),  # Make required
     timezone: str = "Asia/Kolkata",
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get available time slots for a given date range based on event type"""
     try:
         # Use EventTypeModel instead of EventType
-        event_type = db.query(EventTypeModel).filter(EventTypeModel.id == event_type_id).first()
+        event_type = await db.scalar(select(EventTypeModel).where(EventTypeModel.id == event_type_id).limit(1))
         if not event_type:
             raise HTTPException(status_code=404, detail="Event type not found")
         
@@ -258,6 +439,13 @@ async def get_available_timeslots(
         end_time = datetime.strptime("17:00", "%H:%M").time()
         interval = timedelta(minutes=duration)
         
+        # Events overlapping the whole range, fetched once rather than per slot
+        booked = (await db.execute(select(EventModel.start_time, EventModel.end_time).where(
+            EventModel.user_id == current_user.id,
+            EventModel.start_time < datetime.combine(end_date.date(), end_time) + interval,
+            EventModel.end_time > datetime.combine(start_date.date(), current_time)
+        ))).all()
+
         current_date = start_date
         while current_date <= end_date:
             slot_time = current_time
@@ -266,11 +454,9 @@ async def get_available_timeslots(
                 slot_end = slot_start + interval
                 
                 # Check for conflicts
-                is_available = not db.query(EventModel).filter(
-                    EventModel.user_id == current_user.id,
-                    EventModel.start_time < slot_end,
-                    EventModel.end_time > slot_start
-                ).first()
+                is_available = not any(
+                    start < slot_end and end > slot_start for start, end in booked
+                )
                 
                 if is_available:
                     time_slots.append(TimeSlot(
@@ -292,105 +478,42 @@ async def get_available_timeslots(
 
 @external_router.get("/external", response_model=EventList)
 async def get_events_external(
-    token: str = Query(..., description="API Token"),
     status: Optional[str] = None,
-    page: int = 1,
     q: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    include_total: bool = False,
+    user_id: int = Depends(get_api_token_user_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get events using permanent token authentication"""
     try:
-        # Debug print
-        print(f"Attempting to validate token: {token}")
-        
-        # Query token
-        token_record = db.query(TokenModel).filter(TokenModel.token == token).first()
-        
-        if not token_record:
-            print(f"Token not found in database: {token}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-            
-        print(f"Token found, user_id: {token_record.user_id}")
-        
-        now = datetime.now()
-        today_start = datetime.combine(now.date(), time.min)
-        today_end = datetime.combine(now.date(), time.max)
-        
-        query = db.query(EventModel).filter(EventModel.user_id == token_record.user_id)
-        
-        # Add status filter
-        if status:
-            if status == "today":
-                query = query.filter(
-                    EventModel.start_time >= today_start,
-                    EventModel.start_time <= today_end
-                )
-            elif status == "upcoming":
-                query = query.filter(EventModel.start_time > today_end)
-            elif status == "past":
-                query = query.filter(EventModel.start_time < today_start)
-        
-        # Add search filter
-        if q:
-            query = query.filter(
-                or_(
-                    EventModel.title.ilike(f"%{q}%"),
-                    EventModel.description.ilike(f"%{q}%")
-                )
-            )
-        
-        # Calculate pagination
-        items_per_page = 10
-        total = query.count()
-        total_pages = (total + items_per_page - 1) // items_per_page
-        
-        # Add sorting and pagination
-        query = query.order_by(EventModel.start_time.desc())
-        query = query.offset((page - 1) * items_per_page).limit(items_per_page)
-        
-        events = query.all()
-        print(f"Found {len(events)} events")
-        
-        return EventList(
-            items=events,
-            total=total,
-            page=page,
-            pages=total_pages
-        )
+        return await _list_events(db, user_id, status, q, cursor, limit, include_total)
     except HTTPException:
         raise
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
+        # `status` is the query parameter here, not fastapi.status
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=500,
             detail=str(e)
         )
 
 @external_router.delete("/external/{event_id}")
 async def delete_event_external(
     event_id: int,
-    token: str = Query(..., description="API Token"),
+    background_tasks: BackgroundTasks,
     reason: str = Body(..., description="Cancellation reason"),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_api_token_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete event using token authentication"""
     try:
-        # Verify token and get user
-        token_record = db.query(TokenModel).filter(TokenModel.token == token).first()
-        if not token_record:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Get event and verify ownership
-        event = db.query(EventModel).filter(
+        event = await db.scalar(select(EventModel).where(
             EventModel.id == event_id,
-            EventModel.user_id == token_record.user_id
-        ).first()
+            EventModel.user_id == user_id
+        ).limit(1))
 
         if not event:
             raise HTTPException(
@@ -399,37 +522,44 @@ async def delete_event_external(
             )
 
         # Get user's timezone
-        user_settings = db.query(Settings).filter(Settings.user_id == token_record.user_id).first()
-        user_profile = db.query(Profile).filter(Profile.user_id == token_record.user_id).first()
-        try:
-            # Send notifications (email and optional SMS)
-            notification_results = await send_notifications(
-                event=event,
-                user_settings=user_settings,
-                reason=reason,
-                profile=user_profile,
+        host = await load_host_context(db, user_id)
+        user_settings, user_profile = host.settings, host.profile
+
+        if digest_enabled(user_settings):
+            record_digest_item(
+                db,
+                user_id=user_id,
+                kind="cancellation",
+                event_title=event.title,
+                event_time=event.start_time,
+                attendee_name=event.attendee_name,
                 attendee_email=event.attendee_email,
-                attendee_phone=event.attendee_phone,
+                detail=reason
             )
-            notification = {
-                "message": "Event cancelled, deleted, and notifications sent",
-                "notifications": notification_results
-            }
-            
-            db.delete(event)
-            db.commit()
-            return notification
-            # Delete the event
-        except Exception as notify_error:
-            # Log the notification error but return success for event deletion
-            print(f"Failed to send notifications: {str(notify_error)}")
-            return {
-                "message": "Event cancelled and deleted successfully",
-                "notifications": {"email_sent": False, "sms_sent": False}
-            }
-            
+        
+        await db.delete(event)
+        await db.commit()
+
+        # Notices go out after the response, where they may wait on the provider throttle
+        background_tasks.add_task(
+            send_notifications,
+            user_id=user_id,
+            event_title=event.title,
+            event_time=event.start_time,
+            reason=reason,
+            user_settings=user_settings,
+            profile=user_profile,
+            attendee_email=event.attendee_email
+        )
+        return {
+            "message": "Event cancelled and deleted; notifications queued",
+            "notifications": cancellation_channels(user_settings, user_profile, event.attendee_email)
+        }
+
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to cancel event: {str(e)}"
@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List
+from ...db.database import get_db, pool_stats
+from ...db.query_stats import get_route_stats
+from ...db.replicas import replica_set
+from ...core.auth import require_internal_token
+from ...core.throttling import get_throttle_metrics
+from ...core.rate_limit import limiter
+from ...core.sinks import get_sink_metrics
+from ...core.notification_retry import replay_dead_letter
+from ...models.notification import NotificationDeadLetter, NotificationRetry
+from ...schemas.notification import DeadLetter
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+
+@router.get("/metrics/notifications")
+async def get_notification_metrics(db: AsyncSession = Depends(get_db)) -> Any:
+    """Token bucket levels, queue lengths and retry backlog"""
+    return {
+        **get_throttle_metrics(),
+        "retry_queue": await db.scalar(select(func.count()).select_from(NotificationRetry)),
+        "dead_letters": await db.scalar(select(func.count()).select_from(NotificationDeadLetter)),
+        "sinks": get_sink_metrics()
+    }
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics() -> Any:
+    """Connection pool usage and connection wait times per engine"""
+    return {name: stats.snapshot() for name, stats in pool_stats.items()}
+
+
+@router.get("/query-stats")
+async def get_query_stats() -> Any:
+    """SQL statements and database time per route, with likely N+1 patterns"""
+    return get_route_stats()
+
+
+@router.get("/rate-limits")
+async def get_rate_limit_metrics() -> Any:
+    """Allowed and rejected requests per rate limit rule"""
+    return limiter.metrics()
+
+
+@router.get("/replicas")
+async def get_replica_status() -> Any:
+    """Read replica health and ejection state"""
+    return replica_set.status()
+
+
+@router.get("/dead-letters", response_model=List[DeadLetter])
+async def list_dead_letters(
+    limit: int = 50,
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """List notifications that exhausted their retries, newest first"""
+    return (await db.scalars(select(NotificationDeadLetter).order_by(
+        NotificationDeadLetter.failed_at.desc()
+    ).limit(limit))).all()
+
+
+@router.post("/dead-letters/{dead_letter_id}/replay")
+async def replay_dead_letter_endpoint(
+    dead_letter_id: int,
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """Put a dead letter back on the retry queue"""
+    dead_letter = await db.scalar(select(NotificationDeadLetter).where(
+        NotificationDeadLetter.id == dead_letter_id
+    ).limit(1))
+
+    if not dead_letter:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dead letter not found"
+        )
+
+    try:
+        retry = await replay_dead_letter(db, dead_letter)
+        await db.commit()
+        return {"message": "Notification queued for retry", "retry_id": retry.id}
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to replay notification: {str(e)}"
+        )
@@ -1,13 +1,16 @@
 import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, status, File, UploadFile, Form
 from fastapi.responses import JSONResponse
 from pytz import common_timezones, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated, List, Optional
 import json
 import os
 from ...db.database import get_db
 from ...core.auth import get_current_user
+from ...core import public_cache
+from ...core.compression import static_response
 from ...models.user import User
 from ...models.profile import Profile as ProfileModel
 from ...schemas.profile import Profile, ProfileUpdate, TimezoneResponse
@@ -17,9 +20,9 @@ router = APIRouter()
 @router.get("/me", response_model=Profile)
 async def get_profile(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    profile = db.query(ProfileModel).filter(ProfileModel.user_id == current_user.id).first()
+    profile = await db.scalar(select(ProfileModel).where(ProfileModel.user_id == current_user.id).limit(1))
     if not profile:
         # Create default profile if none exists
         profile = ProfileModel(
@@ -27,8 +30,8 @@ async def get_profile(
             time_zone="UTC"  # Default timezone
         )
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
     
     return Profile(
         id=profile.id,
@@ -52,7 +55,7 @@ async def update_profile(
     company_logo: Optional[UploadFile] = None,
     avatar: Optional[UploadFile] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
         # Parse the profile_data JSON string
@@ -65,7 +68,7 @@ async def update_profile(
             )
 
         # Get or create profile
-        profile = db.query(ProfileModel).filter(ProfileModel.user_id == current_user.id).first()
+        profile = await db.scalar(select(ProfileModel).where(ProfileModel.user_id == current_user.id).limit(1))
         if not profile:
             profile = ProfileModel(user_id=current_user.id)
             db.add(profile)
@@ -94,10 +97,11 @@ async def update_profile(
             profile.avatar_url = f"/uploads/avatars/{avatar.filename}"
 
         try:
-            db.commit()
-            db.refresh(profile)
+            await db.commit()
+            public_cache.invalidate_host(current_user.id)
+            await db.refresh(profile)
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=str(e)
@@ -124,9 +128,13 @@ async def update_profile(
             detail=str(e)
         )
     
+def _timezone_choices() -> List[dict]:
+    return [
+        TimezoneResponse(label=f"{tz.replace('_', ' ')} ({tz})", value=tz).model_dump()
+        for tz in common_timezones
+    ]
+
 @router.get("/timezones", response_model=List[TimezoneResponse])
-def get_timezones():
-    timezone_choices = []
-    for tz in common_timezones:
-        timezone_choices.append(TimezoneResponse(label=f"{tz.replace('_', ' ')} ({tz})", value=tz))
-    return timezone_choices
\ No newline at end of file
+def get_timezones(request: Request):
+    # Fixed for the life of the process: rendered and compressed once
+    return static_response(request, "timezones", _timezone_choices)
\ No newline at end of file
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import Any, List, Optional
 from ...db.database import get_db
+from ...db.replicas import get_read_db
 import re
 from ...models.event_type import EventType
 from ...models.event import Event
+from ...models.event_archive import EventArchive
 from ...models.user import User
 from ...models.profile import Profile
 from ...models.settings import Settings
@@ -13,9 +16,16 @@ from ...schemas.profile import UserProfileSchema
 from ...schemas.event_type import EventType as EventTypeSchema
 from ...schemas.booking import BookingCreate, BookingResponse
 from ...utils.notifications import send_booking_confirmation_email, send_booking_confirmation_sms
+from ...core.digest import digest_enabled, record_digest_item
+from ...core.schedule import ScheduleError, format_minutes, get_schedule
+from ...db.queries import load_event_type_with_host
+from ...core.rate_limit import limit_public
+from ...core import public_cache
 
 router = APIRouter()
 
+MINUTE = timedelta(minutes=1)
+
 def validate_date_format(date_str: str) -> bool:
     """Validate date string format (YYYY-MM-DD)"""
     pattern = r'^\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])$'
@@ -27,21 +37,37 @@ def validate_time_format(time_str: str) -> bool:
     return bool(re.match(pattern, time_str))
 
 
-@router.get("/public/event-types/{identifier}", response_model=EventTypeSchema)
+@router.get("/public/event-types/{identifier}", response_model=EventTypeSchema, dependencies=[Depends(limit_public)])
 async def get_public_event_type(
     identifier: str,
     by_id: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get public event type details by either slug or ID
+
+    Misses fill the cache from the primary: a lagging replica read right
+    after a host edit would be cached for the whole TTL.
     
     Args:
         identifier: Either the slug or ID of the event type
         by_id: If True, treat identifier as an ID; if False, treat it as a slug
     """
+    if by_id:
+        try:
+            identifier = int(identifier)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid event type ID"
+            )
+
+    cached = public_cache.get_event_type(by_id, identifier)
+    if cached is not None:
+        return cached
+
     # Build the base query with necessary joins
-    query = db.query(EventType, User, Profile).join(
+    query = select(EventType, User, Profile).join(
         User, EventType.user_id == User.id
     ).join(
         Profile, User.id == Profile.user_id
@@ -49,22 +75,15 @@ async def get_public_event_type(
     
     # Apply the appropriate filter based on whether we're looking up by ID or slug
     if by_id:
-        try:
-            event_type_id = int(identifier)
-            event_type = query.filter(
-                EventType.id == event_type_id,
-                EventType.is_active == True
-            ).first()
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid event type ID"
-            )
+        event_type = (await db.execute(query.where(
+            EventType.id == identifier,
+            EventType.is_active == True
+        ).limit(1))).first()
     else:
-        event_type = query.filter(
+        event_type = (await db.execute(query.where(
             EventType.slug == identifier,
             EventType.is_active == True
-        ).first()
+        ).limit(1))).first()
 
     if not event_type:
         raise HTTPException(
@@ -91,21 +110,23 @@ async def get_public_event_type(
         "host_email": event_type[1].email
     }
 
-    return EventTypeSchema(**response_data)
+    response = EventTypeSchema(**response_data)
+    public_cache.store_event_type(response)
+    return response
 
 
-@router.get("/public/availability/{event_type_id}")
+@router.get("/public/availability/{event_type_id}", dependencies=[Depends(limit_public)])
 async def get_public_availability(
     event_type_id: int,
     date: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get available time slots for a specific date"""
     # Verify event type exists and is active
-    event_type = db.query(EventType).filter(
+    event_type = await db.scalar(select(EventType).where(
         EventType.id == event_type_id,
         EventType.is_active == True
-    ).first()
+    ).limit(1))
 
     if not event_type:
         raise HTTPException(
@@ -123,56 +144,63 @@ async def get_public_availability(
         )
 
     # Get the user's settings
-    user_settings = db.query(Settings).filter(Settings.user_id == event_type.user_id).first()
+    user_settings = await db.scalar(select(Settings).where(Settings.user_id == event_type.user_id).limit(1))
 
     if not user_settings or not user_settings.working_hours:
         return {"available_slots": []}
 
-    # Get day of week
-    day_of_week = booking_date.strftime("%A").lower()
-    day_schedule = user_settings.working_hours.get(day_of_week)
+    try:
+        windows = get_schedule(user_settings).windows(booking_date)
+    except ScheduleError as e:
+        print(f"Invalid working hours for user {event_type.user_id}: {str(e)}")
+        return {"available_slots": []}
 
-    if not day_schedule or not day_schedule.get("enabled"):
+    if not windows:
         return {"available_slots": []}
 
-    # Generate time slots based on working hours
-    start_time = datetime.strptime(day_schedule["start"], "%H:%M").time()
-    end_time = datetime.strptime(day_schedule["end"], "%H:%M").time()
-    
+    # Bookings overlapping the working day, fetched once rather than per slot
+    booked = (await db.execute(select(Event.start_time, Event.end_time).where(
+        Event.event_type_id == event_type_id,
+        Event.start_time < booking_date + timedelta(minutes=windows[-1][1]),
+        Event.end_time > booking_date + timedelta(minutes=windows[0][0])
+    ))).all()
+    # As minutes from midnight; rounding outwards keeps the overlap test exact
+    booked = [
+        ((start - booking_date) // MINUTE, -((booking_date - end) // MINUTE)) for start, end in booked
+    ]
+
+    # Generate time slots based on working hours, in minutes from midnight
     slots = []
-    current_time = datetime.combine(booking_date, start_time)
-    end_datetime = datetime.combine(booking_date, end_time)
-
-    while current_time + timedelta(minutes=event_type.duration) <= end_datetime:
-        # Check if slot is already booked
-        is_available = not db.query(Event).filter(
-            Event.event_type_id == event_type_id,
-            Event.start_time < current_time + timedelta(minutes=event_type.duration),
-            Event.end_time > current_time
-        ).first()
-
-        if is_available:
-            slots.append(current_time.strftime("%H:%M"))
-
-        current_time += timedelta(minutes=event_type.duration)  # event-type duration
+    duration = event_type.duration
+    for window_start, window_end in windows:
+        slot_start = window_start
+        while slot_start + duration <= window_end:
+            slot_end = slot_start + duration
+            # Check if slot is already booked
+            if not any(start < slot_end and end > slot_start for start, end in booked):
+                slots.append(format_minutes(slot_start))
+            slot_start = slot_end
 
     return {"available_slots": slots}
 
 @router.post("/public/bookings", response_model=BookingResponse)
 async def create_public_booking(
     booking: BookingCreate,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a public booking"""
     try:
-        # Get event type and host user
-        event_type = db.query(EventType).filter(EventType.id == booking.event_type_id).first()
+        # Event type, host user, profile and settings in one round trip
+        event_type = await load_event_type_with_host(db, booking.event_type_id)
         if not event_type:
             raise HTTPException(status_code=404, detail="Event type not found")
 
-        host_user = db.query(User).filter(User.id == event_type.user_id).first()
+        host_user = event_type.user
         if not host_user:
             raise HTTPException(status_code=404, detail="Host user not found")
+        host_settings = host_user.settings
+        host_profile = host_user.profile
             
         # Combine date and time
         datetime_str = f"{booking.date}T{booking.time}"
@@ -203,83 +231,96 @@ async def create_public_booking(
         )
         
         db.add(db_booking)
-        db.commit()
-        db.refresh(db_booking)
-
-        # Get host settings for notifications
-        host_settings = db.query(Settings).filter(Settings.user_id == host_user.id).first()
-        host_profile = db.query(Profile).filter(Profile.user_id == host_user.id).first()
+        await db.commit()
+        await db.refresh(db_booking)
 
-        # Send email notifications
+        # Confirmations go out after the response: sends wait on the provider
+        # throttle, and failures land in the retry queue
+        host_name = host_profile.full_name if host_profile else None
         if host_settings and host_settings.email_settings:
-            try:
-                # Send to attendee
-                await send_booking_confirmation_email(
-                    to_email=booking.email,
-                    event_title=event_type.name,
-                    event_time=start_time,
-                    attendee_name=booking.name,
-                    host_name=host_profile.full_name,
-                    location=booking.location,
-                    email_settings=host_settings.email_settings,
-                )
-                
-                # Send to host
-                await send_booking_confirmation_email(
+            # To the attendee
+            background_tasks.add_task(
+                send_booking_confirmation_email,
+                user_id=host_user.id,
+                to_email=booking.email,
+                event_title=event_type.name,
+                event_time=start_time,
+                attendee_name=booking.name,
+                host_name=host_name,
+                location=booking.location
+            )
+            
+            # To the host, or hold it for their digest
+            if digest_enabled(host_settings):
+                try:
+                    record_digest_item(
+                        db,
+                        user_id=host_user.id,
+                        kind="booking",
+                        event_title=event_type.name,
+                        event_time=start_time,
+                        attendee_name=booking.name,
+                        attendee_email=booking.email,
+                        detail=booking.location
+                    )
+                    await db.commit()
+                except Exception as e:
+                    await db.rollback()
+                    print(f"Failed to record booking for digest: {str(e)}")
+            else:
+                background_tasks.add_task(
+                    send_booking_confirmation_email,
+                    user_id=host_user.id,
                     to_email=host_user.email,
                     event_title=f"New Booking: {event_type.name}",
                     event_time=start_time,
                     attendee_name=booking.name,
-                    host_name=host_profile.full_name,
-                    location=booking.location,
-                    email_settings=host_settings.email_settings
+                    host_name=host_name,
+                    location=booking.location
                 )
-            except Exception as e:
-                print(f"Failed to send booking confirmation email: {str(e)}")
 
-        # Send SMS notifications
+        # SMS confirmations
         if (host_settings and 
             host_settings.sms_settings and 
             host_settings.notification_settings.get('sms', {}).get('enabled') and
             booking.phone):
-            try:
-                # Send to attendee
-                await send_booking_confirmation_sms(
-                    to_phone=booking.phone,
-                    event_title=event_type.name,
-                    event_time=start_time,
-                    sms_settings=host_settings.sms_settings
+            background_tasks.add_task(
+                send_booking_confirmation_sms,
+                user_id=host_user.id,
+                to_phone=booking.phone,
+                event_title=event_type.name,
+                event_time=start_time
+            )
+            
+            if host_profile and host_profile.phone:
+                background_tasks.add_task(
+                    send_booking_confirmation_sms,
+                    user_id=host_user.id,
+                    to_phone=host_profile.phone,
+                    event_title=f"New Booking: {event_type.name}",
+                    event_time=start_time
                 )
-                
-                # Send to host if phone available
-                if host_profile.phone:
-                    await send_booking_confirmation_sms(
-                        to_phone=host_profile.phone,
-                        event_title=f"New Booking: {event_type.name}",
-                        event_time=start_time,
-                        sms_settings=host_settings.sms_settings
-                    )
-            except Exception as e:
-                print(f"Failed to send booking confirmation SMS: {str(e)}")
 
         return db_booking
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
-@router.get("/public/bookings/{booking_id}", response_model=BookingResponse)
+@router.get("/public/bookings/{booking_id}", response_model=BookingResponse, dependencies=[Depends(limit_public)])
 async def get_public_booking(
     booking_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get public booking details"""
-    booking = db.query(Event).filter(Event.id == booking_id).first()
+    booking = await db.scalar(select(Event).where(Event.id == booking_id).limit(1))
+    if not booking:
+        booking = await db.scalar(select(EventArchive).where(EventArchive.id == booking_id).limit(1))
     
     if not booking:
         raise HTTPException(
@@ -289,13 +330,18 @@ async def get_public_booking(
     
     return booking
 
-@router.get("/public/profile/{user_id}", response_model=UserProfileSchema)
+@router.get("/public/profile/{user_id}", response_model=UserProfileSchema, dependencies=[Depends(limit_public)])
 async def get_user_profile(
     user_id: int, 
-    db: Session = Depends(get_db)
+    # Primary, not a replica: whatever a miss reads stays cached for the TTL
+    db: AsyncSession = Depends(get_db)
     ) -> Any:
+    cached = public_cache.get_profile(user_id)
+    if cached is not None:
+        return cached
+
     # Query the user profile based on the user_id
-    user_profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+    user_profile = await db.scalar(select(Profile).where(Profile.user_id == user_id).limit(1))
 
     if not user_profile:
         raise HTTPException(
@@ -313,5 +359,6 @@ async def get_user_profile(
         "phone": user_profile.phone,
         "time_zone": user_profile.time_zone
     }
+    public_cache.store_profile(user_id, response_data)
     
     return response_data
\ No newline at end of file
@@ -1,18 +1,20 @@
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Any
 from ...db.database import get_db
 from ...core.auth import get_current_user
 from ...models.user import User
 from ...models.settings import Settings as SettingsModel
-from ...schemas.settings import Settings
+from ...schemas.settings import Settings, SettingsUpdate
 from ...schemas.email import EmailTest, EmailSettings
 from ...schemas.smsSubscription import SMSSubscription
 from ...schemas.sms import SMSTest
 from ...core.emails import send_test_email
 from ...core.sms import SMSService
 from ...core.config import Settings as AppSettings, get_settings
+from ...core.schedule import ScheduleError, WorkingSchedule
 import paypalrestsdk
 
 router = APIRouter()
@@ -20,10 +22,10 @@ router = APIRouter()
 @router.get("/settings", response_model=Settings)
 async def get_settings(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Get user settings"""
-    settings = db.query(SettingsModel).filter(SettingsModel.user_id == current_user.id).first()
+    settings = await db.scalar(select(SettingsModel).where(SettingsModel.user_id == current_user.id).limit(1))
     if not settings:
         # Create default settings
         settings = SettingsModel(
@@ -42,7 +44,9 @@ async def get_settings(
                     "enabled": False,
                     "newBooking": True,
                     "canceledBooking": True,
-                    "reminders": True
+                    "reminders": True,
+                    "digest": False,
+                    "digestHour": 7
                 },
                 "sms": {
                     "enabled": False,
@@ -54,21 +58,28 @@ async def get_settings(
             sms_settings={}
         )
         db.add(settings)
-        db.commit()
-        db.refresh(settings)
+        await db.commit()
+        await db.refresh(settings)
     return settings
 
 @router.put("/settings", response_model=Settings)
 async def update_settings(
-    settings_update: Settings,
+    settings_update: SettingsUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Update user settings"""
-    settings = db.query(SettingsModel).filter(SettingsModel.user_id == current_user.id).first()
+    try:
+        WorkingSchedule.compile(settings_update.working_hours)
+    except ScheduleError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    settings = await db.scalar(select(SettingsModel).where(SettingsModel.user_id == current_user.id).limit(1))
     if not settings:
         settings = SettingsModel(user_id=current_user.id)
         db.add(settings)
+    elif settings.working_hours != settings_update.working_hours:
+        settings.schedule_version += 1
     
     settings.working_hours = settings_update.working_hours
     settings.notification_settings = settings_update.notification_settings
@@ -76,11 +87,11 @@ async def update_settings(
     settings.sms_settings = settings_update.sms_settings
     
     try:
-        db.commit()
-        db.refresh(settings)
+        await db.commit()
+        await db.refresh(settings)
         return settings
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -90,12 +101,12 @@ async def update_settings(
 async def test_email(
     email_test: EmailTest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Test email settings"""
     try:
         # Get settings for the current user
-        settings = db.query(SettingsModel).filter(SettingsModel.user_id == current_user.id).first()
+        settings = await db.scalar(select(SettingsModel).where(SettingsModel.user_id == current_user.id).limit(1))
         if not settings:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -141,12 +152,12 @@ async def test_email(
 async def test_sms(
     sms_test: SMSTest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Test SMS settings"""
     try:
         # Get settings for current user
-        settings = db.query(SettingsModel).filter(SettingsModel.user_id == current_user.id).first()
+        settings = await db.scalar(select(SettingsModel).where(SettingsModel.user_id == current_user.id).limit(1))
         if not settings:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -194,7 +205,7 @@ async def test_sms(
 async def subscribe_to_sms(
     settings: AppSettings = Depends(get_settings),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Create PayPal subscription for SMS service"""
     try:
@@ -240,7 +251,7 @@ async def subscribe_to_sms(
                 next_billing_date=(datetime.now() + timedelta(days=30)).isoformat()
             )
             db.add(subscription)
-            db.commit()
+            await db.commit()
 
             return {
                 "id": billing_plan.id,
@@ -253,7 +264,7 @@ async def subscribe_to_sms(
             )
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -263,13 +274,13 @@ async def subscribe_to_sms(
 async def verify_subscription(
     subscription_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Verify PayPal subscription status"""
-    subscription = db.query(SMSSubscription).filter(
+    subscription = await db.scalar(select(SMSSubscription).where(
         SMSSubscription.subscription_id == subscription_id,
         SMSSubscription.user_id == current_user.id
-    ).first()
+    ).limit(1))
 
     if not subscription:
         raise HTTPException(
@@ -280,7 +291,7 @@ async def verify_subscription(
     try:
         paypal_subscription = paypalrestsdk.BillingPlan.find(subscription_id)
         subscription.status = paypal_subscription.state
-        db.commit()
+        await db.commit()
 
         return {"status": subscription.status}
     except Exception as e:
@@ -292,7 +303,7 @@ async def verify_subscription(
 @router.post("/settings/webhook")
 async def paypal_webhook(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Handle PayPal webhooks"""
     try:
@@ -301,20 +312,20 @@ async def paypal_webhook(
         resource = event_json.get("resource")
 
         if event_type == "BILLING.SUBSCRIPTION.CANCELLED":
-            subscription = db.query(SMSSubscription).filter(
+            subscription = await db.scalar(select(SMSSubscription).where(
                 SMSSubscription.subscription_id == resource["id"]
-            ).first()
+            ).limit(1))
             if subscription:
                 subscription.status = "cancelled"
-                db.commit()
+                await db.commit()
 
         elif event_type == "BILLING.SUBSCRIPTION.SUSPENDED":
-            subscription = db.query(SMSSubscription).filter(
+            subscription = await db.scalar(select(SMSSubscription).where(
                 SMSSubscription.subscription_id == resource["id"]
-            ).first()
+            ).limit(1))
             if subscription:
                 subscription.status = "suspended"
-                db.commit()
+                await db.commit()
 
         return {"status": "success"}
     except Exception as e:
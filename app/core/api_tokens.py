@@ -0,0 +1,83 @@
+# core/api_tokens.py
+"""Permanent API tokens for the external endpoints.
+
+Tokens are stored as SHA-256 digests plus a short plaintext prefix. A
+lookup finds candidates by the indexed prefix and compares digests in
+constant time. Resolved tokens are kept in an in-process LRU keyed by digest,
+so integrations polling the external API are authenticated without touching
+the database; revoke_token drops the entry, and the TTL bounds how long
+another process can keep accepting a revoked token.
+"""
+import hashlib
+import hmac
+import secrets
+from typing import Optional, Tuple
+from fastapi import Header, HTTPException, Query, status
+from sqlalchemy import select
+from ..db.database import AsyncSessionLocal
+from ..models.token import Token
+from .cache import TTLCache
+from .config import get_settings
+
+settings = get_settings()
+
+PREFIX_LENGTH = 8
+
+# digest -> (token id, user id)
+_token_cache = TTLCache(settings.API_TOKEN_CACHE_SIZE, settings.API_TOKEN_CACHE_TTL_SECONDS)
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def new_api_token() -> Tuple[str, str, str]:
+    """A fresh token as (plaintext, prefix, digest)"""
+    token = secrets.token_hex(32)
+    return token, token[:PREFIX_LENGTH], hash_token(token)
+
+
+def forget_api_token(token_hash: str) -> None:
+    _token_cache.pop(token_hash)
+
+
+def clear_api_token_cache() -> None:
+    _token_cache.clear()
+
+
+async def resolve_api_token(token: str) -> Optional[int]:
+    """User id owning `token`, or None"""
+    digest = hash_token(token)
+    cached = _token_cache.get(digest)
+    if cached is not None:
+        return cached[1]
+
+    # Read from the primary so a token works as soon as it has been generated
+    async with AsyncSessionLocal() as db:
+        candidates = (await db.execute(
+            select(Token.id, Token.user_id, Token.token_hash).where(Token.prefix == token[:PREFIX_LENGTH])
+        )).all()
+    for token_id, user_id, token_hash in candidates:
+        if hmac.compare_digest(token_hash, digest):
+            _token_cache.set(digest, (token_id, user_id))
+            return user_id
+    return None
+
+
+async def get_api_token_user_id(
+    token: Optional[str] = Query(None, description="API Token"),
+    authorization: Optional[str] = Header(None)
+) -> int:
+    """Owner of the API token given as `Authorization: Bearer <token>` or `?token=`"""
+    if authorization:
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() in ("bearer", "token") and credentials.strip():
+            token = credentials.strip()
+    user_id = await resolve_api_token(token) if token else None
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return user_id
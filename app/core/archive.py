@@ -0,0 +1,97 @@
+# core/archive.py
+"""Move long-finished events from `events` into `events_archive`.
+
+Each batch copies up to ARCHIVE_BATCH_SIZE events that ended before the
+cutoff and deletes them from the hot table in the same transaction, so an
+interrupted run loses nothing and the next run simply carries on with the
+oldest events still left.
+
+    python -m app.core.archive --older-than-days 365 --batch-size 1000
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import DateTime, delete, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db.database import AsyncSessionLocal
+from ..models.event import Event
+from ..models.event_archive import EventArchive
+from .config import get_settings
+
+settings = get_settings()
+
+ARCHIVED_COLUMNS = [column.name for column in Event.__table__.columns]
+
+
+async def archive_batch(db: AsyncSession, cutoff: datetime, batch_size: int, now: datetime) -> int:
+    """Archive one chunk of events that ended before `cutoff`; returns how many moved"""
+    ids = (await db.scalars(
+        select(Event.id).where(Event.end_time < cutoff).order_by(Event.end_time, Event.id).limit(batch_size)
+    )).all()
+    if not ids:
+        return 0
+
+    events = Event.__table__
+    await db.execute(insert(EventArchive).from_select(
+        ARCHIVED_COLUMNS + ["archived_at"],
+        select(*(events.c[name] for name in ARCHIVED_COLUMNS), literal(now, DateTime)).where(events.c.id.in_(ids))
+    ))
+    await db.execute(delete(Event).where(Event.id.in_(ids)))
+    await db.commit()
+    return len(ids)
+
+
+async def archive_events(
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> int:
+    """Archive every event that ended more than `older_than_days` ago; returns how many moved"""
+    older_than_days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    now = now or datetime.now()
+    cutoff = now - timedelta(days=older_than_days)
+
+    archived = 0
+    batches = 0
+    async with AsyncSessionLocal() as db:
+        while max_batches is None or batches < max_batches:
+            moved = await archive_batch(db, cutoff, batch_size, now)
+            if not moved:
+                break
+            archived += moved
+            batches += 1
+            # Let request handlers in on the connection pool between chunks
+            await asyncio.sleep(0)
+    return archived
+
+
+async def run_archive_worker() -> None:
+    """Background loop keeping the hot events table free of old history"""
+    while True:
+        try:
+            archived = await archive_events()
+            if archived:
+                print(f"Archived {archived} events")
+        except Exception as e:
+            print(f"Archive worker error: {str(e)}")
+        await asyncio.sleep(settings.ARCHIVE_POLL_SECONDS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+
+    from .. import main as app_main  # noqa: F401  (registers every model)
+
+    archived = asyncio.run(archive_events(args.older_than_days, args.batch_size, args.max_batches))
+    print(f"Archived {archived} events")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,150 @@
 # backend/app/core/auth.py
 from datetime import datetime, timedelta
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import Optional, Tuple
+import hmac
+import time
 from ..db.database import get_db
 from ..models.user import User
 from ..core.config import get_settings
+from .cache import TTLCache
+from .refresh_tokens import revoked_families
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    try:
-        return pwd_context.verify(plain_password, hashed_password)
-    except Exception as e:
-        print(f"Error verifying password: {e}")
-        return False
-
-def get_password_hash(password: str) -> str:
-    try:
-        return pwd_context.hash(password)
-    except Exception as e:
-        print(f"Error hashing password: {e}")
-        raise
-
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+class CurrentUser:
+    """Detached identity of the authenticated user: plain attributes, no session, no lazy loads"""
+    __slots__ = ("id", "email", "is_active")
+
+    def __init__(self, id: int, email: str, is_active: bool):
+        self.id = id
+        self.email = email
+        self.is_active = is_active
+
+
+# Decoded token -> (subject, expiry, family), and subject -> CurrentUser
+_token_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+_user_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _token_claims(token: str) -> Tuple[str, float, Optional[str]]:
+    """(subject, expiry, session family) of a valid access token"""
+    cached = _token_cache.get(token)
+    if cached is not None and cached[1] > time.time():
+        return cached
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
+        raise _credentials_exception()
+    email = payload.get("sub")
+    if email is None:
+        raise _credentials_exception()
+    claims = (email, payload.get("exp", 0), payload.get("fam"))
+    _token_cache.set(token, claims)
+    return claims
+
+def token_family(token: str) -> Optional[str]:
+    """Session family of an access token, or None when invalid"""
+    try:
+        return _token_claims(token)[2]
+    except HTTPException:
+        return None
+
+def _token_subject(token: str) -> str:
+    email, _, family = _token_claims(token)
+    if family and revoked_families.is_revoked(family):
+        raise _credentials_exception()
+    return email
+
+def invalidate_user(email: str) -> None:
+    """Drop a cached identity, e.g. after the user row changed"""
+    _user_cache.pop(email)
+
+def clear_auth_cache() -> None:
+    _token_cache.clear()
+    _user_cache.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            changed = session.info.setdefault("changed_user_emails", set())
+            changed.add(obj.email)
+            # A changed email leaves the old subject behind as well
+            changed.update(inspect(obj).attrs.email.history.deleted or ())
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for email in session.info.pop("changed_user_emails", ()):
+        invalidate_user(email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop("changed_user_emails", None)
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> CurrentUser:
+    email = _token_subject(token)
+    user = _user_cache.get(email)
     if user is None:
-        raise credentials_exception
-    return user
\ No newline at end of file
+        row = await db.scalar(select(User).where(User.email == email).limit(1))
+        if row is None:
+            raise _credentials_exception()
+        user = CurrentUser(row.id, row.email, row.is_active)
+        _user_cache.set(email, user)
+    if not user.is_active:
+        raise _credentials_exception()
+    return user
+
+async def get_current_user_with_profile(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Current user row with .profile loaded in the same query"""
+    user = await db.scalar(
+        select(User).options(joinedload(User.profile)).where(User.email == _token_subject(token)).limit(1)
+    )
+    if user is None or not user.is_active:
+        raise _credentials_exception()
+    return user
+
+def is_internal_token(token: Optional[str]) -> bool:
+    """Whether `token` is the configured internal API token (never, when none is configured)"""
+    return bool(settings.INTERNAL_API_TOKEN and token and hmac.compare_digest(token, settings.INTERNAL_API_TOKEN))
+
+async def require_internal_token(
+    x_internal_token: Optional[str] = Header(None)
+) -> None:
+    """Guard for internal/admin endpoints; disabled when no token is configured"""
+    if not settings.INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not is_internal_token(x_internal_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid internal token"
+        )
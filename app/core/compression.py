@@ -0,0 +1,231 @@
+# core/compression.py
+"""gzip / brotli response compression.
+
+CompressionMiddleware compresses bodies whose content type is in
+COMPRESSIBLE_TYPES and that are at least COMPRESSION_MIN_SIZE bytes,
+picking brotli over gzip when the client accepts it and the `brotli`
+package is installed. Every type uses DEFAULT_LEVELS except JSON, which
+gets a cheaper brotli quality. Streamed responses (more_body) are held until
+COMPRESSION_MIN_SIZE bytes have arrived (or the stream ends, below the
+threshold: sent as is), then compressed at a cheaper level and flushed
+whenever another COMPRESSION_MIN_SIZE bytes went in. Clients still see
+data as it is produced, without a flush per tiny chunk making it larger.
+
+Static responses (`static_response`) are rendered and compressed once at
+the highest levels, then served from memory with an ETag.
+"""
+import gzip
+import hashlib
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from .config import get_settings
+from .responses import ORJSONResponse
+
+try:
+    import brotli
+except ImportError:  # optional; without it only gzip is offered
+    brotli = None
+
+settings = get_settings()
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+    "text/javascript",
+    "application/javascript",
+    "image/svg+xml",
+})
+# (gzip level, brotli quality) for whole bodies
+DEFAULT_LEVELS = (6, 5)
+# JSON is most of our traffic and built per request, so it gets the cheaper brotli quality
+JSON_LEVELS = (6, 4)
+# Caps for streamed responses, compressed chunk by chunk as they go out
+STREAM_LEVELS = (4, 3)
+# Compressed once and kept, so spend the time
+STATIC_LEVELS = (9, 11)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """The best of br/gzip the client accepts (q > 0), or None"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and (brotli is None or not settings.COMPRESSION_BROTLI):
+            continue
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, levels: Tuple[int, int]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=levels[1])
+    return gzip.compress(body, levels[0], mtime=0)
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str, levels: Tuple[int, int], flush_size: int):
+        self.encoding = encoding
+        self.flush_size = flush_size
+        self._unflushed = 0
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=min(levels[1], STREAM_LEVELS[1]))
+        else:
+            self._zlib = zlib.compressobj(min(levels[0], STREAM_LEVELS[0]), zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compressed output so far; may be empty until flush_size more bytes went in"""
+        self._unflushed += len(data)
+        flush = self._unflushed >= self.flush_size
+        if flush:
+            self._unflushed = 0
+        if self.encoding == "br":
+            return self._brotli.process(data) + (self._brotli.flush() if flush else b"")
+        return self._zlib.compress(data) + (self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else b"")
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def _levels_for(headers: Headers) -> Optional[Tuple[int, int]]:
+    if "content-encoding" in headers or "content-range" in headers:
+        return None
+    media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type not in COMPRESSIBLE_TYPES:
+        return None
+    return JSON_LEVELS if media_type == "application/json" else DEFAULT_LEVELS
+
+
+def _mark_encoded(headers: MutableHeaders, encoding: str) -> None:
+    headers["content-encoding"] = encoding
+    headers.add_vary_header("Accept-Encoding")
+    if "etag" in headers and not headers["etag"].startswith("W/"):
+        # A strong ETag names the identity bytes, which this no longer is
+        headers["etag"] = "W/" + headers["etag"]
+
+
+class CompressionMiddleware:
+    """Compress compressible responses for clients that accept br or gzip"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        levels = None
+        held = []
+        held_size = 0
+        streamer = None
+
+        async def send_compressed(message):
+            nonlocal start, levels, held_size, streamer
+            if message["type"] == "http.response.start":
+                levels = _levels_for(Headers(raw=message.get("headers", [])))
+                if levels is None:
+                    await send(message)
+                else:
+                    # Held back until the body shows whether it is worth it
+                    start = message
+                return
+            if message["type"] != "http.response.body" or levels is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                held.append(body)
+                held_size += len(body)
+                if more_body and held_size < settings.COMPRESSION_MIN_SIZE:
+                    return
+                body = b"".join(held)
+                held.clear()
+                if len(body) < settings.COMPRESSION_MIN_SIZE:
+                    # The whole response, and too small to bother
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    start = None
+                    levels = None
+                    return
+                headers = MutableHeaders(raw=list(start.get("headers", [])))
+                _mark_encoded(headers, encoding)
+                if not more_body:
+                    body = compress(body, encoding, levels)
+                    headers["content-length"] = str(len(body))
+                    await send({**start, "headers": headers.raw})
+                    await send({"type": "http.response.body", "body": body})
+                    start = None
+                    levels = None
+                    return
+                streamer = _StreamCompressor(encoding, levels, settings.COMPRESSION_MIN_SIZE)
+                del headers["content-length"]
+                await send({**start, "headers": headers.raw})
+                start = None
+
+            data = streamer.chunk(body)
+            if not more_body:
+                data += streamer.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class PrecompressedBody:
+    """One static body with its gzip (and brotli) forms, all made up front"""
+
+    def __init__(self, body: bytes, media_type: str):
+        self.media_type = media_type
+        # Weak: the same validator covers every encoding of the body
+        self.etag = 'W/"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.bodies = {None: body, "gzip": compress(body, "gzip", STATIC_LEVELS)}
+        if brotli is not None:
+            self.bodies["br"] = compress(body, "br", STATIC_LEVELS)
+
+    def response(self, request: Request, max_age: int) -> Response:
+        headers = {"etag": self.etag, "cache-control": f"public, max-age={max_age}", "vary": "Accept-Encoding"}
+        if self.etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        encoding = None
+        if settings.COMPRESSION_ENABLED:
+            encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+        return Response(self.bodies[encoding], media_type=self.media_type, headers=headers)
+
+
+_static: Dict[str, PrecompressedBody] = {}
+
+
+def static_response(request: Request, key: str, build: Callable[[], object], max_age: int = 86400) -> Response:
+    """JSON response for content that never changes while the process runs, built once per key"""
+    cached = _static.get(key)
+    if cached is None:
+        cached = _static[key] = PrecompressedBody(ORJSONResponse(build()).body, "application/json")
+    return cached.response(request, max_age)
@@ -7,9 +7,61 @@ from pathlib import Path
 class Settings(BaseSettings):
     # Base settings
     DATABASE_URL: str = "sqlite:///./sql_app.db"
+    # Optional explicit async URL; derived from DATABASE_URL when empty
+    ASYNC_DATABASE_URL: str = ""
+    # Comma-separated read replica URLs for read-only endpoints; empty reads from the primary
+    DATABASE_REPLICA_URLS: str = ""
+    # How long a failing replica sits out, and how long a client reads from the primary after writing
+    REPLICA_EJECT_SECONDS: float = 30.0
+    PRIMARY_PIN_SECONDS: float = 5.0
+    # Connection pool (ignored for in-memory SQLite); recycle of -1 disables it
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # File-backed SQLite production profile: WAL + pragmas on connect and a single
+    # in-process writer queue (see app/db/sqlite_tuning.py)
+    SQLITE_TUNING: bool = False
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    # Per-request SQL counts/timings (Server-Timing header, /api/internal/query-stats);
+    # the same statement this many times in one request is flagged as a likely N+1.
+    # The Server-Timing header only goes to requests carrying X-Internal-Token,
+    # or to everyone with SERVER_TIMING on (for local debugging).
+    QUERY_STATS: bool = True
+    QUERY_STATS_REPEAT_THRESHOLD: int = 5
+    QUERY_STATS_SERVER_TIMING: bool = False
+    # gzip/brotli response compression for bodies of at least MIN_SIZE bytes (streamed
+    # bodies are also flushed every MIN_SIZE bytes); brotli needs the `Brotli` package
+    # from requirements.txt, without it only gzip is offered (see app/core/compression.py)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_BROTLI: bool = True
     SECRET_KEY: str = "your-secret-key-here"
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Short-lived access tokens, renewed through rotating refresh tokens (/api/auth/refresh);
+    # every worker reloads revoked sessions this often (0 = only its own revocations)
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    REVOCATION_SYNC_SECONDS: float = 10.0
+    # bcrypt cost (hashes with another cost are replaced at login), and the executor
+    # hashing runs on: "process" pool or "thread" pool; 0 workers = one per CPU.
+    # Beyond MAX_PENDING queued/running checks, login and signup answer 503.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "process"
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # Resolved users and decoded tokens cached per process; the TTL bounds how long
+    # another process's change to a user (deactivation, deletion) can go unseen
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    # Resolved permanent API tokens; the TTL bounds how long other processes
+    # keep accepting a revoked token
+    API_TOKEN_CACHE_SIZE: int = 10000
+    API_TOKEN_CACHE_TTL_SECONDS: float = 300.0
     
     # Email settings
     MAIL_USERNAME: str = ""
@@ -23,6 +75,91 @@ class Settings(BaseSettings):
     TWILIO_AUTH_TOKEN: str = ""
     TWILIO_PHONE_NUMBER: str = ""
 
+    # Delivery backends: "smtp" | "smtp_sink" | "file" for mail, "provider" | "http_sink" for SMS.
+    # The sinks swallow messages locally for development and load tests.
+    MAIL_BACKEND: str = "smtp"
+    MAIL_SINK_HOST: str = "127.0.0.1"
+    MAIL_SINK_PORT: int = 8025
+    MAIL_FILE_SINK_DIR: str = "mail_sink"
+    SMS_BACKEND: str = "provider"
+    SMS_SINK_HOST: str = "127.0.0.1"
+    SMS_SINK_PORT: int = 8026
+
+    # Outbound notification throttling (per provider account, at most MAX_ACCOUNTS
+    # buckets kept per channel)
+    EMAIL_RATE_PER_SECOND: float = 2.0
+    EMAIL_BURST: int = 10
+    SMS_RATE_PER_SECOND: float = 1.0
+    SMS_BURST: int = 5
+    NOTIFICATION_QUEUE_MAX_DEPTH: int = 500
+    NOTIFICATION_QUEUE_TTL_SECONDS: float = 60.0
+    NOTIFICATION_LIMITER_MAX_ACCOUNTS: int = 10000
+
+    # Failed notification retries
+    NOTIFICATION_MAX_ATTEMPTS: int = 6
+    NOTIFICATION_RETRY_BASE_SECONDS: float = 30.0
+    NOTIFICATION_RETRY_MAX_SECONDS: float = 3600.0
+    NOTIFICATION_RETRY_BATCH_SIZE: int = 50
+    NOTIFICATION_RETRY_POLL_SECONDS: float = 15.0
+
+    # Pooled SMTP sessions for batched sends
+    SMTP_POOL_MAX_IDLE: int = 4
+    SMTP_POOL_IDLE_SECONDS: float = 60.0
+
+    # Bulk cancellation: events per request, and concurrent notification sends
+    # (matches the pooled SMTP sessions per account so each send reuses one)
+    BULK_CANCEL_MAX_EVENTS: int = 1000
+    BULK_NOTIFY_CONCURRENCY: int = 4
+
+    # Host agenda digests
+    DIGEST_WINDOW_HOURS: int = 24
+    DIGEST_HOST_BATCH_SIZE: int = 200
+    DIGEST_POLL_SECONDS: float = 300.0
+
+    # Events that ended more than ARCHIVE_AFTER_DAYS ago move to events_archive
+    # (0 disables the archiver)
+    ARCHIVE_AFTER_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 1000
+    ARCHIVE_POLL_SECONDS: float = 3600.0
+
+    # Compiled working-hours schedules kept in process (one per host)
+    SCHEDULE_CACHE_SIZE: int = 10000
+
+    # Public booking-page lookups (event type by slug/id, host profile) cached per process;
+    # edits invalidate locally, other processes catch up within the TTL
+    PUBLIC_CACHE_SIZE: int = 10000
+    PUBLIC_CACHE_TTL_SECONDS: float = 60.0
+
+    # Event listing page sizes
+    EVENTS_PAGE_SIZE: int = 10
+    EVENTS_MAX_PAGE_SIZE: int = 100
+
+    # Startup comparison of the database revision with the Alembic head:
+    # "warn" logs a mismatch, "strict" refuses to start, "off" skips the check
+    SCHEMA_CHECK: str = "warn"
+
+    # Run retry/maintenance loops inside the web process
+    RUN_BACKGROUND_JOBS: bool = True
+
+    # Request rate limits ("<count>/<second|minute|hour|day>", empty = unlimited), keyed by
+    # client IP and, for login, by account. "memory" keeps state per process in an LRU of
+    # RATE_LIMIT_MAX_KEYS; "redis" shares it between workers (needs the redis package).
+    # Behind a reverse proxy, let uvicorn take the client address from X-Forwarded-For by
+    # setting FORWARDED_ALLOW_IPS to the proxy's address, or name the header it appends
+    # the client address to here.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_FORWARDED_HEADER: str = ""
+    RATE_LIMIT_LOGIN_PER_IP: str = "20/minute"
+    RATE_LIMIT_LOGIN_PER_ACCOUNT: str = "10/minute"
+    RATE_LIMIT_SIGNUP_PER_IP: str = "10/hour"
+    RATE_LIMIT_PUBLIC_PER_IP: str = "120/minute"
+
+    # Internal/admin endpoints are disabled unless a token is configured
+    INTERNAL_API_TOKEN: str = ""
+
     FRONTEND_URL: str = "http://localhost:5173"
     
     # Google OAuth
@@ -0,0 +1,122 @@
+# core/delivery.py
+import asyncio
+import mailbox
+from email.message import EmailMessage
+from typing import Any, Dict, Optional
+import aiosmtplib
+import httpx
+from twilio.base.exceptions import TwilioRestException
+from twilio.rest import Client
+from .config import get_settings
+from .email.pool import smtp_pool
+
+settings = get_settings()
+
+MAIL_BACKENDS = ("smtp", "smtp_sink", "file")
+SMS_BACKENDS = ("provider", "http_sink")
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+class PermanentNotificationError(ValueError):
+    """A send that cannot succeed on retry (no recipient, missing or rejected configuration)"""
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    """Whether retrying the send that raised `error` is pointless"""
+    if isinstance(error, (PermanentNotificationError, aiosmtplib.SMTPRecipientsRefused)):
+        return True
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        # 5xx: bad credentials, refused sender or recipient; 4xx is temporary
+        return 500 <= error.code < 600
+    status = None
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    elif isinstance(error, TwilioRestException):
+        status = error.status
+    # Rejected requests stay rejected, except timeouts and rate limiting
+    return status is not None and 400 <= status < 500 and status not in (408, 429)
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for HTTP SMS APIs"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=10.0)
+    return _http_client
+
+
+def sms_sink_url() -> str:
+    return f"http://{settings.SMS_SINK_HOST}:{settings.SMS_SINK_PORT}/messages"
+
+
+async def deliver_email(email_settings: Dict[str, Any], message: EmailMessage) -> None:
+    """Hand a message to the configured mail backend"""
+    backend = settings.MAIL_BACKEND
+    if backend == "smtp":
+        await smtp_pool.send(email_settings, message)
+    elif backend == "smtp_sink":
+        await smtp_pool.send({
+            'smtp_server': settings.MAIL_SINK_HOST,
+            'smtp_port': settings.MAIL_SINK_PORT,
+            'smtp_username': None,
+            'smtp_password': None,
+            'smtp_security': "none",
+        }, message)
+    elif backend == "file":
+        await asyncio.to_thread(_write_maildir, message)
+    else:
+        raise ValueError(f"Unsupported mail backend: {backend}")
+
+
+def _write_maildir(message: EmailMessage) -> None:
+    mailbox.Maildir(settings.MAIL_FILE_SINK_DIR, create=True).add(message)
+
+
+async def deliver_sms(sms_settings: Dict[str, Any], to: str, body: str) -> None:
+    """Send an SMS through the host's provider or the configured sink"""
+    if settings.SMS_BACKEND == "http_sink":
+        response = await _get_http_client().post(sms_sink_url(), json={
+            "from": sms_settings.get('from_number'),
+            "to": to,
+            "body": body
+        })
+        response.raise_for_status()
+        return
+    if settings.SMS_BACKEND != "provider":
+        raise ValueError(f"Unsupported SMS backend: {settings.SMS_BACKEND}")
+
+    provider = sms_settings.get('provider') or 'twilio'
+    if provider == 'twilio':
+        if not all([
+            sms_settings.get('account_sid'),
+            sms_settings.get('auth_token'),
+            sms_settings.get('from_number')
+        ]):
+            raise PermanentNotificationError("Missing required Twilio configuration")
+        # The Twilio SDK is blocking, keep it off the event loop
+        await asyncio.to_thread(_send_twilio_sms, sms_settings, to, body)
+    elif provider == 'custom':
+        if not all([sms_settings.get('api_url'), sms_settings.get('api_key')]):
+            raise PermanentNotificationError("Missing required custom API configuration")
+        response = await _get_http_client().post(
+            sms_settings['api_url'],
+            headers={"Authorization": f"Bearer {sms_settings['api_key']}"},
+            json={"to": to, "message": body}
+        )
+        response.raise_for_status()
+    else:
+        raise PermanentNotificationError(f"Unsupported SMS provider: {provider}")
+
+
+def _send_twilio_sms(sms_settings: Dict[str, Any], to: str, body: str) -> None:
+    client = Client(sms_settings['account_sid'], sms_settings['auth_token'])
+    client.messages.create(body=body, from_=sms_settings['from_number'], to=to)
+
+
+async def close_delivery_clients() -> None:
+    global _http_client
+    smtp_pool.close()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
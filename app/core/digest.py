@@ -0,0 +1,222 @@
+# core/digest.py
+import asyncio
+import math
+import uuid
+from datetime import datetime, time, timedelta
+from itertools import groupby
+from typing import Dict, List, Optional
+import pytz
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db.database import AsyncSessionLocal
+from ..models.digest import DigestItem
+from ..models.profile import Profile
+from ..models.settings import Settings
+from ..models.user import User
+from .config import get_settings
+
+settings = get_settings()
+
+DEFAULT_DIGEST_HOUR = 7
+
+# A worker that dies mid-send releases its items after this long; they are then sent again
+LEASE_SECONDS = 300
+
+
+def email_enabled(host_settings: Optional[Settings]) -> bool:
+    """Whether the host has an email account and wants email notifications at all"""
+    if not host_settings or not host_settings.email_settings:
+        return False
+    return bool((host_settings.notification_settings or {}).get('email', {}).get('enabled'))
+
+
+def digest_enabled(host_settings: Optional[Settings]) -> bool:
+    """Whether the host wants booking/cancellation emails batched into a digest"""
+    return email_enabled(host_settings) and bool(host_settings.notification_settings['email'].get('digest'))
+
+
+def digest_hour(host_settings: Settings) -> int:
+    """The host's digest hour; settings saved before it was validated fall back to the default"""
+    hour = host_settings.notification_settings['email'].get('digestHour', DEFAULT_DIGEST_HOUR)
+    if type(hour) is not int or not 0 <= hour <= 23:
+        return DEFAULT_DIGEST_HOUR
+    return hour
+
+
+def record_digest_item(
+    db: AsyncSession,
+    user_id: int,
+    kind: str,
+    event_title: str,
+    event_time: datetime,
+    attendee_name: Optional[str] = None,
+    attendee_email: Optional[str] = None,
+    detail: Optional[str] = None
+) -> None:
+    """Queue a host notification for the next digest; the caller commits"""
+    db.add(DigestItem(
+        user_id=user_id,
+        kind=kind,
+        event_title=event_title,
+        event_time=event_time,
+        attendee_name=attendee_name,
+        attendee_email=attendee_email,
+        detail=detail
+    ))
+
+
+def last_digest_boundary(now: datetime, time_zone: Optional[str], hour: int, window_hours: int) -> datetime:
+    """Most recent digest send time for a host, as naive UTC.
+
+    Boundaries fall every `window_hours` hours starting at `hour` o'clock in
+    the host's local time zone.
+    """
+    try:
+        tz = pytz.timezone(time_zone or "UTC")
+    except pytz.UnknownTimeZoneError:
+        tz = pytz.utc
+    # Step in wall-clock time: across a DST change the previous 07:00 is 23 or 25 hours back
+    local_now = pytz.utc.localize(now).astimezone(tz).replace(tzinfo=None)
+    anchor = datetime.combine(local_now.date(), time(hour % 24))
+    periods = math.floor((local_now - anchor).total_seconds() / (window_hours * 3600))
+    boundary = tz.localize(anchor + timedelta(hours=periods * window_hours))
+    return boundary.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def build_digest_body(items: List[DigestItem]) -> str:
+    sections = []
+    for kind, heading in (("booking", "New bookings"), ("cancellation", "Cancellations")):
+        entries = [item for item in items if item.kind == kind]
+        if not entries:
+            continue
+        lines = [f"{heading} ({len(entries)}):"]
+        for item in entries:
+            attendee = item.attendee_name or item.attendee_email or "Unknown attendee"
+            if item.attendee_name and item.attendee_email:
+                attendee = f"{item.attendee_name} <{item.attendee_email}>"
+            line = f"  - {item.event_time.strftime('%a, %B %d at %I:%M %p')}  {item.event_title} with {attendee}"
+            if item.detail:
+                line += f" ({'Reason' if kind == 'cancellation' else 'Location'}: {item.detail})"
+            lines.append(line)
+        sections.append("\n".join(lines))
+
+    return "Here is your agenda digest.\n\n" + "\n\n".join(sections) + "\n"
+
+
+async def _send_account_digests(batch: List[tuple]) -> None:
+    """Send digests sharing one SMTP account back to back over one pooled session"""
+    from ..utils.notifications import send_digest_email
+
+    for user_id, host_email, items in batch:
+        await send_digest_email(
+            user_id=user_id,
+            to_email=host_email,
+            subject=f"Your agenda digest: {len(items)} update{'s' if len(items) != 1 else ''}",
+            body=build_digest_body(items)
+        )
+
+
+async def _send_host_batch(db: AsyncSession, host_ids: List[int], now: datetime) -> int:
+    hosts = (await db.execute(
+        select(User.id, User.email, Settings, Profile.time_zone).outerjoin(
+            Settings, Settings.user_id == User.id
+        ).outerjoin(
+            Profile, Profile.user_id == User.id
+        ).where(User.id.in_(host_ids))
+    )).all()
+
+    cutoffs: Dict[int, datetime] = {}
+    recipients = {}
+    for user_id, email, host_settings, time_zone in hosts:
+        if digest_enabled(host_settings):
+            cutoffs[user_id] = last_digest_boundary(
+                now, time_zone, digest_hour(host_settings), settings.DIGEST_WINDOW_HOURS
+            )
+        elif email_enabled(host_settings):
+            # Digest turned off after items were queued: flush them now rather than at a boundary
+            cutoffs[user_id] = now
+        else:
+            continue
+        recipients[user_id] = (email, host_settings.email_settings)
+
+    leased_at = datetime.utcnow()
+    unleased = or_(DigestItem.locked_until.is_(None), DigestItem.locked_until < leased_at)
+
+    # Hosts that turned email off (or have no settings) will never get these
+    unreachable = [user_id for user_id in host_ids if user_id not in cutoffs]
+    if unreachable:
+        await db.execute(delete(DigestItem).where(DigestItem.user_id.in_(unreachable), unleased))
+        await db.commit()
+
+    if not cutoffs:
+        return 0
+
+    # One grouped query for every due host in the batch
+    due = (await db.execute(
+        select(DigestItem.id, DigestItem.user_id, DigestItem.created_at).where(
+            DigestItem.user_id.in_(list(cutoffs)),
+            DigestItem.created_at < max(cutoffs.values()),
+            unleased
+        )
+    )).all()
+    due_ids = [item_id for item_id, user_id, created_at in due if created_at < cutoffs[user_id]]
+    if not due_ids:
+        return 0
+
+    # Claim before sending: another worker running the same pass claims nothing
+    lease = uuid.uuid4().hex
+    await db.execute(
+        update(DigestItem).where(DigestItem.id.in_(due_ids), unleased).values(
+            locked_by=lease,
+            locked_until=leased_at + timedelta(seconds=LEASE_SECONDS)
+        )
+    )
+    await db.commit()
+    items = (await db.scalars(
+        select(DigestItem).where(DigestItem.locked_by == lease).order_by(DigestItem.user_id, DigestItem.event_time)
+    )).all()
+
+    by_account: Dict[tuple, List[tuple]] = {}
+    for user_id, host_items in groupby(items, key=lambda item: item.user_id):
+        email, email_settings = recipients[user_id]
+        account = (email_settings.get('smtp_server'), email_settings.get('smtp_username'))
+        by_account.setdefault(account, []).append((user_id, email, list(host_items)))
+
+    if not by_account:
+        return 0
+
+    await asyncio.gather(*(_send_account_digests(batch) for batch in by_account.values()))
+
+    # Failed sends are already persisted by the retry queue, so the items can go
+    await db.execute(delete(DigestItem).where(DigestItem.locked_by == lease))
+    await db.commit()
+    return sum(len(batch) for batch in by_account.values())
+
+
+async def send_due_digests(now: Optional[datetime] = None) -> int:
+    """Send every digest whose window has closed; returns the number of digests sent"""
+    now = now or datetime.utcnow()
+    sent = 0
+    last_host_id = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            host_ids = (await db.scalars(
+                select(DigestItem.user_id).where(
+                    DigestItem.user_id > last_host_id
+                ).distinct().order_by(DigestItem.user_id).limit(settings.DIGEST_HOST_BATCH_SIZE)
+            )).all()
+            if not host_ids:
+                break
+            sent += await _send_host_batch(db, host_ids, now)
+            last_host_id = host_ids[-1]
+    return sent
+
+
+async def run_digest_worker() -> None:
+    """Background loop sending host digests as their windows close"""
+    while True:
+        try:
+            await send_due_digests()
+        except Exception as e:
+            print(f"Digest worker error: {str(e)}")
+        await asyncio.sleep(settings.DIGEST_POLL_SECONDS)
@@ -0,0 +1,118 @@
+import time
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import Any, Dict, List, Tuple
+from aiosmtplib import SMTP
+from ..config import get_settings
+
+settings = get_settings()
+
+# How a session is secured: implicit TLS, required STARTTLS, or plain text
+SMTP_SECURITY = ("ssl", "starttls", "none")
+
+
+def build_message(email_settings: Dict[str, Any], to_email: str, subject: str, body: str) -> EmailMessage:
+    """Plain text message using the host's sender identity"""
+    message = EmailMessage()
+    message["From"] = formataddr((email_settings.get('from_name') or "", email_settings['from_email']))
+    message["To"] = to_email
+    message["Subject"] = subject
+    message.set_content(body)
+    return message
+
+
+def smtp_security(email_settings: Dict[str, Any]) -> str:
+    """The account's `smtp_security`, defaulting to implicit TLS on 465 and STARTTLS elsewhere"""
+    security = email_settings.get('smtp_security')
+    if security is None:
+        return "ssl" if int(email_settings['smtp_port']) == 465 else "starttls"
+    if security not in SMTP_SECURITY:
+        raise ValueError(f"Unsupported smtp_security: {security}")
+    return security
+
+
+class SMTPPool:
+    """Keeps authenticated SMTP sessions open per account so batches reuse them"""
+
+    def __init__(self, max_idle_per_account: int, idle_timeout: float):
+        self.max_idle_per_account = max_idle_per_account
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[Tuple, List[Tuple[SMTP, float]]] = {}
+
+    @staticmethod
+    def _account(email_settings: Dict[str, Any]) -> Tuple:
+        return (
+            email_settings['smtp_server'],
+            int(email_settings['smtp_port']),
+            email_settings.get('smtp_username'),
+            smtp_security(email_settings)
+        )
+
+    async def _open(self, email_settings: Dict[str, Any]) -> SMTP:
+        security = smtp_security(email_settings)
+        # start_tls=True fails the connection when the server doesn't offer
+        # STARTTLS; aiosmtplib's default would quietly carry on in plain text
+        smtp = SMTP(
+            hostname=email_settings['smtp_server'],
+            port=int(email_settings['smtp_port']),
+            username=email_settings.get('smtp_username') or None,
+            password=email_settings.get('smtp_password') or None,
+            use_tls=security == "ssl",
+            start_tls=security == "starttls",
+        )
+        await smtp.connect()
+        return smtp
+
+    @staticmethod
+    def _discard(smtp: SMTP) -> None:
+        try:
+            smtp.close()
+        except Exception:
+            pass
+
+    def _checkout(self, key: Tuple):
+        idle = self._idle.get(key) or []
+        now = time.monotonic()
+        while idle:
+            smtp, since = idle.pop()
+            if smtp.is_connected and now - since < self.idle_timeout:
+                return smtp
+            self._discard(smtp)
+        return None
+
+    def _checkin(self, key: Tuple, smtp: SMTP) -> None:
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self.max_idle_per_account and smtp.is_connected:
+            idle.append((smtp, time.monotonic()))
+        else:
+            self._discard(smtp)
+
+    async def send(self, email_settings: Dict[str, Any], message: EmailMessage) -> None:
+        key = self._account(email_settings)
+        smtp = self._checkout(key)
+        if smtp is not None:
+            try:
+                await smtp.send_message(message)
+            except Exception:
+                # The pooled session may have gone stale; retry once on a fresh one
+                self._discard(smtp)
+            else:
+                self._checkin(key, smtp)
+                return
+
+        smtp = await self._open(email_settings)
+        try:
+            await smtp.send_message(message)
+        except Exception:
+            self._discard(smtp)
+            raise
+        self._checkin(key, smtp)
+
+    def close(self) -> None:
+        for idle in self._idle.values():
+            for smtp, _ in idle:
+                self._discard(smtp)
+        self._idle.clear()
+
+
+smtp_pool = SMTPPool(settings.SMTP_POOL_MAX_IDLE, settings.SMTP_POOL_IDLE_SECONDS)
@@ -0,0 +1,221 @@
+# core/notification_retry.py
+import asyncio
+import functools
+import inspect
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db.database import AsyncSessionLocal
+from ..models.notification import NotificationRetry, NotificationDeadLetter
+from .config import get_settings
+from .delivery import is_permanent_failure
+
+settings = get_settings()
+
+# Undecorated senders by kind, used by the worker so a failed retry does not re-enqueue itself
+_senders: Dict[str, Callable[..., Awaitable[bool]]] = {}
+
+# Sender arguments that would put provider credentials into the payload tables
+SECRET_ARGUMENTS = {"email_settings", "sms_settings"}
+
+LEASE_SECONDS = 300
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {"__datetime__"}:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+def backoff_delay(attempts: int) -> float:
+    """Exponential backoff with equal jitter, capped at the configured maximum"""
+    delay = min(
+        settings.NOTIFICATION_RETRY_MAX_SECONDS,
+        settings.NOTIFICATION_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    )
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+async def enqueue_retry(kind: str, payload: Dict[str, Any], error: str) -> None:
+    """Persist a failed send so the worker can retry it later"""
+    await _persist(kind, NotificationRetry(
+        kind=kind,
+        payload={key: _encode(value) for key, value in payload.items()},
+        attempts=1,
+        next_attempt_at=datetime.utcnow() + timedelta(seconds=backoff_delay(1)),
+        last_error=error
+    ))
+
+
+async def dead_letter(kind: str, payload: Dict[str, Any], error: str) -> None:
+    """Persist a send that failed permanently; only a manual replay retries it"""
+    await _persist(kind, NotificationDeadLetter(
+        kind=kind,
+        payload={key: _encode(value) for key, value in payload.items()},
+        attempts=1,
+        last_error=error,
+        created_at=datetime.utcnow()
+    ))
+
+
+async def _persist(kind: str, row) -> None:
+    async with AsyncSessionLocal() as db:
+        try:
+            db.add(row)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"Failed to persist failed {kind}: {str(e)}")
+
+
+def retryable(kind: str):
+    """Register a sender and persist its failures for retry.
+
+    The decorated function should raise on failure; transient errors are
+    queued for retry, permanent ones (see is_permanent_failure) go straight
+    to the dead letters. The wrapper keeps the existing contract of
+    returning False to the caller. Arguments are stored as the payload, so
+    senders take the host's user_id and load credentials when they run.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        secret = SECRET_ARGUMENTS & set(signature.parameters)
+        if secret:
+            raise TypeError(f"{fn.__name__} would persist {', '.join(sorted(secret))} in its retry payload")
+        _senders[kind] = fn
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs) -> bool:
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                payload = dict(signature.bind(*args, **kwargs).arguments)
+                if is_permanent_failure(e):
+                    print(f"Failed to send {kind}, not retrying: {str(e)}")
+                    await dead_letter(kind, payload, str(e))
+                else:
+                    print(f"Failed to send {kind}, scheduling retry: {str(e)}")
+                    await enqueue_retry(kind, payload, str(e))
+                return False
+
+        return wrapper
+    return decorator
+
+
+async def _claim_batch(db: AsyncSession, batch_size: int) -> List[NotificationRetry]:
+    """Lease a batch of due retries so concurrent workers don't double-send"""
+    now = datetime.utcnow()
+    lease = uuid.uuid4().hex
+    due_ids = (await db.scalars(
+        select(NotificationRetry.id).where(
+            NotificationRetry.next_attempt_at <= now,
+            or_(NotificationRetry.locked_until.is_(None), NotificationRetry.locked_until < now)
+        ).order_by(NotificationRetry.next_attempt_at).limit(batch_size)
+    )).all()
+    if not due_ids:
+        return []
+
+    await db.execute(
+        update(NotificationRetry).where(
+            NotificationRetry.id.in_(due_ids),
+            or_(NotificationRetry.locked_until.is_(None), NotificationRetry.locked_until < now)
+        ).values(
+            locked_by=lease,
+            locked_until=now + timedelta(seconds=LEASE_SECONDS)
+        )
+    )
+    await db.commit()
+
+    return (await db.scalars(
+        select(NotificationRetry).where(NotificationRetry.locked_by == lease)
+    )).all()
+
+
+async def _attempt(row: NotificationRetry) -> Tuple[Optional[str], bool]:
+    """Run one retry; returns (error message or None on success, whether the error is permanent)"""
+    sender = _senders.get(row.kind)
+    if sender is None:
+        return f"Unknown notification kind: {row.kind}", True
+    try:
+        sent = await sender(**{key: _decode(value) for key, value in row.payload.items()})
+        return (None, False) if sent else ("Sender reported failure", False)
+    except TypeError as e:
+        # Payload no longer matches the sender's signature
+        return str(e), True
+    except Exception as e:
+        return str(e), is_permanent_failure(e)
+
+
+async def retry_due_notifications(batch_size: Optional[int] = None) -> int:
+    """Retry one batch of due notifications; returns how many were processed"""
+    from ..utils import notifications  # noqa: F401  (registers the senders)
+
+    async with AsyncSessionLocal() as db:
+        rows = await _claim_batch(db, batch_size or settings.NOTIFICATION_RETRY_BATCH_SIZE)
+        if not rows:
+            return 0
+
+        outcomes = await asyncio.gather(*(_attempt(row) for row in rows))
+
+        now = datetime.utcnow()
+        for row, (error, permanent) in zip(rows, outcomes):
+            if error is None:
+                await db.delete(row)
+                continue
+
+            row.attempts += 1
+            row.last_error = error
+            if permanent or row.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+                db.add(NotificationDeadLetter(
+                    kind=row.kind,
+                    payload=row.payload,
+                    attempts=row.attempts,
+                    last_error=error,
+                    created_at=row.created_at,
+                    failed_at=now
+                ))
+                await db.delete(row)
+            else:
+                row.next_attempt_at = now + timedelta(seconds=backoff_delay(row.attempts))
+                row.locked_by = None
+                row.locked_until = None
+        await db.commit()
+        return len(rows)
+
+
+async def replay_dead_letter(db: AsyncSession, dead_letter: NotificationDeadLetter) -> NotificationRetry:
+    """Move a dead letter back onto the retry queue for immediate delivery"""
+    retry = NotificationRetry(
+        kind=dead_letter.kind,
+        payload=dead_letter.payload,
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+        last_error=dead_letter.last_error,
+        created_at=dead_letter.created_at
+    )
+    db.add(retry)
+    await db.delete(dead_letter)
+    return retry
+
+
+async def run_retry_worker() -> None:
+    """Background loop draining the retry queue"""
+    batch_size = settings.NOTIFICATION_RETRY_BATCH_SIZE
+    while True:
+        try:
+            processed = await retry_due_notifications(batch_size)
+        except Exception as e:
+            print(f"Notification retry worker error: {str(e)}")
+            processed = 0
+        # Keep draining while there is a backlog, otherwise wait for the next poll
+        if processed < batch_size:
+            await asyncio.sleep(settings.NOTIFICATION_RETRY_POLL_SECONDS)
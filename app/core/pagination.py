@@ -0,0 +1,31 @@
+# core/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Tuple, Union
+
+Position = Union[datetime, float]
+
+
+def encode_cursor(position: Position, event_id: int) -> str:
+    """Opaque cursor pointing just past the given (start_time or rank, id)"""
+    if isinstance(position, datetime):
+        key = ["t", position.isoformat()]
+    else:
+        key = ["r", float(position)]
+    raw = json.dumps(key + [event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Position, int]:
+    """Inverse of encode_cursor; raises ValueError on anything malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        kind, position, event_id = json.loads(raw)
+        if kind == "t":
+            return datetime.fromisoformat(position), int(event_id)
+        if kind == "r":
+            return float(position), int(event_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    raise ValueError("Invalid cursor")
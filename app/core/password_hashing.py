@@ -0,0 +1,94 @@
+# core/password_hashing.py
+"""bcrypt off the event loop.
+
+Hashing and verification run on a bounded executor: by default a process
+pool of PASSWORD_HASH_WORKERS, so a login burst uses every core instead of
+stalling the worker's event loop for ~250ms per attempt. At most
+PASSWORD_HASH_MAX_PENDING calls may be queued or running; beyond that
+callers get PasswordHashingBusy and the endpoints answer 503.
+
+The cost is BCRYPT_ROUNDS. Stored hashes with a different cost verify as
+usual and come back with a replacement hash, which login saves.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+from .config import get_settings
+
+settings = get_settings()
+
+
+class PasswordHashingBusy(RuntimeError):
+    pass
+
+
+@lru_cache()
+def _context(rounds: int) -> CryptContext:
+    # min == max == default, so a hash with any other cost is due for an update
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds
+    )
+
+
+# Module-level so the process pool can pickle them
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    try:
+        return _context(rounds).verify_and_update(password, hashed_password)
+    except (ValueError, TypeError) as e:
+        print(f"Error verifying password: {e}")
+        return False, None
+
+
+_executor: Optional[Executor] = None
+_pending = 0
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        workers = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+        if settings.PASSWORD_HASH_EXECUTOR == "thread":
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        else:
+            # spawn: forking a process that already runs driver threads can deadlock the child
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+async def _run(fn, *args):
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHashingBusy("Too many password checks in progress")
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password, settings.BCRYPT_ROUNDS)
+
+
+async def verify_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(matches, replacement hash when the stored cost differs from BCRYPT_ROUNDS)"""
+    return await _run(_verify, password, hashed_password, settings.BCRYPT_ROUNDS)
+
+
+def shutdown_password_hashing() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
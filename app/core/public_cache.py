@@ -0,0 +1,49 @@
+# core/public_cache.py
+"""Read-through caches for the public booking page.
+
+An assembled public event type (event type + host name and email) is
+cached under both ("slug", slug) and ("id", id); public host profiles under
+the user id. Entries only change when the host edits the event type or
+their profile, and those endpoints invalidate here after committing.
+"""
+from typing import Any, Optional
+from .cache import TTLCache
+from .config import get_settings
+
+settings = get_settings()
+
+_event_types = TTLCache(settings.PUBLIC_CACHE_SIZE, settings.PUBLIC_CACHE_TTL_SECONDS)
+_profiles = TTLCache(settings.PUBLIC_CACHE_SIZE, settings.PUBLIC_CACHE_TTL_SECONDS)
+
+
+def get_event_type(by_id: bool, identifier: Any) -> Optional[Any]:
+    return _event_types.get(("id" if by_id else "slug", identifier))
+
+
+def store_event_type(event_type) -> None:
+    _event_types.set(("id", event_type.id), event_type)
+    _event_types.set(("slug", event_type.slug), event_type)
+
+
+def get_profile(user_id: int) -> Optional[dict]:
+    return _profiles.get(user_id)
+
+
+def store_profile(user_id: int, profile: dict) -> None:
+    _profiles.set(user_id, profile)
+
+
+def invalidate_event_type(event_type_id: int) -> None:
+    # By value, so an entry under a slug the event type no longer has goes too
+    _event_types.discard_where(lambda key, event_type: event_type.id == event_type_id)
+
+
+def invalidate_host(user_id: int) -> None:
+    """The host's profile changed: drop it and every event type showing their name"""
+    _profiles.pop(user_id)
+    _event_types.discard_where(lambda key, event_type: event_type.user_id == user_id)
+
+
+def clear_public_cache() -> None:
+    _event_types.clear()
+    _profiles.clear()
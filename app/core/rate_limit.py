@@ -0,0 +1,182 @@
+# core/rate_limit.py
+"""Request rate limits (GCRA) for login and the public endpoints.
+
+Each rule allows `count` requests per period, as a burst or spread out.
+GCRA keeps a single timestamp per key, the theoretical arrival time
+(TAT): a request is allowed when the TAT it would push forward stays
+within the burst tolerance of now.
+
+Rules run as route dependencies, declared ahead of the DB session, so a
+rejected request costs no query and no bcrypt work.
+
+Backends: "memory" keeps TATs in a bounded LRU in this process; "redis"
+(RATE_LIMIT_REDIS_URL, needs the `redis` package) shares them between
+workers through an atomic Lua script.
+
+Limits are keyed by the client address the server reports. Behind a
+reverse proxy that is the proxy's address unless uvicorn trusts it to
+supply the client's (FORWARDED_ALLOW_IPS, see the Dockerfile), or
+RATE_LIMIT_FORWARDED_HEADER names the header to read. Requests that carry
+X-Forwarded-For which was not applied are counted and logged, since every
+client behind that proxy then shares one bucket.
+"""
+import math
+import time
+from typing import Any, Dict, Tuple
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+from .cache import TTLCache
+from .config import get_settings
+
+settings = get_settings()
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str) -> Tuple[float, float]:
+    """"20/minute" -> (emission interval, burst tolerance) in seconds"""
+    count, _, period = rate.partition("/")
+    count = int(count)
+    seconds = PERIODS[period.strip().lower()]
+    interval = seconds / count
+    return interval, interval * count
+
+
+class MemoryBackend:
+    """TATs in an LRU; an evicted key simply starts with a full burst again"""
+
+    def __init__(self, max_keys: int):
+        self._tats = TTLCache(max_keys)
+
+    async def hit(self, key: str, interval: float, tolerance: float) -> float:
+        """Record a request; returns 0 when allowed, else seconds until it would be"""
+        now = time.time()
+        tat = max(self._tats.get(key, now), now)
+        new_tat = tat + interval
+        allow_at = new_tat - tolerance
+        if now < allow_at:
+            return allow_at - now
+        self._tats.set(key, new_tat)
+        return 0.0
+
+    def clear(self) -> None:
+        self._tats.clear()
+
+
+_GCRA_LUA = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local tolerance = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - tolerance
+if now < allow_at then return tostring(allow_at - now) end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return '0'
+"""
+
+
+class RedisBackend:
+    """TATs in Redis with an expiry, shared by every worker"""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis needs the `redis` package installed")
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_GCRA_LUA)
+
+    async def hit(self, key: str, interval: float, tolerance: float) -> float:
+        wait = await self._script(keys=[f"rate:{key}"], args=[time.time(), interval, tolerance])
+        return float(wait)
+
+    def clear(self) -> None:
+        pass
+
+
+class RateLimiter:
+    def __init__(self):
+        self._backend = None
+        self.allowed: Dict[str, int] = {}
+        self.rejected: Dict[str, int] = {}
+        self.unresolved_proxy_requests = 0
+
+    @property
+    def backend(self):
+        # Built on first use so the settings in effect at startup pick the backend
+        if self._backend is None:
+            if settings.RATE_LIMIT_BACKEND == "redis":
+                self._backend = RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+            else:
+                self._backend = MemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
+        return self._backend
+
+    async def enforce(self, rule: str, rate: str, key: str) -> None:
+        """Raise 429 when `key` exceeded `rate` under `rule`"""
+        if not settings.RATE_LIMIT_ENABLED or not rate:
+            return
+        interval, tolerance = parse_rate(rate)
+        wait = await self.backend.hit(f"{rule}:{key}", interval, tolerance)
+        if wait > 0:
+            self.rejected[rule] = self.rejected.get(rule, 0) + 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(wait))}
+            )
+        self.allowed[rule] = self.allowed.get(rule, 0) + 1
+
+    def reset(self) -> None:
+        if self._backend is not None:
+            self._backend.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": settings.RATE_LIMIT_BACKEND,
+            "allowed": dict(self.allowed),
+            "rejected": dict(self.rejected),
+            "unresolved_proxy_requests": self.unresolved_proxy_requests
+        }
+
+
+limiter = RateLimiter()
+
+
+def client_ip(request: Request) -> str:
+    """Caller address; behind a proxy, the last hop the proxy recorded"""
+    if settings.RATE_LIMIT_FORWARDED_HEADER:
+        forwarded = request.headers.get(settings.RATE_LIMIT_FORWARDED_HEADER)
+        if forwarded:
+            return forwarded.split(",")[-1].strip()
+    host = request.client.host if request.client else "unknown"
+    forwarded_for = request.headers.get("x-forwarded-for")
+    # uvicorn's proxy headers replace the client with one of these hops when it trusts the proxy
+    if forwarded_for and host not in (hop.strip() for hop in forwarded_for.split(",")):
+        if not limiter.unresolved_proxy_requests:
+            print(
+                f"Rate limits: request from proxy {host} carries X-Forwarded-For, but no client address "
+                "was taken from it; set FORWARDED_ALLOW_IPS to the proxy's address (or "
+                "RATE_LIMIT_FORWARDED_HEADER), otherwise all its clients share one limit"
+            )
+        limiter.unresolved_proxy_requests += 1
+    return host
+
+
+async def limit_login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends()
+) -> None:
+    """Per client IP and per account, before the user lookup and bcrypt"""
+    await limiter.enforce("login-ip", settings.RATE_LIMIT_LOGIN_PER_IP, client_ip(request))
+    await limiter.enforce("login-account", settings.RATE_LIMIT_LOGIN_PER_ACCOUNT, form_data.username.strip().lower())
+
+
+async def limit_signup(request: Request) -> None:
+    await limiter.enforce("signup-ip", settings.RATE_LIMIT_SIGNUP_PER_IP, client_ip(request))
+
+
+async def limit_public(request: Request) -> None:
+    """Public booking-page reads, per client IP"""
+    await limiter.enforce("public-ip", settings.RATE_LIMIT_PUBLIC_PER_IP, client_ip(request))
@@ -0,0 +1,172 @@
+# core/refresh_tokens.py
+"""Rotating refresh tokens and session revocation.
+
+Login starts a token family (one session) and returns a short-lived access
+token carrying the family id as `fam`, plus an opaque refresh token stored
+only as a SHA-256 digest. /auth/refresh exchanges a refresh token for a
+new pair with one indexed lookup, no bcrypt. Each refresh token works
+once: presenting one that was already rotated means a copy leaked, and the
+whole family is revoked.
+
+Revoking a family (logout, reuse) records it in revoked_token_families
+until the last access token it could have issued expires. Every worker
+mirrors that small table in memory (REVOCATION_SYNC_SECONDS), so
+get_current_user checks revocation with a dict lookup.
+"""
+import asyncio
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Tuple
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db.database import AsyncSessionLocal
+from ..models.refresh_token import RefreshToken, RevokedTokenFamily
+from ..models.user import User
+from .api_tokens import hash_token
+from .config import get_settings
+
+settings = get_settings()
+
+# Expired rows are pruned at most this often
+PRUNE_SECONDS = 3600
+
+
+class RefreshTokenError(Exception):
+    pass
+
+
+class RevokedFamilies:
+    """family id -> unix time after which its access tokens have all expired anyway"""
+
+    def __init__(self):
+        self._until: Dict[str, float] = {}
+
+    def is_revoked(self, family_id: str) -> bool:
+        until = self._until.get(family_id)
+        if until is None:
+            return False
+        if until <= time.time():
+            del self._until[family_id]
+            return False
+        return True
+
+    def add(self, family_id: str, until: float) -> None:
+        self._until[family_id] = until
+
+    def merge(self, entries: Dict[str, float]) -> None:
+        # Keep local revocations a concurrent sync may have read too early to see
+        now = time.time()
+        self._until = {**{f: until for f, until in self._until.items() if until > now}, **entries}
+
+    def clear(self) -> None:
+        self._until = {}
+
+    def __len__(self) -> int:
+        return len(self._until)
+
+
+revoked_families = RevokedFamilies()
+
+
+def _utc_timestamp(moment: datetime) -> float:
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+
+def new_family_id() -> str:
+    return secrets.token_hex(16)
+
+
+def issue_refresh_token(db: AsyncSession, user_id: int, family_id: str) -> str:
+    """Add a refresh token for the family to the session; the caller commits"""
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=hash_token(token),
+        family_id=family_id,
+        expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    return token
+
+
+async def revoke_family(db: AsyncSession, family_id: str) -> None:
+    """End a session: no further refreshes, and its access tokens are rejected; the caller commits"""
+    now = datetime.utcnow()
+    until = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    await db.merge(RevokedTokenFamily(family_id=family_id, expires_at=until))
+    await db.execute(update(RefreshToken).where(
+        RefreshToken.family_id == family_id,
+        RefreshToken.rotated_at.is_(None)
+    ).values(rotated_at=now))
+    revoked_families.add(family_id, _utc_timestamp(until))
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Tuple[str, str, str]:
+    """Exchange a refresh token; returns (user email, family id, new refresh token)"""
+    row = (await db.execute(
+        select(RefreshToken, User.email, User.is_active)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == hash_token(token))
+        .limit(1)
+    )).first()
+    if row is None:
+        raise RefreshTokenError("Invalid refresh token")
+    refresh, email, is_active = row
+
+    now = datetime.utcnow()
+    if refresh.rotated_at is not None:
+        if not revoked_families.is_revoked(refresh.family_id):
+            await revoke_family(db, refresh.family_id)
+            await db.commit()
+        raise RefreshTokenError("Refresh token already used")
+    if refresh.expires_at <= now or not is_active:
+        raise RefreshTokenError("Refresh token expired")
+
+    # Conditional update, so two concurrent refreshes cannot both succeed
+    claimed = await db.execute(update(RefreshToken).where(
+        RefreshToken.id == refresh.id,
+        RefreshToken.rotated_at.is_(None)
+    ).values(rotated_at=now))
+    if claimed.rowcount != 1:
+        await revoke_family(db, refresh.family_id)
+        await db.commit()
+        raise RefreshTokenError("Refresh token already used")
+
+    new_token = issue_refresh_token(db, refresh.user_id, refresh.family_id)
+    await db.commit()
+    return email, refresh.family_id, new_token
+
+
+async def family_of_refresh_token(db: AsyncSession, token: str):
+    return await db.scalar(select(RefreshToken.family_id).where(
+        RefreshToken.token_hash == hash_token(token)
+    ).limit(1))
+
+
+async def sync_revocations(prune: bool = False) -> None:
+    """Mirror revoked_token_families in memory, optionally deleting expired rows first"""
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        if prune:
+            await db.execute(delete(RevokedTokenFamily).where(RevokedTokenFamily.expires_at <= now))
+            await db.execute(delete(RefreshToken).where(RefreshToken.expires_at <= now))
+            await db.commit()
+        rows = (await db.execute(
+            select(RevokedTokenFamily.family_id, RevokedTokenFamily.expires_at)
+            .where(RevokedTokenFamily.expires_at > now)
+        )).all()
+    revoked_families.merge({family_id: _utc_timestamp(until) for family_id, until in rows})
+
+
+async def run_revocation_sync() -> None:
+    """Background loop picking up sessions revoked by other workers"""
+    pruned = None
+    while True:
+        try:
+            prune = pruned is None or time.monotonic() - pruned >= PRUNE_SECONDS
+            await sync_revocations(prune)
+            if prune:
+                pruned = time.monotonic()
+        except Exception as e:
+            print(f"Revocation sync error: {str(e)}")
+        await asyncio.sleep(settings.REVOCATION_SYNC_SECONDS)
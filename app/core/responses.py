@@ -0,0 +1,22 @@
+# core/responses.py
+"""JSON responses rendered with orjson.
+
+ORJSONResponse is the app's default response class. Endpoints with a
+response_model still go through FastAPI's validation and jsonable_encoder;
+hot list endpoints skip both by returning one of these directly with plain
+dicts built from row tuples (see `row_dicts`).
+"""
+from typing import Any, Iterable, List, Sequence
+import orjson
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+
+class ORJSONResponse(_ORJSONResponse):
+    # json.dumps turns int keys into strings; keep accepting them
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def row_dicts(names: Sequence[str], rows: Iterable[Sequence[Any]]) -> List[dict]:
+    """Zip selected column names onto row tuples; extra trailing columns are ignored"""
+    return [dict(zip(names, row)) for row in rows]
@@ -0,0 +1,91 @@
+# core/schedule.py
+"""Compiled working hours.
+
+`Settings.working_hours` is stored as JSON ({"monday": {"start": "09:00",
+"end": "17:00", "enabled": true}, ...}). Availability code works on a
+WorkingSchedule instead: per weekday, a tuple of (start_minute, end_minute)
+windows. Compiled schedules are cached in process, keyed by the settings
+row and its schedule_version, which update_settings bumps on every change.
+"""
+import re
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Tuple
+from .config import get_settings
+
+settings = get_settings()
+
+# Indexed by date.weekday()
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+_TIME = re.compile(r"^(\d{1,2}):(\d{2})$")
+
+Window = Tuple[int, int]
+
+
+class ScheduleError(ValueError):
+    pass
+
+
+class WorkingSchedule:
+    __slots__ = ("days",)
+
+    def __init__(self, days: Tuple[Tuple[Window, ...], ...]):
+        self.days = days
+
+    def windows(self, day: date) -> Tuple[Window, ...]:
+        """Working (start_minute, end_minute) windows on the given date"""
+        return self.days[day.weekday()]
+
+    @classmethod
+    def compile(cls, working_hours: Dict[str, Any]) -> "WorkingSchedule":
+        """Validate and compile the stored JSON; raises ScheduleError"""
+        if not isinstance(working_hours, dict):
+            raise ScheduleError("Working hours must be an object keyed by weekday")
+        unknown = set(working_hours) - set(WEEKDAYS)
+        if unknown:
+            raise ScheduleError(f"Unknown weekday(s) in working hours: {', '.join(sorted(unknown))}")
+
+        days = []
+        for name in WEEKDAYS:
+            day = working_hours.get(name)
+            if day is not None and not isinstance(day, dict):
+                raise ScheduleError(f"Working hours for {name} must be an object")
+            if not day or not day.get("enabled"):
+                days.append(())
+                continue
+            start = _minutes(day.get("start"), name)
+            end = _minutes(day.get("end"), name)
+            if start >= end:
+                raise ScheduleError(f"Working hours for {name} must start before they end")
+            days.append(((start, end),))
+        return cls(tuple(days))
+
+
+def _minutes(value: Any, day: str) -> int:
+    match = _TIME.match(value) if isinstance(value, str) else None
+    if not match or int(match.group(1)) > 23 or int(match.group(2)) > 59:
+        raise ScheduleError(f"Invalid time {value!r} for {day}, expected HH:MM")
+    return int(match.group(1)) * 60 + int(match.group(2))
+
+
+_cache: "OrderedDict[Tuple[int, int], WorkingSchedule]" = OrderedDict()
+
+
+def get_schedule(user_settings) -> WorkingSchedule:
+    """Compiled schedule for a Settings row, built once per schedule_version"""
+    key = (user_settings.id, user_settings.schedule_version)
+    schedule = _cache.get(key)
+    if schedule is not None:
+        _cache.move_to_end(key)
+        return schedule
+
+    schedule = WorkingSchedule.compile(user_settings.working_hours or {})
+    _cache[key] = schedule
+    if len(_cache) > settings.SCHEDULE_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return schedule
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
@@ -0,0 +1,85 @@
+# core/sinks.py
+"""Local stand-ins for SMTP and SMS providers, for development and load tests"""
+from collections import deque
+from typing import Any, Dict, List, Optional
+from aiohttp import web
+from aiosmtpd.controller import Controller
+from .config import get_settings
+
+settings = get_settings()
+
+RECENT_MESSAGES = 100
+
+
+class SinkStats:
+    def __init__(self):
+        self.received = 0
+        self.recent = deque(maxlen=RECENT_MESSAGES)
+
+    def record(self, message: Dict[str, Any]) -> None:
+        self.received += 1
+        self.recent.append(message)
+
+
+mail_sink_stats = SinkStats()
+sms_sink_stats = SinkStats()
+
+
+class _SMTPSinkHandler:
+    async def handle_DATA(self, server, session, envelope):
+        mail_sink_stats.record({
+            "from": envelope.mail_from,
+            "to": list(envelope.rcpt_tos),
+            "size": len(envelope.content or b"")
+        })
+        return "250 Message accepted"
+
+
+async def _receive_sms(request: web.Request) -> web.Response:
+    payload = await request.json()
+    sms_sink_stats.record(payload)
+    return web.json_response({"status": "queued"}, status=201)
+
+
+_smtp_controller: Optional[Controller] = None
+_sms_runner: Optional[web.AppRunner] = None
+
+
+async def start_sinks() -> List[str]:
+    """Start whichever sinks the configured backends point at"""
+    global _smtp_controller, _sms_runner
+    started = []
+    if settings.MAIL_BACKEND == "smtp_sink" and _smtp_controller is None:
+        _smtp_controller = Controller(
+            _SMTPSinkHandler(),
+            hostname=settings.MAIL_SINK_HOST,
+            port=settings.MAIL_SINK_PORT
+        )
+        _smtp_controller.start()
+        started.append(f"smtp://{settings.MAIL_SINK_HOST}:{settings.MAIL_SINK_PORT}")
+
+    if settings.SMS_BACKEND == "http_sink" and _sms_runner is None:
+        sms_app = web.Application()
+        sms_app.router.add_post("/messages", _receive_sms)
+        _sms_runner = web.AppRunner(sms_app, access_log=None)
+        await _sms_runner.setup()
+        await web.TCPSite(_sms_runner, settings.SMS_SINK_HOST, settings.SMS_SINK_PORT).start()
+        started.append(f"http://{settings.SMS_SINK_HOST}:{settings.SMS_SINK_PORT}/messages")
+    return started
+
+
+async def stop_sinks() -> None:
+    global _smtp_controller, _sms_runner
+    if _smtp_controller is not None:
+        _smtp_controller.stop()
+        _smtp_controller = None
+    if _sms_runner is not None:
+        await _sms_runner.cleanup()
+        _sms_runner = None
+
+
+def get_sink_metrics() -> Dict[str, Any]:
+    return {
+        "mail_received": mail_sink_stats.received,
+        "sms_received": sms_sink_stats.received
+    }
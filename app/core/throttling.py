@@ -0,0 +1,162 @@
+# core/throttling.py
+import asyncio
+import time
+from typing import Any, Dict
+
+from .cache import TTLCache
+from .config import get_settings
+
+settings = get_settings()
+
+
+class QueueFullError(Exception):
+    """Raised when too many sends are already waiting on a provider account"""
+
+
+class QueueExpiredError(Exception):
+    """Raised when a queued send waited longer than its time-to-live"""
+
+
+class TokenBucket:
+    """Token bucket with a bounded FIFO wait queue.
+
+    Callers that find the bucket empty wait their turn instead of failing,
+    unless the queue is full or they outlive the queue TTL.
+    """
+
+    def __init__(self, rate: float, capacity: int, max_queue: int, queue_ttl: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.queue_ttl = queue_ttl
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.waiting = 0
+        self.granted = 0
+        self.rejected = 0
+        self.expired = 0
+        # asyncio.Lock wakes waiters in FIFO order, which gives us the queue
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def _take(self) -> None:
+        async with self._lock:
+            while True:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    async def acquire(self) -> None:
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise QueueFullError(f"Send queue is full ({self.max_queue} waiting)")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._take(), timeout=self.queue_ttl)
+        except asyncio.TimeoutError:
+            self.expired += 1
+            raise QueueExpiredError(f"Send expired after waiting {self.queue_ttl}s in queue")
+        finally:
+            self.waiting -= 1
+        self.granted += 1
+
+    def level(self) -> float:
+        self._refill(time.monotonic())
+        return self.tokens
+
+
+class OutboundLimiter:
+    """One token bucket per provider account for a delivery channel.
+
+    Waiting for a token can take up to the queue TTL, so acquire() belongs on
+    background send paths (BackgroundTasks, retry and digest workers), never
+    inside a request handler; those use try_acquire().
+    """
+
+    def __init__(self, channel: str, rate: float, burst: int, max_queue: int, queue_ttl: float,
+                 max_accounts: int = 10000):
+        self.channel = channel
+        self.rate = rate
+        self.burst = burst
+        self.max_queue = max_queue
+        self.queue_ttl = queue_ttl
+        # A bucket idle for a full refill plus the queue TTL is full and has no
+        # waiters, so dropping it loses nothing; every access renews the TTL
+        self._buckets = TTLCache(max_accounts, burst / rate + queue_ttl)
+
+    def bucket(self, account: str) -> TokenBucket:
+        bucket = self._buckets.get(account)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst, self.max_queue, self.queue_ttl)
+        self._buckets.set(account, bucket)
+        return bucket
+
+    async def acquire(self, account: str) -> None:
+        await self.bucket(account).acquire()
+
+    def try_acquire(self, account: str) -> bool:
+        """Take a token only if one is free right now, without queueing"""
+        bucket = self.bucket(account)
+        if bucket.waiting or bucket.level() < 1:
+            bucket.rejected += 1
+            return False
+        bucket.tokens -= 1
+        bucket.granted += 1
+        return True
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            account: {
+                "tokens": round(bucket.level(), 3),
+                "capacity": bucket.capacity,
+                "queue_length": bucket.waiting,
+                "granted": bucket.granted,
+                "rejected": bucket.rejected,
+                "expired": bucket.expired,
+            }
+            for account, bucket in self._buckets.items()
+        }
+
+
+email_limiter = OutboundLimiter(
+    "email",
+    settings.EMAIL_RATE_PER_SECOND,
+    settings.EMAIL_BURST,
+    settings.NOTIFICATION_QUEUE_MAX_DEPTH,
+    settings.NOTIFICATION_QUEUE_TTL_SECONDS,
+    settings.NOTIFICATION_LIMITER_MAX_ACCOUNTS,
+)
+sms_limiter = OutboundLimiter(
+    "sms",
+    settings.SMS_RATE_PER_SECOND,
+    settings.SMS_BURST,
+    settings.NOTIFICATION_QUEUE_MAX_DEPTH,
+    settings.NOTIFICATION_QUEUE_TTL_SECONDS,
+    settings.NOTIFICATION_LIMITER_MAX_ACCOUNTS,
+)
+
+
+def email_account_key(email_settings: Dict[str, Any]) -> str:
+    """Bucket key for an SMTP account (server + login)"""
+    return f"{email_settings.get('smtp_server')}:{email_settings.get('smtp_username')}"
+
+
+def sms_account_key(sms_settings: Dict[str, Any]) -> str:
+    """Bucket key for an SMS provider account"""
+    provider = sms_settings.get('provider') or 'twilio'
+    if provider == 'custom':
+        return f"custom:{sms_settings.get('api_url')}"
+    return f"{provider}:{sms_settings.get('account_sid')}"
+
+
+def get_throttle_metrics() -> Dict[str, Any]:
+    return {
+        "email": email_limiter.metrics(),
+        "sms": sms_limiter.metrics(),
+    }
@@ -1,18 +1,74 @@
 # backend/app/db/database.py
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from ..core.config import get_settings
+from .pool_stats import PoolStats, timed_pool
+from .sqlite_tuning import install_pragmas, is_sqlite_file, writer_queue
+
+# Sync URL scheme -> async driver used by the request path
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def get_async_database_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+def get_pool_options(url: str, poolclass) -> dict:
+    """Pool sizing from settings; in-memory SQLite keeps its single-connection pool"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": timed_pool(poolclass),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
 
 settings = get_settings()
 connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith('sqlite') else {}
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+
+# Sync engine for Alembic, scripts and schema management
+engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, **get_pool_options(settings.DATABASE_URL, QueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine for request handlers and background jobs
+async_database_url = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    async_database_url,
+    connect_args=connect_args,
+    **get_pool_options(async_database_url, AsyncAdaptedQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+if settings.SQLITE_TUNING and is_sqlite_file(settings.DATABASE_URL):
+    install_pragmas(engine)
+    install_pragmas(async_engine.sync_engine)
+    writer_queue.install(async_engine.sync_engine)
+
+pool_stats = {
+    "async": PoolStats(async_engine.sync_engine),
+    "sync": PoolStats(engine),
+}
+
+async def get_db():
+    # The connection is checked out on the first query; the pool times the wait
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,97 @@
+# backend/app/db/pool_stats.py
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds (ms) of the connection wait histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class TimedCheckoutPool:
+    """Pool mixin that times connect(), including any wait for a free connection.
+
+    SQLAlchemy has no event for the start of a checkout, so the pool reports
+    the wait itself to `on_wait`; connections are still taken lazily on first use.
+    """
+    on_wait: Optional[Callable[[float], None]] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        connection = super().connect()
+        if self.on_wait is not None:
+            self.on_wait(time.perf_counter() - started)
+        return connection
+
+
+def timed_pool(poolclass):
+    """A subclass of `poolclass` per engine (it survives Pool.recreate())"""
+    return type(f"Timed{poolclass.__name__}", (TimedCheckoutPool, poolclass), {})
+
+
+class PoolStats:
+    """Connection pool counters fed by SQLAlchemy pool events"""
+
+    def __init__(self, engine: Engine):
+        self.pool = engine.pool
+        self.connects = 0
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.invalidations = 0
+        self.wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        if isinstance(self.pool, TimedCheckoutPool):
+            type(self.pool).on_wait = self.observe_wait
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts += 1
+        self.checked_out += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        # Checkin also fires for connections discarded during checkout
+        self.checked_out = max(self.checked_out - 1, 0)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.invalidations += 1
+
+    def observe_wait(self, seconds: float) -> None:
+        """Record how long a caller waited to get a connection"""
+        wait_ms = seconds * 1000
+        self.wait_counts[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sum(self.wait_counts)
+        labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["gt_10000ms"]
+        size = self.pool.size() if hasattr(self.pool, "size") else None
+        return {
+            "pool": type(self.pool).__name__,
+            "size": size,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "overflow": max(self.pool.overflow(), 0) if hasattr(self.pool, "overflow") else 0,
+            "idle": self.pool.checkedin() if hasattr(self.pool, "checkedin") else None,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "invalidations": self.invalidations,
+            "wait_ms": {
+                "count": waits,
+                "avg": round(self.wait_total_ms / waits, 3) if waits else 0.0,
+                "max": round(self.wait_max_ms, 3),
+                "histogram": dict(zip(labels, self.wait_counts))
+            }
+        }
+
@@ -0,0 +1,34 @@
+# backend/app/db/queries.py
+"""Consolidated lookups for paths that need a host together with their profile and settings.
+
+Relationships can't lazy-load on an async session, so everything a handler
+touches is loaded up front with joinedload: one round trip instead of one
+query per row.
+"""
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from ..models.event_type import EventType
+from ..models.user import User
+
+
+async def load_host_context(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Host user with .profile and .settings loaded (either may be None)"""
+    return await db.scalar(
+        select(User)
+        .options(joinedload(User.profile), joinedload(User.settings))
+        .where(User.id == user_id)
+        .limit(1)
+    )
+
+
+async def load_event_type_with_host(db: AsyncSession, event_type_id: int) -> Optional[EventType]:
+    """Event type with .user, .user.profile and .user.settings loaded"""
+    host = joinedload(EventType.user)
+    return await db.scalar(
+        select(EventType)
+        .options(host.joinedload(User.profile), host.joinedload(User.settings))
+        .where(EventType.id == event_type_id)
+        .limit(1)
+    )
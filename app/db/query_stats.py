@@ -0,0 +1,162 @@
+# backend/app/db/query_stats.py
+"""Per-request SQL counts and timings, reported as Server-Timing and per route.
+
+Server-Timing goes only to internal requests (a valid X-Internal-Token)
+unless QUERY_STATS_SERVER_TIMING is on, so public clients can't time
+queries. Route totals are keyed by method and route template; methods
+outside HTTP_METHODS share one key, so clients can't grow the table.
+
+Cursor events on every engine add to the current request's tally (a
+ContextVar set by QueryStatsMiddleware; statements outside a request are
+ignored). Compiled statements carry placeholders rather than values, so a
+statement text seen QUERY_STATS_REPEAT_THRESHOLD or more times within one
+request is a loop issuing the same query: a likely N+1.
+"""
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from ..core.auth import is_internal_token
+from ..core.config import get_settings
+
+settings = get_settings()
+
+# Repeated statements kept per route as examples
+MAX_REPEAT_EXAMPLES = 5
+
+HTTP_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+
+class RequestQueries:
+    """SQL issued while handling one request"""
+    __slots__ = ("count", "db_seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.statements: Dict[str, int] = {}
+
+    def repeated(self) -> Dict[str, int]:
+        threshold = settings.QUERY_STATS_REPEAT_THRESHOLD
+        return {statement: n for statement, n in self.statements.items() if n >= threshold}
+
+
+class RouteStats:
+    """Running totals for one `METHOD /path/template`"""
+    __slots__ = ("requests", "queries", "max_queries", "db_ms", "max_db_ms", "nplusone_requests", "repeats")
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_ms = 0.0
+        self.max_db_ms = 0.0
+        self.nplusone_requests = 0
+        self.repeats: Dict[str, int] = {}
+
+    def observe(self, queries: RequestQueries, repeated: Dict[str, int]) -> None:
+        db_ms = queries.db_seconds * 1000
+        self.requests += 1
+        self.queries += queries.count
+        self.max_queries = max(self.max_queries, queries.count)
+        self.db_ms += db_ms
+        self.max_db_ms = max(self.max_db_ms, db_ms)
+        if repeated:
+            self.nplusone_requests += 1
+            for statement, n in repeated.items():
+                if statement in self.repeats or len(self.repeats) < MAX_REPEAT_EXAMPLES:
+                    self.repeats[statement] = max(self.repeats.get(statement, 0), n)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "avg_queries": round(self.queries / self.requests, 2),
+            "max_queries": self.max_queries,
+            "db_ms": round(self.db_ms, 3),
+            "avg_db_ms": round(self.db_ms / self.requests, 3),
+            "max_db_ms": round(self.max_db_ms, 3),
+            "nplusone_requests": self.nplusone_requests,
+            "repeated_statements": [
+                {"statement": statement, "max_per_request": n} for statement, n in self.repeats.items()
+            ]
+        }
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+route_stats: Dict[str, RouteStats] = {}
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query(conn, cursor, statement, parameters, context, executemany):
+    queries = _current.get()
+    started = conn.info.get("query_stats_started")
+    if queries is None or not started:
+        return
+    queries.db_seconds += time.perf_counter() - started.pop()
+    queries.count += 1
+    queries.statements[statement] = queries.statements.get(statement, 0) + 1
+
+
+def route_key(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+    return f"{method} {path}"
+
+
+def wants_server_timing(scope) -> bool:
+    if settings.QUERY_STATS_SERVER_TIMING:
+        return True
+    for name, value in scope.get("headers", ()):
+        if name == b"x-internal-token":
+            return is_internal_token(value.decode("latin-1"))
+    return False
+
+
+def get_route_stats() -> Dict[str, Any]:
+    """Per-route totals, most total database time first"""
+    ordered = sorted(route_stats.items(), key=lambda item: item[1].db_ms, reverse=True)
+    return {key: stats.snapshot() for key, stats in ordered}
+
+
+class QueryStatsMiddleware:
+    """Count and time each request's SQL; add route totals and, for internal requests, a Server-Timing header"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.QUERY_STATS:
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _current.set(queries)
+        timed = wants_server_timing(scope)
+
+        async def send_with_timing(message):
+            if timed and message["type"] == "http.response.start":
+                timing = f'db;dur={queries.db_seconds * 1000:.1f};desc="{queries.count} queries"'
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            key = route_key(scope)
+            repeated = queries.repeated()
+            stats = route_stats.get(key)
+            if stats is None:
+                stats = route_stats[key] = RouteStats()
+            if repeated and not stats.repeats:
+                print(f"Likely N+1 in {key}: {max(repeated.values())} identical statements in one request")
+            stats.observe(queries, repeated)
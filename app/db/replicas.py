@@ -0,0 +1,158 @@
+# backend/app/db/replicas.py
+"""Read-replica routing for read-only endpoints.
+
+Replicas are tried round-robin; one that fails to hand out a connection is
+ejected for a cooldown period and the request moves on to the next replica,
+then to the primary. After a request commits on the primary, the response
+carries a short-lived cookie that pins that client's reads to the primary so
+it can read its own writes despite replication lag.
+"""
+import itertools
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from ..core.config import get_settings
+from .database import AsyncSessionLocal, async_engine, get_async_database_url, get_pool_options, pool_stats
+from .pool_stats import PoolStats
+
+settings = get_settings()
+
+PIN_COOKIE = "db_primary_until"
+
+
+class Replica:
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.ejected_until = 0.0
+        self.ejections = 0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    def eject(self, cooldown: float) -> None:
+        self.ejected_until = time.monotonic() + cooldown
+        self.ejections += 1
+
+
+class ReplicaSet:
+    """Round-robin over replicas that are not currently ejected"""
+
+    def __init__(self, urls: List[str], eject_seconds: float):
+        self.eject_seconds = eject_seconds
+        self.replicas = []
+        for index, url in enumerate(urls):
+            url = get_async_database_url(url)
+            engine = create_async_engine(
+                url,
+                connect_args={"check_same_thread": False} if url.startswith("sqlite") else {},
+                **get_pool_options(url, AsyncAdaptedQueuePool)
+            )
+            name = f"replica{index}"
+            pool_stats[name] = PoolStats(engine.sync_engine)
+            self.replicas.append(Replica(name, engine))
+        self._next = itertools.count()
+
+    def candidates(self) -> List[Replica]:
+        """Healthy replicas, starting from the next one in rotation"""
+        if not self.replicas:
+            return []
+        start = next(self._next) % len(self.replicas)
+        rotated = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in rotated if replica.healthy]
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "ejections": replica.ejections,
+                "ejected_for_seconds": round(max(replica.ejected_until - now, 0.0), 1)
+            }
+            for replica in self.replicas
+        ]
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+def _replica_urls() -> List[str]:
+    return [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+
+replica_set = ReplicaSet(_replica_urls(), settings.REPLICA_EJECT_SECONDS)
+
+# Per-request flag set when a primary session commits
+_primary_write: ContextVar[Optional[dict]] = ContextVar("primary_write", default=None)
+
+
+@event.listens_for(Session, "after_commit")
+def _flag_primary_write(session: Session) -> None:
+    state = _primary_write.get()
+    if state is not None and session.bind is async_engine.sync_engine:
+        state["wrote"] = True
+
+
+def is_pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints: a healthy replica, else the primary"""
+    if not is_pinned_to_primary(request):
+        for replica in replica_set.candidates():
+            async with AsyncSessionLocal(bind=replica.engine) as db:
+                # Connect up front so an unreachable replica is skipped before the handler runs
+                try:
+                    await db.connection()
+                except (DBAPIError, OSError) as e:
+                    replica.eject(replica_set.eject_seconds)
+                    print(f"Ejecting {replica.name} for {replica_set.eject_seconds}s: {str(e)}")
+                    continue
+                yield db
+                return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+class PrimaryPinMiddleware:
+    """Set the primary-pinning cookie on responses to requests that wrote"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_set.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"wrote": False}
+        token = _primary_write.set(state)
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and state["wrote"]:
+                pin_until = time.time() + settings.PRIMARY_PIN_SECONDS
+                cookie = (
+                    f"{PIN_COOKIE}={pin_until:.3f}; Max-Age={int(settings.PRIMARY_PIN_SECONDS)}; "
+                    f"Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _primary_write.reset(token)
@@ -0,0 +1,75 @@
+# backend/app/db/schema_check.py
+"""Startup check that the database schema is at the Alembic head.
+
+The app never creates or alters tables itself; `alembic upgrade head` does.
+At startup we only read the stamped revision (one small query) and compare
+it with the newest migration script on disk. The revision ids are read
+straight from the version files rather than through Alembic, which would
+import every migration module in every worker.
+"""
+import re
+from pathlib import Path
+from typing import Optional, Set, Tuple
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from ..core.config import get_settings
+from .database import async_engine
+
+settings = get_settings()
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+_REVISION = re.compile(r"^revision\b[^=]*=\s*['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision\b[^=]*=(.*)$", re.MULTILINE)
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def head_revisions() -> Set[str]:
+    """Revisions that no other migration builds on"""
+    revisions, parents = set(), set()
+    for path in (ALEMBIC_DIR / "versions").glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down = _DOWN_REVISION.search(source)
+        if down is not None:
+            parents.update(re.findall(r"['\"](\w+)['\"]", down.group(1)))
+    return revisions - parents
+
+
+async def current_revisions() -> Set[str]:
+    async with async_engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except DBAPIError:
+            # Never migrated (or bootstrapped by create_all): no version table yet
+            return set()
+        return set(result.scalars())
+
+
+async def check_schema(mode: Optional[str] = None) -> Tuple[Set[str], Set[str]]:
+    """Compare the database revision with the migration head.
+
+    mode "warn" prints a message, "strict" raises SchemaOutOfDate and "off"
+    skips the database round trip entirely.
+    """
+    mode = (mode or settings.SCHEMA_CHECK).lower()
+    if mode == "off":
+        return set(), set()
+
+    heads = head_revisions()
+    current = await current_revisions()
+    if current != heads:
+        message = (
+            f"Database schema is at revision {', '.join(sorted(current)) or '<none>'}, "
+            f"expected {', '.join(sorted(heads))}. Run `alembic upgrade head`."
+        )
+        if mode == "strict":
+            raise SchemaOutOfDate(message)
+        print(f"Warning: {message}")
+    return current, heads
@@ -0,0 +1,115 @@
+# backend/app/db/search.py
+"""Full-text search over events.
+
+SQLite keeps an external-content FTS5 table in sync through triggers; MySQL
+uses a FULLTEXT index, which the server maintains itself. Other databases
+fall back to substring matching.
+
+The FTS5 table also indexes user_id (with zero rank weight) so a host's
+search only ranks that host's matches instead of every host's. The same
+index is installed on events_archive, as events_archive_fts.
+"""
+import re
+from typing import Optional, Tuple
+from sqlalchemy import DDL, Float, Integer, and_, bindparam, column, event, false, or_, table, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ColumnElement, Select
+
+SEARCH_COLUMNS = ("title", "description", "attendee_name", "attendee_email")
+
+_columns = ", ".join(SEARCH_COLUMNS)
+_fts_columns = ", ".join(("user_id",) + SEARCH_COLUMNS)
+_new_values = ", ".join(f"new.{name}" for name in ("user_id",) + SEARCH_COLUMNS)
+_old_values = ", ".join(f"old.{name}" for name in ("user_id",) + SEARCH_COLUMNS)
+
+
+def sqlite_ddl(table_name: str) -> tuple:
+    """External-content FTS5 table `<table>_fts` plus the triggers keeping it in sync"""
+    fts = f"{table_name}_fts"
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{_fts_columns}, content='{table_name}', content_rowid='id')",
+        f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25(0.0, 1.0, 1.0, 1.0, 1.0)')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {_fts_columns}) VALUES (new.id, {_new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {_fts_columns}) VALUES ('delete', old.id, {_old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {_fts_columns} ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {_fts_columns}) VALUES ('delete', old.id, {_old_values}); "
+        f"INSERT INTO {fts}(rowid, {_fts_columns}) VALUES (new.id, {_new_values}); END",
+    )
+
+
+def mysql_ddl(table_name: str) -> str:
+    return f"CREATE FULLTEXT INDEX ft_{table_name}_search ON {table_name} ({_columns})"
+
+
+_fts_tables = {}
+
+
+def fts_table(table_name: str):
+    """Not part of Base.metadata: created by the DDL above, never by create_all"""
+    if table_name not in _fts_tables:
+        _fts_tables[table_name] = table(f"{table_name}_fts", column("rowid", Integer), column("rank", Float))
+    return _fts_tables[table_name]
+
+
+class MatchAgainst(ColumnElement):
+    """MySQL natural-language relevance score for a FULLTEXT index"""
+    inherit_cache = True
+    type = Float()
+
+    def __init__(self, *columns, against: str):
+        self.columns = columns
+        self.against = bindparam("fts_query", against)
+
+
+@compiles(MatchAgainst)
+def _compile_match_against(element, compiler, **kw):
+    columns = ", ".join(compiler.process(column, **kw) for column in element.columns)
+    return f"MATCH ({columns}) AGAINST ({compiler.process(element.against, **kw)} IN NATURAL LANGUAGE MODE)"
+
+
+def install_event_search(events_table) -> None:
+    """Create the search index alongside an events-shaped table in create_all/drop_all"""
+    name = events_table.name
+    for statement in sqlite_ddl(name):
+        event.listen(events_table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(events_table, "after_drop", DDL(f"DROP TABLE IF EXISTS {name}_fts").execute_if(dialect="sqlite"))
+    event.listen(events_table, "after_create", DDL(mysql_ddl(name)).execute_if(dialect=("mysql", "mariadb")))
+
+
+def fts5_query(q: str, user_id: int) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match one of the host's events, as a prefix"""
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    words = " ".join(f'"{term}"*' for term in terms)
+    return f'user_id : "{int(user_id)}" AND {{{" ".join(SEARCH_COLUMNS)}}} : ({words})'
+
+
+def apply_event_search(query: Select, events, dialect: str, q: str, user_id: int) -> Tuple[Select, Optional[object]]:
+    """Filter `query` to rows of `events` (Event or EventArchive) matching `q`.
+
+    Returns the query and a rank expression where lower is a better match,
+    or None when the backend has no full-text index and results keep their
+    normal ordering.
+    """
+    if dialect == "sqlite":
+        match = fts5_query(q, user_id)
+        if match is None:
+            # Nothing searchable in `q` (only punctuation): no event can match it
+            return query.where(false()), None
+        fts = fts_table(events.__tablename__)
+        query = query.join(fts, fts.c.rowid == events.id).where(
+            text(f"{fts.name} MATCH :fts_query").bindparams(fts_query=match)
+        )
+        return query, fts.c.rank
+
+    if dialect in ("mysql", "mariadb"):
+        relevance = MatchAgainst(*(getattr(events, name) for name in SEARCH_COLUMNS), against=q)
+        return query.where(relevance > 0), -relevance
+
+    return query.where(or_(*(
+        getattr(events, name).ilike(f"%{q}%") for name in SEARCH_COLUMNS
+    ))), None
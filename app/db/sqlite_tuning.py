@@ -0,0 +1,109 @@
+# backend/app/db/sqlite_tuning.py
+"""Production profile for file-backed SQLite (SQLITE_TUNING=true).
+
+Every connection gets WAL journaling, synchronous=NORMAL, a busy timeout,
+memory-mapped I/O and a larger page cache, so readers no longer block the
+writer or each other.
+
+SQLite still allows one writer at a time. Rather than have concurrent
+requests spin in SQLite's busy handler, async connections queue on an
+in-process FIFO lock when they issue their first write statement and hand
+it on when they go back to the pool. The sqlite3 driver only opens a
+transaction at the first INSERT/UPDATE/DELETE, so pure reads never take the
+lock and run concurrently.
+"""
+import asyncio
+from typing import Dict
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.util import await_only
+from ..core.config import get_settings
+
+settings = get_settings()
+
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+_HOLDS_WRITER = "holds_sqlite_writer"
+
+
+def is_sqlite_file(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def pragmas() -> list:
+    return [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def install_pragmas(engine: Engine) -> None:
+    """Apply the tuning pragmas to every new DBAPI connection of a (sync or async) engine"""
+    statements = pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+class WriterQueue:
+    """FIFO lock serializing write transactions of an async engine's connections"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+        self.acquired = 0
+        self.timeouts = 0
+
+    def _lock(self) -> asyncio.Lock:
+        # asyncio locks belong to one loop; scripts and tests may run several in turn
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            self._locks = {loop: lock for loop, lock in self._locks.items() if not loop.is_closed()}
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+    async def _acquire(self) -> asyncio.Lock:
+        lock = self._lock()
+        try:
+            await asyncio.wait_for(lock.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise OperationalError("acquire sqlite writer", {}, Exception("database is locked"))
+        self.acquired += 1
+        return lock
+
+    def install(self, engine: Engine) -> None:
+        """Hook the sync facade of an AsyncEngine (async_engine.sync_engine)"""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _queue_for_writer(conn, cursor, statement, parameters, context, executemany):
+            info = conn.connection.info
+            if _HOLDS_WRITER in info or not statement.lstrip().upper().startswith(WRITE_PREFIXES):
+                return
+            # Runs inside the async engine's greenlet, so waiting here yields to the loop
+            info[_HOLDS_WRITER] = await_only(self._acquire())
+
+        @event.listens_for(engine, "checkin")
+        def _release_writer(dbapi_connection, connection_record):
+            lock = connection_record.info.pop(_HOLDS_WRITER, None)
+            if lock is not None:
+                lock.release()
+
+    def stats(self) -> dict:
+        return {"acquired": self.acquired, "timeouts": self.timeouts}
+
+
+writer_queue = WriterQueue(settings.SQLITE_BUSY_TIMEOUT_MS / 1000)
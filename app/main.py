@@ -1,21 +1,58 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from .api.endpoints import auth, profile, settings, events, event_types, public
-from .db.database import engine
-from .models import (
+from .api.endpoints import auth, profile, settings, events, event_types, public, internal
+from .db.query_stats import QueryStatsMiddleware
+from .db.replicas import PrimaryPinMiddleware, replica_set
+from .db.schema_check import check_schema
+from .core.compression import CompressionMiddleware
+from .core.config import get_settings
+from .core.responses import ORJSONResponse
+from .core.notification_retry import run_retry_worker
+from .core.digest import run_digest_worker
+from .core.archive import run_archive_worker
+from .core.delivery import close_delivery_clients
+from .core.password_hashing import shutdown_password_hashing
+from .core.refresh_tokens import run_revocation_sync
+from .core.sinks import start_sinks, stop_sinks
+# Imported so every mapper is registered; the schema itself comes from `alembic upgrade head`
+from .models import (  # noqa: F401
     user, profile as profile_model, 
     settings as settings_model, 
-    sms, event, event_type, token
+    sms, event, event_archive, event_type, token, refresh_token, notification, digest
     )
 import os
 
-# Create tables in correct order
-models = [user, profile_model, settings_model, sms, event, event_type, token]
-for model in models:
-    model.Base.metadata.create_all(bind=engine)
+app_settings = get_settings()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await check_schema()
+    for sink in await start_sinks():
+        print(f"Delivery sink listening on {sink}")
+
+    background_tasks = []
+    if app_settings.REVOCATION_SYNC_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_revocation_sync()))
+    if app_settings.RUN_BACKGROUND_JOBS:
+        background_tasks.append(asyncio.create_task(run_retry_worker()))
+        background_tasks.append(asyncio.create_task(run_digest_worker()))
+        if app_settings.ARCHIVE_AFTER_DAYS > 0:
+            background_tasks.append(asyncio.create_task(run_archive_worker()))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await close_delivery_clients()
+    await stop_sinks()
+    await replica_set.dispose()
+    shutdown_password_hashing()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configure CORS
 allowed_origins = [
@@ -25,6 +62,8 @@ allowed_origins = [
     ]
 
 
+app.add_middleware(PrimaryPinMiddleware)
+app.add_middleware(QueryStatsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
@@ -32,6 +71,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
 
 # Mount static files
 uploads_dir = "uploads"
@@ -50,3 +90,4 @@ app.include_router(events.router, prefix="/api", tags=["events"])
 app.include_router(profile.router, prefix="/api/profile", tags=["profile"])
 app.include_router(settings.router, prefix="/api", tags=["settings"])
 app.include_router(event_types.router, prefix="/api", tags=["event_types"])
+app.include_router(internal.router, prefix="/api/internal", tags=["internal"])
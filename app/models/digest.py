@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from ..db.database import Base
+from datetime import datetime
+
+class DigestItem(Base):
+    __tablename__ = "digest_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)  # host
+    kind = Column(String(32), nullable=False)  # booking, cancellation
+    event_title = Column(String(255), nullable=False)
+    event_time = Column(DateTime, nullable=False)
+    attendee_name = Column(String(255), nullable=True)
+    attendee_email = Column(String(255), nullable=True)
+    detail = Column(String(255), nullable=True)  # location or cancellation reason
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Lease held by the worker sending this item, so concurrent workers don't send it twice
+    locked_by = Column(String(32), nullable=True, index=True)
+    locked_until = Column(DateTime, nullable=True)
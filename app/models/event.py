@@ -1,10 +1,23 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from ..db.database import Base
+from ..db.search import install_event_search
 from datetime import datetime
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination of a host's events, newest first
+        Index("ix_events_user_id_start_time_id", "user_id", "start_time", "id"),
+        # Overlap checks (start < slot_end AND end > slot_start) lead with
+        # end_time so the range only covers events that haven't ended yet
+        Index("ix_events_user_id_end_time_start_time", "user_id", "end_time", "start_time"),
+        Index("ix_events_event_type_id_end_time_start_time", "event_type_id", "end_time", "start_time"),
+        # The archiver walks events that ended before its cutoff
+        Index("ix_events_end_time", "end_time"),
+        # Archived events keep their id, so ids must never be handed out twice
+        {"sqlite_autoincrement": True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -24,3 +37,6 @@ class Event(Base):
     # Define relationships
     user = relationship("User", back_populates="events")
     event_type = relationship("EventType", back_populates="events")
+
+
+install_event_search(Event.__table__)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON, Index
+from ..db.database import Base
+from ..db.search import install_event_search
+from datetime import datetime
+
+class EventArchive(Base):
+    """Cold storage for events that ended long ago; rows keep their original event id"""
+    __tablename__ = "events_archive"
+    __table_args__ = (
+        # Keyset pagination of a host's past events, newest first
+        Index("ix_events_archive_user_id_start_time_id", "user_id", "start_time", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    event_type_id = Column(Integer, nullable=True)  # no FK: archived rows never block deleting an event type
+    title = Column(String(255), nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    description = Column(String(255), nullable=True)
+    attendee_name = Column(String(255), nullable=True)
+    attendee_email = Column(String(255), nullable=True)
+    attendee_phone = Column(String(255), nullable=True)
+    location = Column(String(255), nullable=True)
+    answers = Column(JSON, nullable=True)
+    is_confirmed = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+install_event_search(EventArchive.__table__)
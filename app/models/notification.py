@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text
+from ..db.database import Base
+from datetime import datetime
+
+class NotificationRetry(Base):
+    __tablename__ = "notification_retries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(64), nullable=False)  # e.g. booking_confirmation_email
+    payload = Column(JSON, nullable=False)  # keyword arguments for the sender
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, index=True)
+    locked_by = Column(String(32), nullable=True, index=True)
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class NotificationDeadLetter(Base):
+    __tablename__ = "notification_dead_letters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    failed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -6,7 +6,7 @@ class Profile(Base):
     __tablename__ = "profiles"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), unique=True)
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, index=True)
     full_name = Column(String(255))
     scheduling_url = Column(String(255), nullable=True)
     bio = Column(String(255), nullable=True)
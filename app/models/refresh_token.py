@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from ..db.database import Base
+from datetime import datetime
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)  # SHA-256 of the token
+    family_id = Column(String(32), nullable=False, index=True)  # one login session, across rotations
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    rotated_at = Column(DateTime, nullable=True)  # set once exchanged for its successor
+
+class RevokedTokenFamily(Base):
+    """Logged-out or compromised sessions, kept while their access tokens could still be valid"""
+    __tablename__ = "revoked_token_families"
+
+    family_id = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -6,8 +6,10 @@ class Settings(Base):
     __tablename__ = "settings"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), unique=True)
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, index=True)
     working_hours = Column(JSON)
+    # Bumped whenever working_hours changes; keys the compiled schedule cache
+    schedule_version = Column(Integer, nullable=False, default=1, server_default="1")
     notification_settings = Column(JSON)
     email_settings = Column(JSON)
     sms_settings = Column(JSON)
@@ -7,7 +7,7 @@ class SMSSubscription(Base):
     __tablename__ = "sms_subscriptions"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     provider = Column(String(255))  # 'twilio', 'google', 'custom'
     account_sid = Column(String(255), nullable=True)
     auth_token = Column(String(255), nullable=True)
@@ -6,7 +6,9 @@ class Token(Base):
     __tablename__ = "tokens"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    token = Column(String(255), unique=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    # Only the SHA-256 digest is stored; the prefix identifies the token in listings and lookups
+    prefix = Column(String(16), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False)
 
-    user = relationship("User", back_populates="tokens")
\ No newline at end of file
+    user = relationship("User", back_populates="tokens")
@@ -1,3 +1,4 @@
+from typing import Literal, Optional
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
 
@@ -10,4 +11,6 @@ class EmailSettings(BaseModel):
     smtp_username: str
     smtp_password: str
     from_email: EmailStr
-    from_name: str
\ No newline at end of file
+    from_name: str
+    # Defaults to "ssl" on port 465 and "starttls" elsewhere
+    smtp_security: Optional[Literal["ssl", "starttls", "none"]] = None
\ No newline at end of file
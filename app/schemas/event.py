@@ -1,5 +1,5 @@
 # schemas/event.py
-from pydantic import BaseModel, EmailStr, field_validator, Field
+from pydantic import BaseModel, EmailStr, field_validator, model_validator, Field
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
@@ -36,9 +36,9 @@ class EventResponse(EventBase):
 
 class EventList(BaseModel):
     items: List[EventResponse]
-    total: int
-    page: int
-    pages: int
+    next_cursor: Optional[str] = None
+    limit: int
+    total: Optional[int] = None
 
     @field_validator('items')
     def ensure_created_at(cls, v):
@@ -51,4 +51,31 @@ class EventList(BaseModel):
         from_attributes = True
         
 class EventUpdate(EventBase):
-    pass
\ No newline at end of file
+    pass
+
+class BulkCancelRequest(BaseModel):
+    """Cancel the listed events, or every event starting in [start, end)"""
+    reason: str
+    event_ids: Optional[List[int]] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    @model_validator(mode='after')
+    def check_selection(self):
+        by_ids = self.event_ids is not None
+        by_range = self.start is not None or self.end is not None
+        if by_ids == by_range:
+            raise ValueError("Provide either event_ids or a start/end range")
+        if by_range and (self.start is None or self.end is None or self.start >= self.end):
+            raise ValueError("A range needs both start and end, with start before end")
+        return self
+
+class BulkCancelItem(BaseModel):
+    id: int
+    status: str  # cancelled, not_found
+    email_sent: bool = False
+    sms_sent: bool = False
+
+class BulkCancelResult(BaseModel):
+    cancelled: int
+    results: List[BulkCancelItem]
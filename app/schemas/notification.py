@@ -0,0 +1,29 @@
+from pydantic import BaseModel, field_validator
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+SECRET_KEYS = {'smtp_password', 'auth_token', 'api_key'}
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: "***" if key in SECRET_KEYS and item else _redact(item)
+            for key, item in value.items()
+        }
+    return value
+
+class DeadLetter(BaseModel):
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    failed_at: datetime
+
+    @field_validator('payload')
+    def redact_secrets(cls, v):
+        return _redact(v)
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Dict, Any
 
 class Settings(BaseModel):
@@ -13,4 +13,12 @@ class Settings(BaseModel):
         from_attributes = True
 
 class SettingsCreate(Settings):
-    pass
\ No newline at end of file
+    pass
+
+class SettingsUpdate(Settings):
+    @field_validator('notification_settings')
+    def check_digest_hour(cls, v):
+        email = v.get('email') or {}
+        if 'digestHour' in email and (type(email['digestHour']) is not int or not 0 <= email['digestHour'] <= 23):
+            raise ValueError("digestHour must be a whole hour from 0 to 23")
+        return v
@@ -3,7 +3,11 @@ from pydantic import BaseModel
 class Token(BaseModel):
     id: int
     user_id: int
-    token: str
+    prefix: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class NewToken(Token):
+    # The plaintext token, shown once when it is generated
+    token: str
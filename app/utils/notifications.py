@@ -1,223 +1,232 @@
 # utils/notifications.py
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
-from twilio.rest import Client
+import asyncio
 from datetime import datetime
-from typing import Dict, Any
-
-async def send_cancellation_email(to_email: str, event_title: str, event_time: datetime, reason: str, email_settings: Dict[str, Any]):
-    config = {
-        'MAIL_SERVER': email_settings['smtp_server'],
-        'MAIL_PORT': email_settings['smtp_port'],
-        'MAIL_USERNAME': email_settings['smtp_username'],
-        'MAIL_PASSWORD': email_settings['smtp_password'],
-        'MAIL_FROM': email_settings['from_email'],
-        'MAIL_FROM_NAME': email_settings['from_name']
-    }
-    if not config:
-        print("Email configuration is invalid or missing")
-        return False
-
-    try:
-        conf = ConnectionConfig(
-            MAIL_SERVER=config['MAIL_SERVER'],
-            MAIL_PORT=config['MAIL_PORT'],
-            MAIL_USERNAME=config['MAIL_USERNAME'],
-            MAIL_PASSWORD=config['MAIL_PASSWORD'],
-            MAIL_FROM=config['MAIL_FROM'],
-            MAIL_FROM_NAME=config['MAIL_FROM_NAME'],
-            MAIL_STARTTLS=True,
-            MAIL_SSL_TLS=False,
-            USE_CREDENTIALS=True,
-            VALIDATE_CERTS=True
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import select
+from ..core.throttling import email_limiter, sms_limiter, email_account_key, sms_account_key
+from ..core.notification_retry import retryable
+from ..core.email.pool import build_message
+from ..core.config import get_settings
+from ..core.delivery import PermanentNotificationError, deliver_email, deliver_sms
+from ..db.database import AsyncSessionLocal
+from ..models.settings import Settings as SettingsModel
+
+settings = get_settings()
+
+# Senders take the host's user_id rather than their email/SMS settings: their
+# arguments are persisted when a send fails, and credentials must not be.
+
+async def _email_settings(user_id: int) -> Dict[str, Any]:
+    """The host's current SMTP settings, read when the send runs"""
+    async with AsyncSessionLocal() as db:
+        email_settings = await db.scalar(
+            select(SettingsModel.email_settings).where(SettingsModel.user_id == user_id).limit(1)
         )
-        fastmail = FastMail(conf)
-        message = MessageSchema(
-            subject=f"Event Cancelled: {event_title}",
-            recipients=[to_email],
-            body=f"""
-            Your event has been cancelled.
-            
-            Event: {event_title}
-            Time: {event_time.strftime('%B %d, %Y at %I:%M %p')}
-            Reason: {reason}
-            
-            We apologize for any inconvenience.
-            """,
-            subtype="plain"
+    if not email_settings or not email_settings.get('smtp_server') or not email_settings.get('from_email'):
+        raise PermanentNotificationError("Email configuration is invalid or missing")
+    return email_settings
+
+async def _sms_settings(user_id: int) -> Dict[str, Any]:
+    async with AsyncSessionLocal() as db:
+        sms_settings = await db.scalar(
+            select(SettingsModel.sms_settings).where(SettingsModel.user_id == user_id).limit(1)
         )
-        
-        await fastmail.send_message(message)
-        return True
-    except Exception as e:
-        print(f"Failed to send cancellation email: {str(e)}")
-        return False
-
+    if not sms_settings:
+        raise PermanentNotificationError("SMS configuration is missing")
+    return sms_settings
+
+async def _send_email(user_id: int, to_email: Optional[str], subject: str, body: str) -> bool:
+    if not to_email:
+        raise PermanentNotificationError("No recipient email address")
+    email_settings = await _email_settings(user_id)
+    await email_limiter.acquire(email_account_key(email_settings))
+    await deliver_email(email_settings, build_message(email_settings, to_email, subject, body))
+    return True
+
+async def _send_sms(user_id: int, to_phone: Optional[str], body: str) -> bool:
+    if not to_phone:
+        raise PermanentNotificationError("No recipient phone number")
+    sms_settings = await _sms_settings(user_id)
+    await sms_limiter.acquire(sms_account_key(sms_settings))
+    await deliver_sms(sms_settings, to_phone, body)
+    return True
+
+@retryable("cancellation_email")
+async def send_cancellation_email(user_id: int, to_email: str, event_title: str, event_time: datetime, reason: str):
+    return await _send_email(
+        user_id,
+        to_email,
+        subject=f"Event Cancelled: {event_title}",
+        body=f"""
+        Your event has been cancelled.
+
+        Event: {event_title}
+        Time: {event_time.strftime('%B %d, %Y at %I:%M %p')}
+        Reason: {reason}
+
+        We apologize for any inconvenience.
+        """
+    )
+
+@retryable("cancellation_sms")
 async def send_cancellation_sms(
+    user_id: int,
     to_phone: str,
     event_title: str,
     event_time: datetime,
-    reason: str,
-    sms_settings: Dict
+    reason: str
 ):
     """Send cancellation SMS using user's SMS settings"""
-    try:
-        # Create Twilio client with user's settings
-        client = Client(
-            sms_settings.get('account_sid'),
-            sms_settings.get('auth_token')
+    return await _send_sms(
+        user_id,
+        to_phone,
+        f"""
+        Your event '{event_title}' scheduled for {event_time.strftime('%B %d at %I:%M %p')} has been cancelled.
+        Reason: {reason}
+        """
+    )
+
+def cancellation_channels(user_settings, profile, attendee_email: Optional[str]) -> Dict[str, bool]:
+    """Which cancellation notices apply (keys match the API response)"""
+    if user_settings is None or profile is None:
+        return {'email_sent': False, 'sms_sent': False}
+    notification_settings = user_settings.notification_settings or {}
+    email = notification_settings.get('email', {})
+    return {
+        'email_sent': bool(attendee_email and email.get('enabled') and email.get('canceledBooking')),
+        'sms_sent': bool(
+            profile.phone and
+            notification_settings.get('sms', {}).get('enabled') and
+            (user_settings.sms_settings or {}).get('provider') == 'twilio'
         )
-
-        message = client.messages.create(
-            body=f"""
-            Your event '{event_title}' scheduled for {event_time.strftime('%B %d at %I:%M %p')} has been cancelled.
-            Reason: {reason}
-            """,
-            from_=sms_settings.get('from_number'),
-            to=to_phone
-        )
-        
-        return True
-    except Exception as e:
-        print(f"Failed to send cancellation SMS: {str(e)}")
-        return False
+    }
 
 async def send_notifications(
-    event,
+    user_id: int,
+    event_title: str,
+    event_time: datetime,
     reason: str,
     user_settings,
     profile,
-    attendee_email: str,
-    attendee_phone: str = None
-):
-    """Centralized notification sending function"""
-    notification_results = {
-        'email_sent': False,
-        'sms_sent': False
-    }
+    attendee_email: Optional[str]
+) -> Dict[str, bool]:
+    """Send the cancellation notices the host has turned on.
+
+    Sends wait on the per-account throttle, so request handlers schedule
+    this as a background task instead of awaiting it.
+    """
+    notification_results = cancellation_channels(user_settings, profile, attendee_email)
 
-    # Check if email notifications are enabled
-    if (user_settings.notification_settings.get('email', {}).get('enabled') and 
-        user_settings.notification_settings.get('email', {}).get('canceledBooking')):
-        
+    if notification_results['email_sent']:
         notification_results['email_sent'] = await send_cancellation_email(
+            user_id=user_id,
             to_email=attendee_email,
-            event_title=event.title,
-            event_time=event.start_time,
-            reason=reason,
-            email_settings=user_settings.email_settings
+            event_title=event_title,
+            event_time=event_time,
+            reason=reason
         )
 
-    # Check if SMS notifications are enabled and phone number is available
-    if (profile.phone and 
-        user_settings.notification_settings.get('sms', {}).get('enabled') and
-        user_settings.sms_settings.get('provider') == 'twilio'):
-        
+    if notification_results['sms_sent']:
         notification_results['sms_sent'] = await send_cancellation_sms(
+            user_id=user_id,
             to_phone=profile.phone,
-            event_title=event.title,
-            event_time=event.start_time,
-            reason=reason,
-            sms_settings=user_settings.sms_settings
+            event_title=event_title,
+            event_time=event_time,
+            reason=reason
         )
 
     return notification_results
 
+async def send_bulk_notifications(
+    user_id: int,
+    events: List[Tuple[str, datetime, Optional[str]]],
+    reason: str,
+    user_settings,
+    profile
+) -> None:
+    """Cancellation notices for many (title, start_time, attendee_email) events.
+
+    At most BULK_NOTIFY_CONCURRENCY are in flight, so the sends reuse the
+    pooled SMTP sessions and never pile up in the throttle's queue.
+    """
+    semaphore = asyncio.Semaphore(settings.BULK_NOTIFY_CONCURRENCY)
+
+    async def notify(event_title: str, event_time: datetime, attendee_email: Optional[str]) -> None:
+        async with semaphore:
+            await send_notifications(
+                user_id=user_id,
+                event_title=event_title,
+                event_time=event_time,
+                reason=reason,
+                user_settings=user_settings,
+                profile=profile,
+                attendee_email=attendee_email
+            )
+
+    await asyncio.gather(*(notify(*event) for event in events))
+
+@retryable("booking_confirmation_email")
 async def send_booking_confirmation_email(
+    user_id: int,
     to_email: str,
     event_title: str,
     event_time: datetime,
     attendee_name: str,
     host_name: str,
-    location: str,
-    email_settings: Dict[str, Any]
+    location: str
 ) -> bool:
     """Send booking confirmation email to attendee"""
-    config={
-        'MAIL_SERVER': email_settings['smtp_server'],
-        'MAIL_PORT': email_settings['smtp_port'],
-        'MAIL_USERNAME': email_settings['smtp_username'],
-        'MAIL_PASSWORD': email_settings['smtp_password'],
-        'MAIL_FROM': email_settings['from_email'],
-        'MAIL_FROM_NAME': email_settings['from_name']
-    }
-    if not config:
-        print("Email configuration is invalid or missing")
-        return False
-
-    try:
-        conf = ConnectionConfig(
-            MAIL_SERVER=config['MAIL_SERVER'],
-            MAIL_PORT=config['MAIL_PORT'],
-            MAIL_USERNAME=config['MAIL_USERNAME'],
-            MAIL_PASSWORD=config['MAIL_PASSWORD'],
-            MAIL_FROM=config['MAIL_FROM'],
-            MAIL_FROM_NAME=config['MAIL_FROM_NAME'],
-            MAIL_STARTTLS=True,
-            MAIL_SSL_TLS=False,
-            USE_CREDENTIALS=True,
-            VALIDATE_CERTS=True
-        )
-        fastmail = FastMail(conf)
-        message = MessageSchema(
-            subject=f"Booking Confirmation: {event_title}",
-            recipients=[to_email],
-            body=f"""
-            Dear {attendee_name},
-
-            Your booking has been confirmed!
-
-            Event: {event_title}
-            Time: {event_time.strftime('%B %d, %Y at %I:%M %p')}
-            Location: {location}
-            Host: {host_name}
-
-            Thank you for booking with us.
-            """,
-            subtype="plain"
-        )
-        
-        await fastmail.send_message(message)
-        return True
-    except Exception as e:
-        print(f"Failed to send booking confirmation email: {str(e)}")
-        return False
+    return await _send_email(
+        user_id,
+        to_email,
+        subject=f"Booking Confirmation: {event_title}",
+        body=f"""
+        Dear {attendee_name},
+
+        Your booking has been confirmed!
+
+        Event: {event_title}
+        Time: {event_time.strftime('%B %d, %Y at %I:%M %p')}
+        Location: {location}
+        Host: {host_name}
 
+        Thank you for booking with us.
+        """
+    )
+
+@retryable("booking_confirmation_sms")
 async def send_booking_confirmation_sms(
+    user_id: int,
     to_phone: str,
     event_title: str,
-    event_time: datetime,
-    sms_settings: Dict[str, Any]
+    event_time: datetime
 ) -> bool:
     """Send booking confirmation SMS to attendee"""
-    if not all([
-        sms_settings.get('account_sid'),
-        sms_settings.get('auth_token'),
-        sms_settings.get('from_number')
-    ]):
-        print("SMS configuration is invalid or missing")
-        return False
-
-    try:
-        client = Client(
-            sms_settings['account_sid'],
-            sms_settings['auth_token']
-        )
-        
-        message = client.messages.create(
-            body=f"""
-            Your booking for {event_title} on {event_time.strftime('%B %d at %I:%M %p')} is confirmed.
-            """,
-            from_=sms_settings['from_number'],
-            to=to_phone
-        )
-        return True
-    except Exception as e:
-        print(f"Failed to send booking confirmation SMS: {str(e)}")
-        return False
+    return await _send_sms(
+        user_id,
+        to_phone,
+        f"""
+        Your booking for {event_title} on {event_time.strftime('%B %d at %I:%M %p')} is confirmed.
+        """
+    )
+
+@retryable("digest_email")
+async def send_digest_email(
+    user_id: int,
+    to_email: str,
+    subject: str,
+    body: str
+) -> bool:
+    """Send a host agenda digest (pooled SMTP sessions are reused across a batch)"""
+    return await _send_email(user_id, to_email, subject, body)
 
 __all__ = [
+    'cancellation_channels',
     'send_booking_confirmation_email',
     'send_booking_confirmation_sms',
+    'send_bulk_notifications',
     'send_cancellation_email',
-    'send_cancellation_sms'
-]
\ No newline at end of file
+    'send_cancellation_sms',
+    'send_digest_email',
+    'send_notifications'
+]
@@ -0,0 +1,136 @@
+"""Measure per-worker cold start: create_all at import vs. the Alembic head check.
+
+Builds a fully migrated SQLite database, then starts W worker processes at
+once, R rounds each, the way a process manager starts a fresh deployment.
+Every worker imports app.main and then runs one of the startup schema steps:
+
+  create_all   what app.main used to do: one Base.metadata.create_all per
+               model module (each reflects every table before deciding
+               there is nothing to create)
+  head_check   what startup does now: read alembic_version and compare it
+               with the newest migration script
+
+Local SQLite answers in microseconds, so --latency-ms adds a fixed delay to
+every statement to stand in for the round trip to a database server.
+
+    python -m benchmarks.cold_start --workers 4 --rounds 5 --latency-ms 2
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ("create_all", "head_check")
+
+
+def configure_environment(db_path: str) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["RUN_BACKGROUND_JOBS"] = "false"
+    os.environ["SCHEMA_CHECK"] = "warn"
+
+
+def migrate() -> None:
+    from alembic import command
+    from alembic.config import Config
+    from app.db.schema_check import ALEMBIC_DIR
+
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
+    command.upgrade(config, "head")
+
+
+def add_latency(latency_ms: float) -> dict:
+    from sqlalchemy import event
+    from app.db.database import async_engine, engine
+
+    counts = {"statements": 0}
+
+    def round_trip(conn, cursor, statement, parameters, context, executemany):
+        counts["statements"] += 1
+        time.sleep(latency_ms / 1000)
+
+    event.listen(engine, "before_cursor_execute", round_trip)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", round_trip)
+    return counts
+
+
+def worker(mode: str, latency_ms: float) -> None:
+    """Runs in the child process; prints its timings as JSON"""
+    started = time.perf_counter()
+    import app.main as main
+    imported = time.perf_counter()
+    counts = add_latency(latency_ms)
+
+    if mode == "create_all":
+        from app.db.database import engine
+        models = [main.user, main.profile_model, main.settings_model, main.sms, main.event,
+                  main.event_type, main.token, main.notification, main.digest]
+        for model in models:
+            model.Base.metadata.create_all(bind=engine)
+    else:
+        import asyncio
+        from app.db.schema_check import check_schema
+        asyncio.run(check_schema())
+    finished = time.perf_counter()
+
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "schema_ms": (finished - imported) * 1000,
+        "statements": counts["statements"]
+    }))
+
+
+def start_workers(mode: str, workers: int, latency_ms: float) -> list:
+    """Start `workers` interpreters at the same time and collect their timings"""
+    command = [sys.executable, "-m", "benchmarks.cold_start", "--worker", mode, "--latency-ms", str(latency_ms)]
+    started = time.perf_counter()
+    processes = [subprocess.Popen(command, stdout=subprocess.PIPE, text=True) for _ in range(workers)]
+    results = []
+    for process in processes:
+        out, _ = process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"{mode} worker exited with {process.returncode}")
+        result = json.loads(out.strip().splitlines()[-1])
+        result["process_ms"] = (time.perf_counter() - started) * 1000
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.latency_ms)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(os.path.join(tmp, "bench.db"))
+        migrate()
+
+        print(f"{args.workers} workers x {args.rounds} rounds, {args.latency_ms}ms per statement, medians per worker")
+        print(f"{'startup':<12} {'import ms':>10} {'schema ms':>10} {'statements':>11} {'process ms':>11}")
+        for mode in MODES:
+            results = []
+            for _ in range(args.rounds):
+                results.extend(start_workers(mode, args.workers, args.latency_ms))
+            print(
+                f"{mode:<12} "
+                f"{statistics.median(r['import_ms'] for r in results):>10.1f} "
+                f"{statistics.median(r['schema_ms'] for r in results):>10.1f} "
+                f"{statistics.median(r['statements'] for r in results):>11.0f} "
+                f"{statistics.median(r['process_ms'] for r in results):>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Compare request throughput with a sync vs. async database session.
+
+Two handlers run the same lookup (the event type plus the host's settings,
+as the public availability endpoint does):
+
+  sync   - `async def` handler using the old blocking SessionLocal, which
+           stalls the event loop for the whole query
+  async  - handler using AsyncSessionLocal, which yields while SQLite works
+
+SQLite answers in microseconds, so each statement also calls a `bench_sleep`
+SQL function registered on every connection to stand in for network and disk
+latency on a real database server.
+
+    python -m benchmarks.db_concurrency --requests 300 --latency-ms 5
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+LEVELS = (1, 10, 100)
+
+
+def configure_environment(db_path: str) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["RUN_BACKGROUND_JOBS"] = "false"
+    os.environ["SCHEMA_CHECK"] = "off"
+
+
+def register_latency(latency_ms: float) -> None:
+    from sqlalchemy import event
+    from app.db.database import engine, async_engine
+
+    def bench_sleep(_):
+        time.sleep(latency_ms / 1000)
+        return 1
+
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("bench_sleep", 1, bench_sleep)
+
+    event.listen(engine, "connect", on_connect)
+    event.listen(async_engine.sync_engine, "connect", on_connect)
+
+
+def seed() -> int:
+    import app.main  # noqa: F401  (registers every model)
+    from app.db.database import Base, SessionLocal, engine
+    from app.models.user import User
+    from app.models.settings import Settings
+    from app.models.event_type import EventType
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        host = User(email="bench-host@example.com", hashed_password="x", is_active=True)
+        db.add(host)
+        db.flush()
+        db.add(Settings(user_id=host.id, working_hours={}, notification_settings={}))
+        event_type = EventType(user_id=host.id, name="Bench Call", slug="bench-call", duration=15)
+        db.add(event_type)
+        db.commit()
+        return event_type.id
+    finally:
+        db.close()
+
+
+def build_app():
+    from fastapi import FastAPI, HTTPException
+    from sqlalchemy import func, select
+    from app.db.database import AsyncSessionLocal, SessionLocal
+    from app.models.event_type import EventType
+    from app.models.settings import Settings
+
+    bench = FastAPI()
+
+    def lookup(event_type_id: int):
+        return select(EventType, Settings).join(
+            Settings, Settings.user_id == EventType.user_id
+        ).where(EventType.id == event_type_id, func.bench_sleep(0) == 1)
+
+    @bench.get("/sync/{event_type_id}")
+    async def sync_handler(event_type_id: int):
+        db = SessionLocal()
+        try:
+            row = db.execute(lookup(event_type_id)).first()
+        finally:
+            db.close()
+        if not row:
+            raise HTTPException(status_code=404)
+        return {"id": row[0].id}
+
+    @bench.get("/async/{event_type_id}")
+    async def async_handler(event_type_id: int):
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(lookup(event_type_id))).first()
+        if not row:
+            raise HTTPException(status_code=404)
+        return {"id": row[0].id}
+
+    return bench
+
+
+async def measure(client, path: str, requests: int, in_flight: int) -> float:
+    semaphore = asyncio.Semaphore(in_flight)
+
+    async def one() -> None:
+        async with semaphore:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def run(requests: int) -> None:
+    import httpx
+    from app.db.database import async_engine, engine
+
+    event_type_id = seed()
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'in-flight':>10} {'sync req/s':>12} {'async req/s':>12} {'speedup':>8}")
+        for in_flight in LEVELS:
+            sync_rps = await measure(client, f"/sync/{event_type_id}", requests, in_flight)
+            async_rps = await measure(client, f"/async/{event_type_id}", requests, in_flight)
+            print(f"{in_flight:>10} {sync_rps:>12.1f} {async_rps:>12.1f} {async_rps / sync_rps:>7.1f}x")
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="requests per level and handler")
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="simulated database round trip per statement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(os.path.join(tmp, "bench.db"))
+        register_latency(args.latency_ms)
+        asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
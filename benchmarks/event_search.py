@@ -0,0 +1,137 @@
+"""Compare event search with leading-wildcard LIKE vs. the full-text index.
+
+Seeds a SQLite database with N events spread across a few hosts (the FTS5
+triggers index them on insert), then times the search a host's /events?q=
+request issues: the old `ILIKE '%q%'` filter ordered by start time, and the
+ranked full-text query the endpoint uses now.
+
+    python -m benchmarks.event_search --events 1000000 --hosts 10
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+FIRST_NAMES = ["Alice", "Bilal", "Chen", "Dana", "Emeka", "Farah", "Gustav", "Hana", "Ivan", "Julia",
+               "Kwame", "Lena", "Mateo", "Nadia", "Omar", "Priya", "Quinn", "Rosa", "Sanjay", "Tara"]
+LAST_NAMES = ["Anderson", "Bose", "Castillo", "Dubois", "Eriksen", "Fischer", "Gupta", "Haddad",
+              "Ito", "Jensen", "Kowalski", "Lindqvist", "Moreau", "Nakamura", "Okafor", "Petrov"]
+TITLES = ["Intro call", "Tax review", "Quarterly planning", "Onboarding session", "Follow-up",
+          "Strategy workshop", "Portfolio check-in", "Contract signing", "Demo", "Support call"]
+SEARCHES = ["review", "onboarding session", "Nakamura", "priya", "zephyrine"]
+
+
+def configure_environment(db_path: str) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["RUN_BACKGROUND_JOBS"] = "false"
+    os.environ["SCHEMA_CHECK"] = "off"
+
+
+def seed(events: int, hosts: int, batch_size: int = 50000) -> None:
+    import app.main  # noqa: F401  (registers every model)
+    from app.db.database import Base, engine
+
+    Base.metadata.create_all(bind=engine)  # includes events_fts and its triggers
+
+    rng = random.Random(42)
+    # Mostly common words, plus one rare word so the benchmark covers a selective search
+    vocabulary = [f"topic{i}" for i in range(5000)] + ["zephyrine"]
+    weights = [1.0] * 5000 + [0.3]
+    start = datetime(2015, 1, 1, 9)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO users (email, hashed_password, is_active) VALUES (?, 'x', 1)",
+            [(f"host{i}@example.com",) for i in range(hosts)]
+        )
+
+    inserted = 0
+    while inserted < events:
+        rows = []
+        for i in range(inserted, min(inserted + batch_size, events)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            start_time = start + timedelta(minutes=30 * (i // hosts))
+            rows.append((
+                i % hosts + 1,
+                rng.choice(TITLES),
+                start_time,
+                start_time + timedelta(minutes=30),
+                " ".join(rng.choices(vocabulary, weights, k=8)),
+                f"{first} {last}",
+                f"{first.lower()}.{last.lower()}{i}@example.com",
+                start_time,
+            ))
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO events (user_id, title, start_time, end_time, description, "
+                "attendee_name, attendee_email, created_at, is_confirmed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)",
+                rows
+            )
+        inserted += len(rows)
+        print(f"\rseeded {inserted}/{events} events", end="", flush=True)
+    print()
+
+
+def legacy_query(user_id: int, q: str):
+    from sqlalchemy import or_, select
+    from app.models.event import Event
+
+    return select(Event).where(
+        Event.user_id == user_id,
+        or_(Event.title.ilike(f"%{q}%"), Event.description.ilike(f"%{q}%"))
+    ).order_by(Event.start_time.desc(), Event.id.desc()).limit(10)
+
+
+def full_text_query(user_id: int, q: str):
+    from sqlalchemy import select
+    from app.db.search import apply_event_search
+    from app.models.event import Event
+
+    query, rank = apply_event_search(
+        select(Event).where(Event.user_id == user_id), Event, "sqlite", q, user_id
+    )
+    return query.order_by(rank, Event.id).limit(10)
+
+
+def time_query(build, user_id: int, q: str, repeat: int):
+    from app.db.database import SessionLocal
+
+    timings = []
+    db = SessionLocal()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            found = len(db.scalars(build(user_id, q)).all())
+            timings.append(time.perf_counter() - started)
+            db.expunge_all()
+    finally:
+        db.close()
+    return statistics.median(timings) * 1000, found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--hosts", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(os.path.join(tmp, "bench.db"))
+        started = time.perf_counter()
+        seed(args.events, args.hosts)
+        print(f"seeding took {time.perf_counter() - started:.1f}s\n")
+
+        print(f"{'query':<22} {'ILIKE ms':>10} {'FTS ms':>10} {'speedup':>8}  hits (ilike/fts)")
+        for q in SEARCHES:
+            legacy_ms, legacy_hits = time_query(legacy_query, 1, q, args.repeat)
+            fts_ms, fts_hits = time_query(full_text_query, 1, q, args.repeat)
+            print(f"{q:<22} {legacy_ms:>10.2f} {fts_ms:>10.2f} {legacy_ms / fts_ms:>7.1f}x  {legacy_hits}/{fts_hits}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Login throughput and event-loop stalls with bcrypt on and off the loop.
+
+Drives POST /api/auth/token in process with C concurrent logins, under
+three ways of running bcrypt:
+
+  inline   what login used to do: hash on the event loop thread
+  thread   PASSWORD_HASH_EXECUTOR=thread
+  process  PASSWORD_HASH_EXECUTOR=process (the default)
+
+While the logins run, a probe sleeps 10ms in a loop and records how late it
+wakes up: the delay every other request on the worker would see.
+
+    python -m benchmarks.login_throughput --logins 64 --concurrency 16 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+MODES = ("inline", "thread", "process")
+CREDENTIALS = {"username": "bench@example.com", "password": "bench-password"}
+# password_hashing._run as shipped; "inline" swaps it out
+ORIGINAL_RUN = None
+
+
+def configure_environment(db_path: str, rounds: int, workers: int) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["RUN_BACKGROUND_JOBS"] = "false"
+    os.environ["SCHEMA_CHECK"] = "off"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["BCRYPT_ROUNDS"] = str(rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(workers)
+    os.environ["PASSWORD_HASH_MAX_PENDING"] = "100000"
+
+
+def seed(rounds: int) -> None:
+    import app.main  # noqa: F401  (registers every model)
+    from app.core.password_hashing import _hash
+    from app.db.database import Base, SessionLocal, engine
+    from app.models.user import User
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.add(User(email=CREDENTIALS["username"], hashed_password=_hash(CREDENTIALS["password"], rounds),
+                    is_active=True))
+        db.commit()
+
+
+def use_mode(mode: str) -> None:
+    from app.core import password_hashing
+
+    password_hashing.shutdown_password_hashing()
+    if mode == "inline":
+        async def run_inline(fn, *args):
+            return fn(*args)
+        password_hashing._run = run_inline
+    else:
+        password_hashing._run = ORIGINAL_RUN
+        password_hashing.settings.PASSWORD_HASH_EXECUTOR = mode
+
+
+async def probe_lag(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - started - 0.01)
+
+
+async def measure(client, logins: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    lags: list = []
+
+    async def one() -> None:
+        async with semaphore:
+            response = await client.post("/api/auth/token", data=CREDENTIALS)
+            response.raise_for_status()
+
+    # Warm up the executor (process start-up is not part of the steady state)
+    await one()
+    probe = asyncio.create_task(probe_lag(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    lags.sort()
+    return {
+        "logins_per_s": logins / elapsed,
+        "lag_p50_ms": statistics.median(lags) * 1000 if lags else 0.0,
+        "lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+    }
+
+
+async def run(logins: int, concurrency: int) -> None:
+    import httpx
+    from app.core.password_hashing import shutdown_password_hashing
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        print(f"{'mode':<8} {'logins/s':>9} {'loop lag p50 ms':>16} {'loop lag max ms':>16}")
+        for mode in MODES:
+            use_mode(mode)
+            result = await measure(client, logins, concurrency)
+            print(f"{mode:<8} {result['logins_per_s']:>9.1f} {result['lag_p50_ms']:>16.1f} {result['lag_max_ms']:>16.1f}")
+    shutdown_password_hashing()
+
+
+def main() -> None:
+    global ORIGINAL_RUN
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--workers", type=int, default=0, help="executor size (0 = one per CPU)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(os.path.join(tmp, "bench.db"), args.rounds, args.workers)
+        from app.core import password_hashing
+        ORIGINAL_RUN = password_hashing._run
+        seed(args.rounds)
+        print(f"{args.logins} logins, {args.concurrency} in flight, bcrypt cost {args.rounds}, {os.cpu_count()} CPUs")
+        asyncio.run(run(args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
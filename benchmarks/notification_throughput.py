@@ -0,0 +1,141 @@
+"""Push N bookings through create_public_booking with notifications enabled.
+
+Mail and SMS go to the in-process sinks, so this measures our side of the
+pipeline (booking insert, throttling, message building, delivery) without
+touching real SMTP or Twilio.
+
+    python -m benchmarks.notification_throughput --bookings 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+
+def configure_environment(db_path: str, throttled: bool) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["MAIL_BACKEND"] = "smtp_sink"
+    os.environ["SMS_BACKEND"] = "http_sink"
+    os.environ["RUN_BACKGROUND_JOBS"] = "false"
+    os.environ["SCHEMA_CHECK"] = "off"
+    if not throttled:
+        for key in ("EMAIL_RATE_PER_SECOND", "SMS_RATE_PER_SECOND"):
+            os.environ[key] = "1000000"
+        for key in ("EMAIL_BURST", "SMS_BURST"):
+            os.environ[key] = "1000000"
+
+
+def seed_host():
+    from app.db.database import Base, SessionLocal, engine
+    from app.models.user import User
+    from app.models.profile import Profile
+    from app.models.settings import Settings
+    from app.models.event_type import EventType
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        host = User(email="bench-host@example.com", hashed_password="x", is_active=True)
+        db.add(host)
+        db.flush()
+        db.add(Profile(user_id=host.id, full_name="Bench Host", phone="+15550000000", time_zone="UTC"))
+        db.add(Settings(
+            user_id=host.id,
+            working_hours={},
+            notification_settings={"email": {"enabled": True}, "sms": {"enabled": True}},
+            email_settings={
+                "smtp_server": "unused", "smtp_port": 587, "smtp_username": "bench",
+                "smtp_password": "bench", "from_email": "bench-host@example.com", "from_name": "Bench"
+            },
+            sms_settings={
+                "provider": "twilio", "account_sid": "ACbench", "auth_token": "bench",
+                "from_number": "+15550000001"
+            }
+        ))
+        event_type = EventType(user_id=host.id, name="Bench Call", slug="bench-call", duration=15)
+        db.add(event_type)
+        db.commit()
+        return event_type.id
+    finally:
+        db.close()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(bookings: int, concurrency: int) -> None:
+    import httpx
+    from app.main import app
+    from app.core.sinks import mail_sink_stats, sms_sink_stats
+
+    event_type_id = seed_host()
+    # Two emails (attendee + host) and two SMS (attendee + host) per booking
+    expected_messages = bookings * 4
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    start_day = date.today() + timedelta(days=1)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def book(i: int) -> None:
+                slot = start_day + timedelta(days=i // 32)
+                minutes = (i % 32) * 15
+                payload = {
+                    "event_type_id": event_type_id,
+                    "date": slot.isoformat(),
+                    "time": f"{8 + minutes // 60:02d}:{minutes % 60:02d}",
+                    "name": f"Attendee {i}",
+                    "email": f"attendee{i}@example.com",
+                    "phone": "+15551234567",
+                    "location": "Phone",
+                }
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.post("/public/bookings", json=payload)
+                    latencies.append(time.perf_counter() - started)
+                    response.raise_for_status()
+
+            wall_start = time.perf_counter()
+            await asyncio.gather(*(book(i) for i in range(bookings)))
+
+            # SMTP sink runs on its own thread; give it a moment to drain
+            deadline = time.perf_counter() + 10
+            while (mail_sink_stats.received + sms_sink_stats.received < expected_messages
+                   and time.perf_counter() < deadline):
+                await asyncio.sleep(0.01)
+            wall = time.perf_counter() - wall_start
+
+    delivered = mail_sink_stats.received + sms_sink_stats.received
+    print(f"bookings:        {bookings} (concurrency {concurrency})")
+    print(f"messages:        {delivered}/{expected_messages} "
+          f"({mail_sink_stats.received} email, {sms_sink_stats.received} sms)")
+    print(f"wall time:       {wall:.2f}s")
+    print(f"messages/sec:    {delivered / wall:.1f}")
+    print(f"bookings/sec:    {bookings / wall:.1f}")
+    print(f"latency p50:     {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"latency p99:     {percentile(latencies, 99) * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--throttled", action="store_true",
+                        help="keep the configured per-account send rate limits")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(os.path.join(tmp, "bench.db"), args.throttled)
+        asyncio.run(run(args.bookings, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Time serializing a large event export two ways.
+
+Seeds one host with N events, then builds the /events response body for all
+of them, the way the endpoint used to and the way it does now:
+
+  pydantic  load ORM objects, build EventList (which re-validates every item
+            through its field validator), let FastAPI validate and dump it
+            against the response_model, then json.dumps
+  rows      select the EventResponse columns as tuples, zip them into dicts
+            and render with orjson
+
+Load and serialize are timed separately; both bodies are checked to decode
+to the same items.
+
+    python -m benchmarks.serialization --events 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def configure_environment(db_path: str) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["RUN_BACKGROUND_JOBS"] = "false"
+    os.environ["SCHEMA_CHECK"] = "off"
+    os.environ["QUERY_STATS"] = "false"
+
+
+def seed(events: int) -> None:
+    import app.main  # noqa: F401  (registers every model)
+    from app.db.database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2020, 1, 1, 9)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO users (email, hashed_password, is_active) VALUES ('bench@example.com', 'x', 1)")
+        conn.exec_driver_sql(
+            "INSERT INTO events (user_id, title, start_time, end_time, description, attendee_name, "
+            "attendee_email, attendee_phone, location, answers, created_at, is_confirmed) "
+            "VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)",
+            [(
+                f"Call {i}",
+                start + timedelta(minutes=30 * i),
+                start + timedelta(minutes=30 * i + 30),
+                "Quarterly review of the portfolio and next steps",
+                f"Attendee {i}",
+                f"attendee{i}@example.com",
+                "+15550100",
+                "https://meet.example.com/room",
+                json.dumps({"agenda": "Taxes", "attendees": 2}),
+                start,
+            ) for i in range(events)]
+        )
+
+
+async def pydantic_body(db) -> tuple:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from sqlalchemy import select
+    from app.models.event import Event
+    from app.schemas.event import EventList
+
+    field = create_model_field("Response_get_scheduled_events", EventList, mode="serialization")
+    started = time.perf_counter()
+    events = (await db.scalars(
+        select(Event).where(Event.user_id == 1).order_by(Event.start_time.desc(), Event.id.desc())
+    )).all()
+    loaded = time.perf_counter()
+    content = await serialize_response(field=field, response_content=EventList(items=events, limit=len(events)))
+    body = JSONResponse(content).body
+    return loaded - started, time.perf_counter() - loaded, body
+
+
+async def rows_body(db) -> tuple:
+    from sqlalchemy import select
+    from app.api.endpoints.events import EVENT_LIST_COLUMNS
+    from app.core.responses import ORJSONResponse, row_dicts
+    from app.models.event import Event
+
+    started = time.perf_counter()
+    rows = (await db.execute(
+        select(*(getattr(Event, name) for name in EVENT_LIST_COLUMNS))
+        .where(Event.user_id == 1).order_by(Event.start_time.desc(), Event.id.desc())
+    )).all()
+    loaded = time.perf_counter()
+    body = ORJSONResponse({
+        "items": row_dicts(EVENT_LIST_COLUMNS, rows), "next_cursor": None, "limit": len(rows), "total": None
+    }).body
+    return loaded - started, time.perf_counter() - loaded, body
+
+
+async def run(repeat: int) -> None:
+    from app.db.database import AsyncSessionLocal
+
+    results = {}
+    for name, build in (("pydantic", pydantic_body), ("rows", rows_body)):
+        load, dump = [], []
+        for _ in range(repeat):
+            async with AsyncSessionLocal() as db:
+                load_s, dump_s, body = await build(db)
+            load.append(load_s)
+            dump.append(dump_s)
+        results[name] = (statistics.median(load) * 1000, statistics.median(dump) * 1000, body)
+
+    legacy_items = json.loads(results["pydantic"][2])["items"]
+    assert json.loads(results["rows"][2])["items"] == legacy_items, "bodies differ"
+
+    print(f"{'path':<10} {'load ms':>9} {'serialize ms':>13} {'total ms':>9} {'bytes':>10}")
+    for name, (load_ms, dump_ms, body) in results.items():
+        print(f"{name:<10} {load_ms:>9.1f} {dump_ms:>13.1f} {load_ms + dump_ms:>9.1f} {len(body):>10}")
+    legacy, fast = results["pydantic"], results["rows"]
+    print(f"\n{len(legacy_items)} events: {(legacy[0] + legacy[1]) / (fast[0] + fast[1]):.1f}x faster end to end, "
+          f"{legacy[1] / fast[1]:.1f}x on serialization alone")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(os.path.join(tmp, "bench.db"))
+        seed(args.events)
+        asyncio.run(run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Mixed read/booking throughput on SQLite: stock settings vs. SQLITE_TUNING.
+
+Each mode runs in its own interpreter (settings are read at import) against
+a fresh database file, driving the real app in process:
+
+  default  rollback journal, sqlite3's 5s busy timeout, every pooled
+           connection racing for the write lock inside SQLite
+  tuned    WAL, synchronous=NORMAL, mmap/cache pragmas and the in-process
+           writer queue from app/db/sqlite_tuning.py
+
+Clients loop over public availability lookups, with every Nth request a
+public booking (one write transaction), until the duration runs out.
+Failed requests (e.g. "database is locked") are counted separately.
+
+    python -m benchmarks.sqlite_mixed_load --clients 32 --seconds 10 --write-every 5
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+MODES = ("default", "tuned")
+WORKING_DAY = {"start": "00:00", "end": "23:45", "enabled": True}
+
+
+def configure_environment(db_path: str, mode: str) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["RUN_BACKGROUND_JOBS"] = "false"
+    os.environ["SCHEMA_CHECK"] = "off"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["SQLITE_TUNING"] = "true" if mode == "tuned" else "false"
+
+
+def seed() -> int:
+    import app.main  # noqa: F401  (registers every model)
+    from app.core.schedule import WEEKDAYS
+    from app.db.database import Base, SessionLocal, engine
+    from app.models.event_type import EventType
+    from app.models.settings import Settings
+    from app.models.user import User
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        host = User(email="bench-host@example.com", hashed_password="x", is_active=True)
+        db.add(host)
+        db.flush()
+        db.add(Settings(
+            user_id=host.id,
+            working_hours={day: dict(WORKING_DAY) for day in WEEKDAYS},
+            notification_settings={}
+        ))
+        event_type = EventType(user_id=host.id, name="Bench Call", slug="bench-call", duration=15)
+        db.add(event_type)
+        db.commit()
+        return event_type.id
+    finally:
+        db.close()
+
+
+def percentile(samples: list, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+async def drive(clients: int, seconds: float, write_every: int) -> dict:
+    import httpx
+    from app.db.database import async_engine, engine
+    from app.main import app
+
+    event_type_id = seed()
+    # Distinct slots so bookings never collide: 15 minute steps across many days
+    slots = (
+        (date.today() + timedelta(days=1 + n // 96), f"{(n % 96) // 4:02d}:{(n % 4) * 15:02d}")
+        for n in itertools.count()
+    )
+    reads, writes, failures = [], [], []
+    deadline = time.perf_counter() + seconds
+
+    async def client_loop(client, number: int) -> None:
+        for request in itertools.count(number):
+            if time.perf_counter() >= deadline:
+                return
+            started = time.perf_counter()
+            if request % write_every == 0:
+                day, at = next(slots)
+                response = await client.post("/public/bookings", json={
+                    "event_type_id": event_type_id, "date": day.isoformat(), "time": at,
+                    "name": "Bench Guest", "email": "guest@example.com", "phone": "+15550000000",
+                    "location": "Phone"
+                })
+                samples = writes
+            else:
+                response = await client.get(
+                    f"/public/availability/{event_type_id}",
+                    params={"date": (date.today() + timedelta(days=1 + request % 7)).isoformat()}
+                )
+                samples = reads
+            if response.status_code == 200:
+                samples.append(time.perf_counter() - started)
+            else:
+                failures.append(response.text[:80])
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, n) for n in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    await async_engine.dispose()
+    engine.dispose()
+    return {
+        "requests_per_s": (len(reads) + len(writes)) / elapsed,
+        "bookings_per_s": len(writes) / elapsed,
+        "read_p50_ms": percentile(reads, 0.5),
+        "read_p95_ms": percentile(reads, 0.95),
+        "write_p50_ms": percentile(writes, 0.5),
+        "write_p95_ms": percentile(writes, 0.95),
+        "failures": len(failures),
+        "failure_sample": statistics.mode(failures) if failures else "",
+    }
+
+
+def run_mode(mode: str, args) -> dict:
+    command = [
+        sys.executable, "-m", "benchmarks.sqlite_mixed_load", "--mode", mode,
+        "--clients", str(args.clients), "--seconds", str(args.seconds), "--write-every", str(args.write_every)
+    ]
+    out = subprocess.run(command, stdout=subprocess.PIPE, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="run time per mode")
+    parser.add_argument("--write-every", type=int, default=5, help="every Nth request is a booking")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        with tempfile.TemporaryDirectory() as tmp:
+            configure_environment(os.path.join(tmp, "bench.db"), args.mode)
+            print(json.dumps(asyncio.run(drive(args.clients, args.seconds, args.write_every))))
+        return
+
+    print(f"{args.clients} clients for {args.seconds:g}s, 1 booking per {args.write_every} requests")
+    print(f"{'mode':<8} {'req/s':>8} {'book/s':>8} {'read p50':>9} {'read p95':>9} "
+          f"{'write p50':>10} {'write p95':>10} {'failed':>7}")
+    for mode in MODES:
+        r = run_mode(mode, args)
+        print(
+            f"{mode:<8} {r['requests_per_s']:>8.1f} {r['bookings_per_s']:>8.1f} "
+            f"{r['read_p50_ms']:>9.1f} {r['read_p95_ms']:>9.1f} "
+            f"{r['write_p50_ms']:>10.1f} {r['write_p95_ms']:>10.1f} {r['failures']:>7}"
+        )
+        if r["failure_sample"]:
+            print(f"         most common failure: {r['failure_sample']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# backend/tests/conftest.py
+import os
+import tempfile
+
+# Point the app at a throwaway database before anything imports the engines
+_tmp_dir = tempfile.mkdtemp(prefix="scheduler-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["ASYNC_DATABASE_URL"] = ""
+os.environ["RUN_BACKGROUND_JOBS"] = "false"
+os.environ["SCHEMA_CHECK"] = "off"
+os.environ["MAIL_BACKEND"] = "file"
+os.environ["MAIL_FILE_SINK_DIR"] = os.path.join(_tmp_dir, "mail")
+# Cheap hashes on a thread pool; test_password_hashing covers the process pool
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["PASSWORD_HASH_EXECUTOR"] = "thread"
+# No background revocation reloads to land inside query budgets
+os.environ["REVOCATION_SYNC_SECONDS"] = "0"
+
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from app.core.auth import clear_auth_cache
+from app.core.rate_limit import limiter
+from app.core.refresh_tokens import revoked_families
+from app.core.public_cache import clear_public_cache
+from app.db.database import Base, async_engine, engine
+
+
+@pytest.fixture
+def client():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # Fresh tables reuse ids, so identities cached by an earlier test are stale
+    clear_auth_cache()
+    limiter.reset()
+    revoked_families.clear()
+    clear_public_cache()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(client):
+    credentials = {"email": "host@example.com", "password": "secret-password"}
+    client.post("/api/auth/signup", json=credentials)
+    response = client.post(
+        "/api/auth/token",
+        data={"username": credentials["email"], "password": credentials["password"]}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def email_host(client, auth_headers):
+    """auth_headers for a host with SMTP settings and cancellation emails turned on"""
+    client.get("/api/profile/me", headers=auth_headers)
+    settings = client.get("/api/settings", headers=auth_headers).json()
+    settings["notification_settings"]["email"].update({"enabled": True, "canceledBooking": True})
+    settings["email_settings"] = {
+        "smtp_server": "unused", "smtp_port": 587, "smtp_username": "host",
+        "smtp_password": "secret", "from_email": "host@example.com", "from_name": "Host"
+    }
+    client.put("/api/settings", json=settings, headers=auth_headers)
+    return auth_headers
+
+
+@pytest.fixture
+def query_budget():
+    """Fail when the statements run inside the block exceed `budget`.
+
+        with query_budget(2):
+            client.get("/api/auth/me", headers=auth_headers)
+    """
+    @contextmanager
+    def budget(limit: int):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(" ".join(statement.split()))
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+        assert len(statements) <= limit, (
+            f"{len(statements)} statements, budget {limit}:\n" + "\n".join(statements)
+        )
+
+    return budget
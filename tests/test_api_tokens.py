@@ -0,0 +1,42 @@
+# backend/tests/test_api_tokens.py
+from sqlalchemy import select
+
+from app.core.api_tokens import clear_api_token_cache, hash_token
+from app.db.database import SessionLocal
+from app.models.token import Token
+
+
+def test_tokens_are_stored_hashed_and_shown_once(client, auth_headers):
+    created = client.post("/api/auth/generate-permanent-token", headers=auth_headers).json()
+    assert created["prefix"] == created["token"][:8]
+
+    with SessionLocal() as db:
+        row = db.scalar(select(Token).where(Token.id == created["id"]))
+    assert row.token_hash == hash_token(created["token"])
+    assert created["token"] not in (row.prefix, row.token_hash)
+
+    listed = client.get("/api/auth/list-tokens", headers=auth_headers).json()
+    assert listed == [{"id": created["id"], "user_id": created["user_id"], "prefix": created["prefix"]}]
+
+
+def test_external_api_accepts_header_or_query_and_caches_lookups(client, auth_headers, query_budget):
+    token = client.post("/api/auth/generate-permanent-token", headers=auth_headers).json()["token"]
+    clear_api_token_cache()
+
+    assert client.get("/api/events/external", params={"token": token}).status_code == 200
+    with query_budget(10) as statements:
+        response = client.get("/api/events/external", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert not [statement for statement in statements if "FROM tokens" in statement]
+
+    assert client.get("/api/events/external").status_code == 401
+    assert client.get("/api/events/external", params={"token": token[:8] + "0" * 56}).status_code == 401
+
+
+def test_revoked_tokens_stop_working_immediately(client, auth_headers):
+    created = client.post("/api/auth/generate-permanent-token", headers=auth_headers).json()
+    headers = {"Authorization": f"Bearer {created['token']}"}
+    assert client.get("/api/events/external", headers=headers).status_code == 200
+
+    assert client.delete(f"/api/auth/revoke-token/{created['id']}", headers=auth_headers).status_code == 200
+    assert client.get("/api/events/external", headers=headers).status_code == 401
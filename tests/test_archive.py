@@ -0,0 +1,95 @@
+# backend/tests/test_archive.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.core.archive import archive_events
+from app.db.database import SessionLocal
+from app.models.event import Event
+from app.models.event_archive import EventArchive
+
+
+def seed_events(user_id: int, days_ago: list) -> list:
+    now = datetime.now().replace(microsecond=0)
+    with SessionLocal() as db:
+        events = [
+            Event(
+                user_id=user_id,
+                title=f"Review {days}",
+                start_time=now - timedelta(days=days),
+                end_time=now - timedelta(days=days) + timedelta(minutes=30),
+                attendee_name="Ada Lovelace",
+                is_confirmed=True
+            )
+            for days in days_ago
+        ]
+        db.add_all(events)
+        db.commit()
+        return [event.id for event in events]
+
+
+def counts():
+    with SessionLocal() as db:
+        return db.scalar(select(func.count(Event.id))), db.scalar(select(func.count(EventArchive.id)))
+
+
+def test_archiver_moves_old_events_in_resumable_batches(client, auth_headers):
+    user_id = client.get("/api/auth/me", headers=auth_headers).json()["id"]
+    seed_events(user_id, [400, 500, 600, 700, 800, 3])
+
+    # Interrupted after one chunk, the next run picks up the rest
+    assert client.portal.call(lambda: archive_events(365, batch_size=2, max_batches=1)) == 2
+    assert counts() == (4, 2)
+    assert client.portal.call(lambda: archive_events(365, batch_size=2)) == 3
+    assert counts() == (1, 5)
+    assert client.portal.call(lambda: archive_events(365, batch_size=2)) == 0
+
+
+def test_past_listing_reads_the_archive(client, auth_headers):
+    headers = auth_headers
+    user_id = client.get("/api/auth/me", headers=headers).json()["id"]
+    ids = seed_events(user_id, [2, 400, 5, 500, 10, 600])
+    client.portal.call(lambda: archive_events(365))
+    assert counts() == (3, 3)
+
+    # Newest first across both tables, page by page
+    seen = []
+    params = {"status": "past", "limit": 2, "include_total": True}
+    while True:
+        page = client.get("/api/events", params=params, headers=headers).json()
+        assert page["total"] == 6
+        seen += [item["id"] for item in page["items"]]
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert seen == [ids[0], ids[2], ids[4], ids[1], ids[3], ids[5]]
+
+    # Unfiltered listings include the archive; upcoming only reads the hot table
+    unfiltered = client.get("/api/events", params={"include_total": True}, headers=headers).json()
+    assert unfiltered["total"] == 6
+    assert [item["id"] for item in unfiltered["items"]] == [ids[0], ids[2], ids[4], ids[1], ids[3], ids[5]]
+    assert client.get("/api/events", params={"status": "upcoming", "include_total": True}, headers=headers).json()["total"] == 0
+
+    found = client.get("/api/events", params={"status": "past", "q": "review 500"}, headers=headers).json()
+    assert [item["id"] for item in found["items"]] == [ids[3]]
+
+    archived = client.get(f"/api/events/{ids[5]}", headers=headers)
+    assert archived.status_code == 200
+    assert archived.json()["title"] == "Review 600"
+
+
+def test_archived_ids_are_never_reused(client, auth_headers):
+    headers = auth_headers
+    user_id = client.get("/api/auth/me", headers=headers).json()["id"]
+    [recent, old] = seed_events(user_id, [3, 400])
+    client.portal.call(lambda: archive_events(365))
+
+    # The newest id now lives only in the archive; a new event must not take it
+    [reused] = seed_events(user_id, [500])
+    assert reused > old
+
+    # So archiving again can't collide on the archive's primary key
+    assert client.portal.call(lambda: archive_events(365)) == 1
+    assert counts() == (1, 2)
+    titles = {event_id: client.get(f"/api/events/{event_id}", headers=headers).json()["title"] for event_id in (recent, old, reused)}
+    assert titles == {recent: "Review 3", old: "Review 400", reused: "Review 500"}
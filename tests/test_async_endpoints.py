@@ -0,0 +1,111 @@
+# backend/tests/test_async_endpoints.py
+"""Smoke tests for handlers on the async session: objects refreshed after a
+commit and relationships that would otherwise need a lazy load."""
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import MissingGreenlet
+
+from app.db.database import AsyncSessionLocal, get_async_database_url
+from app.db.queries import load_event_type_with_host, load_host_context
+from app.models.event_type import EventType
+
+
+@pytest.fixture
+def host(client, auth_headers):
+    client.get("/api/profile/me", headers=auth_headers)
+    client.get("/api/settings", headers=auth_headers)
+    event_type = client.post(
+        "/api/event-types", json={"name": "Intro Call", "duration": 30}, headers=auth_headers
+    ).json()
+    return {"headers": auth_headers, "event_type": event_type}
+
+
+def test_signup_returns_the_refreshed_user(client):
+    response = client.post("/api/auth/signup", json={"email": "new@example.com", "password": "secret-password"})
+    assert response.status_code == 200
+    assert response.json()["id"] and response.json()["email"] == "new@example.com"
+
+
+def test_created_and_updated_rows_come_back_refreshed(client, host):
+    headers = host["headers"]
+    start = datetime.combine(date.today() + timedelta(days=2), datetime.min.time()).replace(hour=9)
+    created = client.post("/api/events", json={
+        "title": "Planning", "start_time": start.isoformat(), "end_time": (start + timedelta(hours=1)).isoformat()
+    }, headers=headers)
+    assert created.status_code == 200
+    event = created.json()
+    assert event["id"] and event["title"] == "Planning"
+
+    updated = client.put(f"/api/events/{event['id']}", json={**event, "title": "Planning v2"}, headers=headers)
+    assert updated.status_code == 200 and updated.json()["title"] == "Planning v2"
+    assert client.get(f"/api/events/{event['id']}", headers=headers).json()["title"] == "Planning v2"
+
+    event_type_id = host["event_type"]["id"]
+    renamed = client.put(f"/api/event-types/{event_type_id}", json={"name": "Deep Dive", "duration": 45}, headers=headers)
+    assert renamed.status_code == 200
+    assert (renamed.json()["name"], renamed.json()["duration"]) == ("Deep Dive", 45)
+
+    booked = client.post(f"/api/event-types/{event_type_id}/book", json={
+        "start_time": (start + timedelta(days=1)).isoformat(), "name": "Attendee", "email": "attendee@example.com"
+    }, headers=headers)
+    assert booked.status_code == 200 and booked.json()["id"]
+
+    settings = client.get("/api/settings", headers=headers).json()
+    settings["notification_settings"]["email"]["enabled"] = True
+    saved = client.put("/api/settings", json=settings, headers=headers)
+    assert saved.status_code == 200 and saved.json()["notification_settings"]["email"]["enabled"] is True
+
+    profile = client.put("/api/profile/me", data={"profile_data": json.dumps({"full_name": "Host Person"})}, headers=headers)
+    assert profile.status_code == 200
+    assert client.get("/api/profile/me", headers=headers).json()["full_name"] == "Host Person"
+
+    token = client.post("/api/auth/generate-permanent-token", json={"name": "ci"}, headers=headers)
+    assert token.status_code == 200
+    assert [row["id"] for row in client.get("/api/auth/list-tokens", headers=headers).json()] == [token.json()["id"]]
+
+
+def test_public_booking_reads_the_host_through_relationships(client, host):
+    day = (date.today() + timedelta(days=3)).isoformat()
+    booking = client.post("/public/bookings", json={
+        "event_type_id": host["event_type"]["id"], "date": day, "time": "10:00",
+        "name": "Attendee", "email": "attendee@example.com", "phone": "+15551234567", "location": "Phone"
+    })
+    assert booking.status_code == 200
+    fetched = client.get(f"/public/bookings/{booking.json()['id']}")
+    assert fetched.status_code == 200 and fetched.json()["id"] == booking.json()["id"]
+
+    me = client.get("/api/auth/me", headers=host["headers"]).json()
+    assert client.get(f"/public/profile/{me['id']}").status_code == 200
+
+
+def test_host_context_loads_relationships_without_lazy_loads(client, host):
+    me = client.get("/api/auth/me", headers=host["headers"]).json()
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            user = await load_host_context(db, me["id"])
+            event_type = await load_event_type_with_host(db, host["event_type"]["id"])
+            return user.profile, user.settings, event_type.user.profile, event_type.user.settings
+
+    assert all(row.user_id == me["id"] for row in client.portal.call(load))
+
+    async def lazy_load():
+        async with AsyncSessionLocal() as db:
+            event_type = await db.scalar(select(EventType).where(EventType.id == host["event_type"]["id"]))
+            return event_type.user
+
+    # What the loaders prevent: async sessions refuse implicit lazy loads
+    with pytest.raises(MissingGreenlet):
+        client.portal.call(lazy_load)
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+    ("mysql+pymysql://u:p@db/app", "mysql+aiomysql://u:p@db/app"),
+    ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+])
+def test_sync_urls_map_to_pinned_async_drivers(url, expected):
+    assert get_async_database_url(url) == expected
@@ -0,0 +1,38 @@
+# backend/tests/test_auth_cache.py
+from sqlalchemy import select
+
+from app.db.database import SessionLocal
+from app.models.user import User
+
+
+def test_repeat_requests_resolve_the_user_from_memory(client, auth_headers, query_budget):
+    client.get("/api/auth/verify-token", headers=auth_headers)
+
+    with query_budget(0):
+        response = client.get("/api/auth/verify-token", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["user"]["email"] == "host@example.com"
+
+
+def test_deactivation_and_deletion_invalidate_the_cached_user(client, auth_headers):
+    assert client.get("/api/auth/verify-token", headers=auth_headers).status_code == 200
+
+    with SessionLocal() as db:
+        db.scalar(select(User).where(User.email == "host@example.com")).is_active = False
+        db.commit()
+    assert client.get("/api/auth/verify-token", headers=auth_headers).status_code == 401
+
+    with SessionLocal() as db:
+        db.scalar(select(User).where(User.email == "host@example.com")).is_active = True
+        db.commit()
+    assert client.get("/api/event-types", headers=auth_headers).status_code == 200
+
+    with SessionLocal() as db:
+        db.delete(db.scalar(select(User).where(User.email == "host@example.com")))
+        db.commit()
+    assert client.get("/api/auth/verify-token", headers=auth_headers).status_code == 401
+
+
+def test_invalid_tokens_are_rejected(client):
+    response = client.get("/api/auth/verify-token", headers={"Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 401
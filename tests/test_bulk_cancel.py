@@ -0,0 +1,127 @@
+# backend/tests/test_bulk_cancel.py
+import json
+import mailbox
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.core.config import get_settings
+from app.main import app
+from app.utils import notifications
+
+
+@pytest.fixture
+def host(email_host):
+    return email_host
+
+
+def create_events(client, headers, day: date, count: int) -> list:
+    ids = []
+    for i in range(count):
+        start = datetime.combine(day, datetime.min.time()) + timedelta(hours=8, minutes=30 * i)
+        ids.append(client.post("/api/events", headers=headers, json={
+            "title": f"Call {i}",
+            "attendee_name": f"Attendee {i}",
+            "attendee_email": f"attendee{i}@example.com",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=30)).isoformat()
+        }).json()["id"])
+    return ids
+
+
+def mail_count() -> int:
+    return len(mailbox.Maildir(get_settings().MAIL_FILE_SINK_DIR, create=True))
+
+
+def test_bulk_cancel_by_ids_reports_each_event(client, host):
+    ids = create_events(client, host, date.today() + timedelta(days=3), 3)
+    sent_before = mail_count()
+
+    response = client.post("/api/events/bulk-cancel", headers=host, json={
+        "reason": "Out sick", "event_ids": [ids[0], ids[2], 999999]
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["cancelled"] == 2
+    assert {(item["id"], item["status"], item["email_sent"]) for item in body["results"]} == {
+        (ids[0], "cancelled", True), (ids[2], "cancelled", True), (999999, "not_found", False)
+    }
+    assert mail_count() == sent_before + 2
+
+    remaining = client.get("/api/events", headers=host).json()["items"]
+    assert [event["id"] for event in remaining] == [ids[1]]
+
+
+def test_bulk_cancel_responds_before_notifying(client, host, monkeypatch):
+    """With email on, the response must not wait for the throttled sends"""
+    ids = create_events(client, host, date.today() + timedelta(days=3), 12)
+    timeline = []
+    deliver = notifications.deliver_email
+
+    async def deliver_email(email_settings, message):
+        timeline.append("email")
+        await deliver(email_settings, message)
+
+    monkeypatch.setattr(notifications, "deliver_email", deliver_email)
+    body = json.dumps({"reason": "Out sick", "event_ids": ids}).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": "/api/events/bulk-cancel", "raw_path": b"/api/events/bulk-cancel", "query_string": b"",
+        "root_path": "", "client": ("testclient", 50000), "server": ("testserver", 80),
+        "headers": [
+            (b"authorization", host["Authorization"].encode()),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode())
+        ]
+    }
+
+    async def request():
+        response = {}
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                timeline.append("response")
+
+        # Returns once the background notices have run too
+        await app(scope, receive, send)
+        return response
+
+    assert client.portal.call(request)["status"] == 200
+    assert timeline == ["response"] + ["email"] * 12
+
+
+def test_bulk_cancel_day_runs_a_fixed_number_of_queries(client, auth_headers, query_budget):
+    # Email off: background sends would count their settings lookups against the budget
+    host = auth_headers
+    client.get("/api/profile/me", headers=host)
+    client.get("/api/settings", headers=host)
+    sick_day = date.today() + timedelta(days=4)
+    cancelled = create_events(client, host, sick_day, 20)
+    kept = create_events(client, host, sick_day + timedelta(days=1), 2)
+
+    # User, events, host context, delete, no matter how many events
+    with query_budget(4):
+        response = client.post("/api/events/bulk-cancel", headers=host, json={
+            "reason": "Out sick",
+            "start": f"{sick_day.isoformat()}T00:00:00",
+            "end": f"{(sick_day + timedelta(days=1)).isoformat()}T00:00:00"
+        })
+    assert response.status_code == 200
+    assert sorted(item["id"] for item in response.json()["results"]) == cancelled
+
+    remaining = client.get("/api/events", headers=host).json()["items"]
+    assert sorted(event["id"] for event in remaining) == kept
+
+
+@pytest.mark.parametrize("body", [
+    {"reason": "x"},
+    {"reason": "x", "event_ids": [1], "start": "2030-01-01T00:00:00", "end": "2030-01-02T00:00:00"},
+    {"reason": "x", "start": "2030-01-02T00:00:00", "end": "2030-01-01T00:00:00"},
+])
+def test_bulk_cancel_needs_ids_or_a_range(client, host, body):
+    assert client.post("/api/events/bulk-cancel", headers=host, json=body).status_code == 422
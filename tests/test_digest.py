@@ -0,0 +1,130 @@
+# backend/tests/test_digest.py
+import asyncio
+import mailbox
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core import digest
+from app.core.config import get_settings
+from app.core.digest import last_digest_boundary, send_due_digests
+from app.db.database import AsyncSessionLocal
+from app.models.digest import DigestItem
+from app.models.profile import Profile
+from app.models.settings import Settings
+from app.models.user import User
+
+EMAIL_SETTINGS = {
+    "smtp_server": "unused", "smtp_port": 587, "smtp_username": "host",
+    "smtp_password": "secret", "from_email": "host@example.com", "from_name": "Host"
+}
+
+
+def mail_count() -> int:
+    return len(mailbox.Maildir(get_settings().MAIL_FILE_SINK_DIR, create=True))
+
+
+@pytest.mark.parametrize("now, expected", [
+    # New York, 07:00 local: 12:00 UTC in winter, 11:00 UTC in summer
+    (datetime(2026, 3, 7, 13, 0), datetime(2026, 3, 7, 12, 0)),
+    # Clocks went forward at 02:00 on March 8: the previous 07:00 is 23 hours before the next
+    (datetime(2026, 3, 8, 10, 30), datetime(2026, 3, 7, 12, 0)),
+    (datetime(2026, 3, 8, 11, 30), datetime(2026, 3, 8, 11, 0)),
+    # And back on November 1: 07:00 EDT the day before, 07:00 EST after
+    (datetime(2026, 11, 1, 11, 30), datetime(2026, 10, 31, 11, 0)),
+    (datetime(2026, 11, 1, 12, 30), datetime(2026, 11, 1, 12, 0)),
+])
+def test_boundary_follows_local_wall_clock_across_dst(now, expected):
+    assert last_digest_boundary(now, "America/New_York", 7, 24) == expected
+
+
+def test_boundary_with_shorter_windows_and_unknown_zones():
+    # 12-hour windows anchored at 07:00 also close at 19:00
+    assert last_digest_boundary(datetime(2026, 6, 1, 20, 0), "UTC", 7, 12) == datetime(2026, 6, 1, 19, 0)
+    assert last_digest_boundary(datetime(2026, 6, 1, 6, 0), "Not/AZone", 7, 24) == datetime(2026, 5, 31, 7, 0)
+
+
+@pytest.fixture
+def digest_hosts(client):
+    """Five digest-mode hosts, each with two items from before their last boundary"""
+    async def seed():
+        async with AsyncSessionLocal() as db:
+            hosts = [User(email=f"host{n}@example.com", hashed_password="x", is_active=True) for n in range(5)]
+            db.add_all(hosts)
+            await db.flush()
+            old = datetime.utcnow() - timedelta(days=2)
+            for host in hosts:
+                db.add(Settings(
+                    user_id=host.id,
+                    notification_settings={"email": {"enabled": True, "digest": True, "digestHour": 7}},
+                    email_settings=EMAIL_SETTINGS
+                ))
+                db.add(Profile(user_id=host.id, time_zone="Europe/Berlin"))
+                for n in range(2):
+                    db.add(DigestItem(user_id=host.id, kind="booking", event_title=f"Call {n}",
+                                      event_time=old + timedelta(days=5), attendee_name="Attendee", created_at=old))
+            # Too recent for this window
+            db.add(DigestItem(user_id=hosts[0].id, kind="booking", event_title="Later",
+                              event_time=old + timedelta(days=5), created_at=datetime.utcnow()))
+            await db.commit()
+            return [host.id for host in hosts]
+    return client.portal.call(seed)
+
+
+def remaining_items(client) -> int:
+    async def count():
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(select(func.count()).select_from(DigestItem))
+    return client.portal.call(count)
+
+
+def test_digests_are_sent_in_host_batches(client, digest_hosts, monkeypatch):
+    monkeypatch.setattr(digest.settings, "DIGEST_HOST_BATCH_SIZE", 2)
+    sent_before = mail_count()
+    assert client.portal.call(send_due_digests) == 5
+    assert mail_count() == sent_before + 5
+    assert remaining_items(client) == 1
+    # Nothing left in this window
+    assert client.portal.call(send_due_digests) == 0
+
+
+def test_concurrent_workers_send_each_digest_once(client, digest_hosts):
+    sent_before = mail_count()
+
+    async def two_workers():
+        return await asyncio.gather(send_due_digests(), send_due_digests())
+
+    assert sum(client.portal.call(two_workers)) == 5
+    assert mail_count() == sent_before + 5
+    assert remaining_items(client) == 1
+
+
+def test_items_of_hosts_no_longer_in_digest_mode_do_not_linger(client, digest_hosts):
+    flushed, dropped, no_settings, bad_hour = digest_hosts[:4]
+
+    async def change_settings():
+        async with AsyncSessionLocal() as db:
+            rows = {row.user_id: row for row in (await db.scalars(select(Settings))).all()}
+            rows[flushed].notification_settings = {"email": {"enabled": True, "digest": False}}
+            rows[dropped].notification_settings = {"email": {"enabled": False, "digest": True}}
+            await db.delete(rows[no_settings])
+            rows[bad_hour].notification_settings = {"email": {"enabled": True, "digest": True, "digestHour": "7am"}}
+            await db.commit()
+    client.portal.call(change_settings)
+
+    sent_before = mail_count()
+    # The flushed host's recent item goes out too; the other two hosts still use their boundary
+    assert client.portal.call(send_due_digests) == 3
+    assert mail_count() == sent_before + 3
+    assert remaining_items(client) == 0
+    assert client.portal.call(send_due_digests) == 0
+
+
+def test_digest_hour_is_validated_on_save(client, auth_headers):
+    saved = client.get("/api/settings", headers=auth_headers).json()
+    for hour in ("7am", None, 24, -1, 7.5, True):
+        saved["notification_settings"]["email"]["digestHour"] = hour
+        assert client.put("/api/settings", json=saved, headers=auth_headers).status_code == 422
+    saved["notification_settings"]["email"]["digestHour"] = 23
+    assert client.put("/api/settings", json=saved, headers=auth_headers).status_code == 200
@@ -0,0 +1,87 @@
+# backend/tests/test_migrations.py
+"""The app no longer creates tables, so the migrations must build the whole schema."""
+import pytest
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+
+from app.db import schema_check
+from app.db.database import Base, engine
+from app.db.schema_check import ALEMBIC_DIR, SchemaOutOfDate, head_revisions
+from app.main import app
+
+
+def alembic_config(connection) -> Config:
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.attributes["connection"] = connection
+    return config
+
+
+def test_migrations_create_every_model_table(tmp_path):
+    migrated = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    with migrated.begin() as conn:
+        command.upgrade(alembic_config(conn), "head")
+
+    inspector = inspect(migrated)
+    assert set(Base.metadata.tables) <= set(inspector.get_table_names())
+    assert "ix_tokens_user_id" in {index["name"] for index in inspector.get_indexes("tokens")}
+
+    with migrated.begin() as conn:
+        command.downgrade(alembic_config(conn), "base")
+    migrated.dispose()
+
+
+def test_event_ids_become_monotonic_and_shadowed_archive_rows_move(tmp_path):
+    migrated = create_engine(f"sqlite:///{tmp_path / 'reused.db'}")
+    with migrated.begin() as conn:
+        command.upgrade(alembic_config(conn), "b4d8f2a6c310")
+        conn.execute(text("INSERT INTO users (id, email, hashed_password, is_active) VALUES (1, 'h@example.com', 'x', 1)"))
+        # Event 5 was archived, then SQLite handed id 2 out again after archiving the first event 2
+        conn.execute(text(
+            "INSERT INTO events_archive (id, user_id, title, start_time, end_time, created_at, archived_at) VALUES "
+            "(2, 1, 'Old standup', '2020-01-01', '2020-01-01', '2020-01-01', '2021-01-01'), "
+            "(5, 1, 'Old review', '2020-01-02', '2020-01-02', '2020-01-02', '2021-01-01')"
+        ))
+        conn.execute(text(
+            "INSERT INTO events (id, user_id, title, start_time, end_time, created_at) VALUES "
+            "(1, 1, 'Planning', '2030-01-01', '2030-01-01', '2029-01-01'), "
+            "(2, 1, 'Retro', '2030-01-02', '2030-01-02', '2029-01-01')"
+        ))
+        command.upgrade(alembic_config(conn), "head")
+
+        assert conn.execute(text("SELECT id, title FROM events_archive ORDER BY id")).all() == [
+            (5, "Old review"), (6, "Old standup")
+        ]
+        assert conn.execute(text(
+            "SELECT rowid FROM events_archive_fts WHERE events_archive_fts MATCH 'standup'"
+        )).scalars().all() == [6]
+        conn.execute(text(
+            "INSERT INTO events (user_id, title, start_time, end_time, created_at) "
+            "VALUES (1, 'Kickoff', '2030-01-03', '2030-01-03', '2029-01-01')"
+        ))
+        # Past every id in either table, and indexed by the recreated trigger
+        assert conn.execute(text("SELECT id FROM events WHERE title = 'Kickoff'")).scalar() == 7
+        assert conn.execute(text("SELECT rowid FROM events_fts WHERE events_fts MATCH 'kickoff'")).scalars().all() == [7]
+    migrated.dispose()
+
+
+def test_strict_schema_check_refuses_unmigrated_database(client, monkeypatch):
+    # conftest builds the test schema with create_all, which never stamps a revision
+    monkeypatch.setattr(schema_check.settings, "SCHEMA_CHECK", "strict")
+    with pytest.raises(SchemaOutOfDate):
+        with TestClient(app):
+            pass
+
+    with engine.begin() as conn:
+        command.stamp(alembic_config(conn), "head")
+    with TestClient(app):
+        pass
+
+
+def test_head_revisions_match_alembic():
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    assert head_revisions() == set(ScriptDirectory.from_config(config).get_heads())
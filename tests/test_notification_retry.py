@@ -0,0 +1,145 @@
+# backend/tests/test_notification_retry.py
+import mailbox
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core import notification_retry
+from app.core.config import get_settings
+from app.core.notification_retry import _claim_batch, backoff_delay, retry_due_notifications
+from app.db.database import AsyncSessionLocal
+from app.models.notification import NotificationDeadLetter, NotificationRetry
+from app.utils import notifications
+
+INTERNAL = {"X-Internal-Token": "internal-secret"}
+
+
+def mail_count() -> int:
+    return len(mailbox.Maildir(get_settings().MAIL_FILE_SINK_DIR, create=True))
+
+
+@pytest.fixture
+def host_id(client, email_host):
+    return client.get("/api/auth/me", headers=email_host).json()["id"]
+
+
+@pytest.fixture
+def flaky_smtp(monkeypatch):
+    """Fail every email delivery with a transient error until `state["down"]` is cleared"""
+    state = {"down": True}
+    deliver = notifications.deliver_email
+
+    async def deliver_email(email_settings, message):
+        if state["down"]:
+            raise ConnectionError("SMTP server unavailable")
+        await deliver(email_settings, message)
+
+    monkeypatch.setattr(notifications, "deliver_email", deliver_email)
+    return state
+
+
+def rows(client, model):
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return (await db.scalars(select(model).order_by(model.id))).all()
+    return client.portal.call(load)
+
+
+def make_due(client):
+    async def due():
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(NotificationRetry).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+            await db.commit()
+    client.portal.call(due)
+
+
+def send_cancellation(client, host_id, to_email="attendee@example.com"):
+    return client.portal.call(lambda: notifications.send_cancellation_email(
+        user_id=host_id, to_email=to_email, event_title="Intro", event_time=datetime(2030, 1, 1, 9), reason="Sick"
+    ))
+
+
+def test_backoff_grows_with_jitter_and_is_capped():
+    settings = get_settings()
+    for attempts in (1, 2, 3):
+        full = settings.NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+        assert full / 2 <= backoff_delay(attempts) <= full
+    assert backoff_delay(50) <= settings.NOTIFICATION_RETRY_MAX_SECONDS
+
+
+def test_failed_send_is_queued_without_credentials(client, host_id, flaky_smtp):
+    assert send_cancellation(client, host_id) is False
+    [retry] = rows(client, NotificationRetry)
+    assert retry.payload["user_id"] == host_id
+    assert "email_settings" not in retry.payload and "secret" not in str(retry.payload)
+    assert retry.attempts == 1 and retry.next_attempt_at > datetime.utcnow()
+
+    # Settings are read again when the retry runs
+    flaky_smtp["down"] = False
+    sent_before = mail_count()
+    make_due(client)
+    assert client.portal.call(retry_due_notifications) == 1
+    assert rows(client, NotificationRetry) == [] and mail_count() == sent_before + 1
+
+
+def test_senders_refuse_credential_arguments():
+    with pytest.raises(TypeError):
+        @notification_retry.retryable("leaky_email")
+        async def leaky(to_email, email_settings):
+            return True
+
+
+def test_permanent_failures_skip_the_retry_queue(client, host_id, flaky_smtp):
+    assert send_cancellation(client, host_id, to_email=None) is False
+    assert send_cancellation(client, host_id + 1000) is False  # no settings for that host
+    assert rows(client, NotificationRetry) == []
+    letters = rows(client, NotificationDeadLetter)
+    assert [letter.attempts for letter in letters] == [1, 1]
+    assert "No recipient" in letters[0].last_error and "configuration" in letters[1].last_error
+
+
+def test_retries_dead_letter_after_max_attempts_and_replay(client, host_id, flaky_smtp, monkeypatch):
+    monkeypatch.setattr(notification_retry.settings, "NOTIFICATION_MAX_ATTEMPTS", 3)
+    send_cancellation(client, host_id)
+    for _ in range(2):
+        make_due(client)
+        assert client.portal.call(retry_due_notifications) == 1
+    assert rows(client, NotificationRetry) == []
+    [letter] = rows(client, NotificationDeadLetter)
+    assert letter.attempts == 3 and "SMTP server unavailable" in letter.last_error
+
+    monkeypatch.setattr(get_settings(), "INTERNAL_API_TOKEN", "internal-secret")
+    listed = client.get("/api/internal/dead-letters", headers=INTERNAL).json()
+    assert listed[0]["payload"]["user_id"] == host_id
+
+    flaky_smtp["down"] = False
+    replayed = client.post(f"/api/internal/dead-letters/{letter.id}/replay", headers=INTERNAL)
+    assert replayed.status_code == 200
+    [retry] = rows(client, NotificationRetry)
+    assert retry.attempts == 0 and retry.next_attempt_at <= datetime.utcnow()
+    assert client.portal.call(retry_due_notifications) == 1
+    assert rows(client, NotificationRetry) == [] and rows(client, NotificationDeadLetter) == []
+
+
+def test_a_leased_batch_is_not_claimed_twice(client, host_id, flaky_smtp):
+    for _ in range(3):
+        send_cancellation(client, host_id)
+    make_due(client)
+
+    async def claim(batch_size):
+        async with AsyncSessionLocal() as db:
+            return [row.id for row in await _claim_batch(db, batch_size)]
+
+    first = client.portal.call(claim, 2)
+    second = client.portal.call(claim, 10)
+    assert len(first) == 2 and len(second) == 1 and not set(first) & set(second)
+    assert client.portal.call(claim, 10) == []
+
+    # A worker that died mid-batch loses its lease once it runs out
+    async def expire_leases():
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(NotificationRetry).values(locked_until=datetime.utcnow() - timedelta(seconds=1)))
+            await db.commit()
+    client.portal.call(expire_leases)
+    assert sorted(client.portal.call(claim, 10)) == sorted(first + second)
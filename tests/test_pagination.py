@@ -0,0 +1,91 @@
+# backend/tests/test_pagination.py
+import base64
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.database import AsyncSessionLocal
+from app.models.event import Event
+
+
+@pytest.fixture
+def events(client, auth_headers):
+    """Nine events for the host, four of them sharing a start time, and one for another host"""
+    host_id = client.get("/api/auth/me", headers=auth_headers).json()["id"]
+    day = datetime.combine(date.today() + timedelta(days=5), datetime.min.time())
+    starts = [day + timedelta(hours=9)] * 4 + [day + timedelta(hours=hour) for hour in (8, 10, 11, 12, 13)]
+
+    async def seed():
+        async with AsyncSessionLocal() as db:
+            rows = [
+                Event(user_id=host_id, title=f"Sync {n}", start_time=start, end_time=start + timedelta(minutes=30))
+                for n, start in enumerate(starts)
+            ]
+            rows.append(Event(user_id=host_id + 1, title="Someone else", start_time=day, end_time=day + timedelta(hours=1)))
+            db.add_all(rows)
+            await db.commit()
+            return sorted(
+                ((row.start_time, row.id) for row in rows if row.user_id == host_id), reverse=True
+            )
+
+    return client.portal.call(seed)
+
+
+def walk(client, headers, **params):
+    """Every page of a listing, following next_cursor"""
+    pages, cursor = [], None
+    while True:
+        body = client.get("/api/events", params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers).json()
+        pages.append(body)
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trips_positions_and_ids():
+    moment = datetime(2030, 1, 2, 9, 30, 0, 1500)
+    assert decode_cursor(encode_cursor(moment, 42)) == (moment, 42)
+    assert decode_cursor(encode_cursor(1.25, 7)) == (1.25, 7)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4])
+def test_pages_cover_every_event_once_across_start_time_ties(client, auth_headers, events, limit):
+    pages = walk(client, auth_headers, limit=limit)
+    ids = [item["id"] for page in pages for item in page["items"]]
+    assert ids == [event_id for _, event_id in events]
+    assert all(len(page["items"]) == limit for page in pages[:-1])
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    base64.urlsafe_b64encode(b'["t","yesterday",1]').decode(),
+    base64.urlsafe_b64encode(b'["x",1,1]').decode(),
+    base64.urlsafe_b64encode(b'{"t":1}').decode(),
+    # A search-rank cursor can't continue a time-ordered listing
+    encode_cursor(1.5, 3),
+])
+def test_malformed_cursors_are_rejected(client, auth_headers, cursor):
+    response = client.get("/api/events", params={"cursor": cursor}, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_limit_defaults_and_is_clamped(client, auth_headers, events):
+    assert client.get("/api/events", headers=auth_headers).json()["limit"] == 10
+    body = client.get("/api/events", params={"limit": 1000}, headers=auth_headers).json()
+    assert body["limit"] == 100 and len(body["items"]) == len(events)
+    assert client.get("/api/events", params={"limit": 0}, headers=auth_headers).status_code == 422
+
+
+def test_total_is_opt_in_and_counts_every_page(client, auth_headers, events):
+    assert client.get("/api/events", params={"limit": 2}, headers=auth_headers).json()["total"] is None
+    pages = walk(client, auth_headers, limit=2, include_total=True)
+    assert {page["total"] for page in pages} == {len(events)}
+    assert client.get("/api/events", params={"status": "past", "include_total": True}, headers=auth_headers).json()["total"] == 0
+
+
+def test_search_pages_follow_rank_ties(client, auth_headers, events):
+    pages = walk(client, auth_headers, q="sync", limit=2)
+    ids = [item["id"] for page in pages for item in page["items"]]
+    assert sorted(ids) == sorted(event_id for _, event_id in events)
@@ -0,0 +1,53 @@
+# backend/tests/test_password_hashing.py
+import asyncio
+
+from sqlalchemy import select
+
+from app.core import password_hashing
+from app.db.database import SessionLocal
+from app.models.user import User
+
+CREDENTIALS = {"username": "host@example.com", "password": "secret-password"}
+
+
+def stored_hash() -> str:
+    with SessionLocal() as db:
+        return db.scalar(select(User.hashed_password).where(User.email == CREDENTIALS["username"]))
+
+
+def test_login_rehashes_when_the_cost_changes(client, auth_headers, monkeypatch):
+    assert stored_hash().startswith("$2b$04$")
+
+    monkeypatch.setattr(password_hashing.settings, "BCRYPT_ROUNDS", 5)
+    assert client.post("/api/auth/token", data=CREDENTIALS).status_code == 200
+    assert stored_hash().startswith("$2b$05$")
+
+    assert client.post("/api/auth/token", data=CREDENTIALS).status_code == 200
+    wrong = dict(CREDENTIALS, password="wrong")
+    assert client.post("/api/auth/token", data=wrong).status_code == 401
+
+
+def test_full_queue_answers_503(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(password_hashing.settings, "PASSWORD_HASH_MAX_PENDING", 0)
+    response = client.post("/api/auth/token", data=CREDENTIALS)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_process_pool_hashes_and_verifies(monkeypatch):
+    monkeypatch.setattr(password_hashing.settings, "PASSWORD_HASH_EXECUTOR", "process")
+    monkeypatch.setattr(password_hashing.settings, "PASSWORD_HASH_WORKERS", 2)
+    monkeypatch.setattr(password_hashing, "_executor", None)
+
+    async def roundtrip():
+        hashed = await password_hashing.hash_password("pw")
+        return hashed, await asyncio.gather(
+            password_hashing.verify_password("pw", hashed), password_hashing.verify_password("nope", hashed)
+        )
+
+    try:
+        hashed, results = asyncio.run(roundtrip())
+        assert isinstance(password_hashing._executor, password_hashing.ProcessPoolExecutor)
+    finally:
+        password_hashing.shutdown_password_hashing()
+    assert results == [(True, None), (False, None)]
@@ -0,0 +1,85 @@
+# backend/tests/test_pool_stats.py
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import get_settings
+from app.db.database import get_db, pool_stats
+from app.db.pool_stats import PoolStats, timed_pool
+
+INTERNAL = {"X-Internal-Token": "internal-secret"}
+
+
+@pytest.fixture
+def single_connection_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=timed_pool(QueuePool), pool_size=1, max_overflow=0, pool_timeout=0.2
+    )
+    yield engine, PoolStats(engine)
+    engine.dispose()
+
+
+def test_counts_checkouts_and_times_waits_for_a_free_connection(single_connection_engine):
+    engine, stats = single_connection_engine
+    held = engine.connect()
+    released = threading.Timer(0.05, held.close)
+    released.start()
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        assert stats.snapshot()["checked_out"] == 1
+    released.join()
+
+    snapshot = stats.snapshot()
+    assert (snapshot["connects"], snapshot["checkouts"], snapshot["checked_out"], snapshot["peak_checked_out"]) == (1, 2, 0, 1)
+    assert snapshot["wait_ms"]["count"] == 2
+    assert 40 <= snapshot["wait_ms"]["max"] < 1000
+    assert sum(snapshot["wait_ms"]["histogram"].values()) == 2
+
+
+def test_waits_are_still_timed_after_the_pool_is_recreated(single_connection_engine):
+    engine, stats = single_connection_engine
+    engine.dispose()
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    # Timeouts raise before a wait is recorded; the successful checkout is counted
+    assert stats.snapshot()["wait_ms"]["count"] == 1
+
+
+def test_get_db_does_not_hold_a_connection_until_first_use(client):
+    stats = pool_stats["async"]
+
+    async def request():
+        sessions = get_db()
+        db = await sessions.__anext__()
+        idle = stats.checked_out
+        await db.execute(text("select 1"))
+        busy = stats.checked_out
+        await sessions.aclose()
+        return idle, busy
+
+    before = stats.checked_out
+    idle, busy = client.portal.call(request)
+    assert (idle, busy) == (before, before + 1)
+    assert stats.checked_out == before
+
+
+def test_db_pool_endpoint_reports_each_engine(client, auth_headers, monkeypatch):
+    assert client.get("/api/internal/db-pool").status_code == 404
+    monkeypatch.setattr(get_settings(), "INTERNAL_API_TOKEN", "internal-secret")
+    assert client.get("/api/internal/db-pool", headers={"X-Internal-Token": "wrong"}).status_code == 403
+
+    waits_before = pool_stats["async"].snapshot()["wait_ms"]["count"]
+    client.get("/api/events", headers=auth_headers)
+    report = client.get("/api/internal/db-pool", headers=INTERNAL).json()
+    assert {"async", "sync"} <= set(report)
+    primary = report["async"]
+    assert primary["pool"] == "TimedAsyncAdaptedQueuePool"
+    assert primary["checked_out"] == 0 and primary["checkouts"] >= 1
+    assert primary["wait_ms"]["count"] > waits_before
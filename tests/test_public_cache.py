@@ -0,0 +1,60 @@
+# backend/tests/test_public_cache.py
+import json
+import pytest
+
+
+@pytest.fixture
+def event_type(client, auth_headers):
+    client.put(
+        "/api/profile/me",
+        data={"profile_data": json.dumps({"full_name": "Ada Host"})},
+        headers=auth_headers
+    )
+    return client.post(
+        "/api/event-types",
+        json={"name": "Intro Call", "duration": 30},
+        headers=auth_headers
+    ).json()
+
+
+def test_public_event_type_is_served_from_cache(client, event_type, query_budget):
+    by_slug = client.get(f"/public/event-types/{event_type['slug']}")
+    assert by_slug.json()["host_name"] == "Ada Host"
+
+    # One load fills both keys
+    with query_budget(0):
+        assert client.get(f"/public/event-types/{event_type['slug']}").json() == by_slug.json()
+        assert client.get(f"/public/event-types/{event_type['id']}", params={"by_id": True}).json() == by_slug.json()
+    assert client.get("/public/event-types/abc", params={"by_id": True}).status_code == 400
+
+
+def test_host_edits_invalidate_the_cache(client, auth_headers, event_type):
+    old_slug = event_type["slug"]
+    client.get(f"/public/event-types/{old_slug}")
+
+    new_slug = client.put(
+        f"/api/event-types/{event_type['id']}",
+        json={"name": "Discovery Call", "duration": 45},
+        headers=auth_headers
+    ).json()["slug"]
+    assert new_slug != old_slug
+    assert client.get(f"/public/event-types/{old_slug}").status_code == 404
+    renamed = client.get(f"/public/event-types/{new_slug}").json()
+    assert renamed["name"] == "Discovery Call" and renamed["duration"] == 45
+
+    client.put("/api/profile/me", data={"profile_data": json.dumps({"full_name": "Ada Lovelace"})}, headers=auth_headers)
+    assert client.get(f"/public/event-types/{new_slug}").json()["host_name"] == "Ada Lovelace"
+
+    client.delete(f"/api/event-types/{event_type['id']}", headers=auth_headers)
+    assert client.get(f"/public/event-types/{new_slug}").status_code == 404
+    assert client.get(f"/public/event-types/{event_type['id']}", params={"by_id": True}).status_code == 404
+
+
+def test_public_profile_is_cached_until_updated(client, auth_headers, event_type, query_budget):
+    user_id = event_type["user_id"]
+    assert client.get(f"/public/profile/{user_id}").json()["full_name"] == "Ada Host"
+    with query_budget(0):
+        assert client.get(f"/public/profile/{user_id}").json()["full_name"] == "Ada Host"
+
+    client.put("/api/profile/me", data={"profile_data": json.dumps({"company": "Analytical Engines"})}, headers=auth_headers)
+    assert client.get(f"/public/profile/{user_id}").json()["company"] == "Analytical Engines"
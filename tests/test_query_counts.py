@@ -0,0 +1,75 @@
+# backend/tests/test_query_counts.py
+"""Statement budgets for hot endpoints, so lazy loads and per-row lookups can't creep back in."""
+from datetime import date, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def host(client, auth_headers):
+    # Both endpoints create the host's row on first access
+    client.get("/api/profile/me", headers=auth_headers)
+    client.get("/api/settings", headers=auth_headers)
+    event_type = client.post(
+        "/api/event-types",
+        json={"name": "Intro Call", "duration": 30},
+        headers=auth_headers
+    ).json()
+    return {"headers": auth_headers, "event_type": event_type}
+
+
+def test_me_loads_user_and_profile_together(client, host, query_budget):
+    with query_budget(1):
+        response = client.get("/api/auth/me", headers=host["headers"])
+    assert response.status_code == 200
+
+
+def test_booking_fetches_host_context_once(client, host, query_budget):
+    day = (date.today() + timedelta(days=3)).isoformat()
+    # Lookup, insert, refresh
+    with query_budget(3):
+        response = client.post("/public/bookings", json={
+            "event_type_id": host["event_type"]["id"],
+            "date": day,
+            "time": "11:00",
+            "name": "Attendee",
+            "email": "attendee@example.com",
+            "phone": "+15551234567",
+            "location": "Phone"
+        })
+    assert response.status_code == 200
+
+
+def test_availability_is_not_queried_per_slot(client, host, query_budget):
+    day = (date.today() + timedelta(days=3)).isoformat()
+    event_type_id = host["event_type"]["id"]
+
+    with query_budget(3):
+        response = client.get(f"/public/availability/{event_type_id}", params={"date": day})
+    assert response.status_code == 200
+
+    with query_budget(3):
+        response = client.get(
+            "/api/timeslots",
+            params={"start_date": f"{day}T00:00:00", "end_date": f"{day}T23:00:00", "event_type_id": event_type_id},
+            headers=host["headers"]
+        )
+    assert response.status_code == 200
+    assert len(response.json()) == 16
+
+
+def test_cancel_fetches_host_context_once(client, host, query_budget):
+    start = f"{(date.today() + timedelta(days=3)).isoformat()}T09:00:00"
+    created = client.post("/api/events", headers=host["headers"], json={
+        "title": "Planning",
+        "attendee_name": "Attendee",
+        "start_time": start,
+        "end_time": start.replace("09:00", "09:30")
+    }).json()
+
+    # User, event, host context, delete
+    with query_budget(4):
+        response = client.request(
+            "DELETE", f"/api/events/{created['id']}/cancel", headers=host["headers"], json={"reason": "moved"}
+        )
+    assert response.status_code == 200
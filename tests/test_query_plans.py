@@ -0,0 +1,131 @@
+# backend/tests/test_query_plans.py
+"""Every query the endpoints issue must be answerable from an index.
+
+Statements are captured while exercising the API, then replayed through
+SQLite's EXPLAIN QUERY PLAN. A plain `SCAN <table>` means a full table scan.
+"""
+import re
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.core.archive import archive_events
+from app.db.database import Base, async_engine, engine
+
+SCAN = re.compile(r"^SCAN (\w+)(?! USING (?:COVERING )?INDEX)")
+
+
+@contextmanager
+def captured_statements():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+
+def full_scans(statements):
+    tables = set(Base.metadata.tables)
+    problems = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            for row in plan:
+                match = SCAN.match(row[-1])
+                if match and match.group(1) in tables:
+                    problems.append(f"{row[-1]}\n    {' '.join(statement.split())}")
+    return problems
+
+
+@pytest.fixture
+def host(client, auth_headers):
+    event_type = client.post(
+        "/api/event-types",
+        json={"name": "Intro Call", "duration": 30},
+        headers=auth_headers
+    ).json()
+    return {"headers": auth_headers, "event_type": event_type}
+
+
+def exercise_api(client, host):
+    headers = host["headers"]
+    event_type = host["event_type"]
+    day = (date.today() + timedelta(days=3)).isoformat()
+    start = datetime.fromisoformat(f"{day}T09:00:00")
+
+    client.get("/api/auth/me", headers=headers)
+    client.get("/api/profile/me", headers=headers)
+    client.get("/api/settings", headers=headers)
+    client.get("/api/event-types", headers=headers)
+    client.get(f"/api/event-types/{event_type['id']}", headers=headers)
+    client.get(
+        f"/api/event-types/{event_type['id']}/availability",
+        params={"start_date": f"{day}T00:00:00", "end_date": f"{day}T23:59:00"},
+        headers=headers
+    )
+    client.get(
+        "/api/timeslots",
+        params={"start_date": f"{day}T00:00:00", "end_date": f"{day}T12:00:00", "event_type_id": event_type["id"]},
+        headers=headers
+    )
+
+    created = client.post("/api/events", headers=headers, json={
+        "title": "Planning",
+        "attendee_name": "Second Attendee",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=30)).isoformat()
+    }).json()
+    client.put(f"/api/events/{created['id']}", headers=headers, json={
+        "title": "Planning",
+        "start_time": (start + timedelta(hours=1)).isoformat(),
+        "end_time": (start + timedelta(hours=1, minutes=30)).isoformat()
+    })
+    client.get(f"/api/events/{created['id']}", headers=headers)
+
+    client.get(f"/public/event-types/{event_type['slug']}")
+    client.get(f"/public/event-types/{event_type['id']}", params={"by_id": True})
+    client.get(f"/public/availability/{event_type['id']}", params={"date": day})
+    booking = client.post("/public/bookings", json={
+        "event_type_id": event_type["id"],
+        "date": day,
+        "time": "11:00",
+        "name": "Attendee",
+        "email": "attendee@example.com",
+        "phone": "+15551234567",
+        "location": "Phone"
+    }).json()
+    client.get(f"/public/bookings/{booking['id']}")
+    client.get(f"/public/profile/{event_type['user_id']}")
+
+    page = client.get("/api/events", params={"limit": 1, "include_total": True}, headers=headers).json()
+    client.get("/api/events", params={"status": "upcoming", "cursor": page["next_cursor"]}, headers=headers)
+    search = client.get("/api/events", params={"q": "attendee", "limit": 1}, headers=headers).json()
+    assert page["next_cursor"] and search["next_cursor"]
+    client.get("/api/events", params={"q": "attendee", "cursor": search["next_cursor"]}, headers=headers)
+    client.get("/api/events", params={"status": "past", "include_total": True}, headers=headers)
+    client.get("/api/events", params={"status": "past", "q": "attendee"}, headers=headers)
+    client.portal.call(lambda: archive_events(0))
+
+    client.post("/api/events/bulk-cancel", headers=headers, json={
+        "reason": "moved", "start": f"{day}T12:00:00", "end": f"{day}T18:00:00"
+    })
+    client.request("DELETE", f"/api/events/{created['id']}/cancel", headers=headers, json={"reason": "moved"})
+
+
+def test_endpoint_queries_use_indexes(client, host):
+    # A failing request would skip its queries, so insist every call succeeds
+    client.event_hooks["response"].append(lambda response: response.raise_for_status())
+    with captured_statements() as statements:
+        exercise_api(client, host)
+
+    assert len(statements) > 20
+    problems = full_scans(statements)
+    assert not problems, "Full table scans:\n" + "\n".join(problems)
@@ -0,0 +1,73 @@
+# backend/tests/test_query_stats.py
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+
+from app.core.config import get_settings
+from app.db import query_stats
+from app.db.database import get_db
+from app.db.query_stats import QueryStatsMiddleware, route_stats
+from app.models.user import User
+
+INTERNAL = {"X-Internal-Token": "internal-secret"}
+
+
+def test_server_timing_and_route_totals(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(get_settings(), "INTERNAL_API_TOKEN", "internal-secret")
+    route_stats.clear()
+
+    response = client.get("/api/auth/me", headers={**auth_headers, **INTERNAL})
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="1 queries"')
+    client.get("/api/auth/me", headers=auth_headers)
+
+    stats = client.get("/api/internal/query-stats", headers=INTERNAL).json()
+    me = stats["GET /api/auth/me"]
+    assert (me["requests"], me["queries"], me["max_queries"], me["nplusone_requests"]) == (2, 2, 1, 0)
+
+
+def test_server_timing_is_only_sent_to_internal_requests(client, auth_headers, monkeypatch):
+    assert "server-timing" not in client.get("/api/auth/me", headers=auth_headers).headers
+    # No token configured: nothing counts as internal
+    assert "server-timing" not in client.get("/api/auth/me", headers={**auth_headers, "X-Internal-Token": ""}).headers
+
+    monkeypatch.setattr(get_settings(), "INTERNAL_API_TOKEN", "internal-secret")
+    assert "server-timing" not in client.get("/api/auth/me", headers={**auth_headers, "X-Internal-Token": "guess"}).headers
+    assert "server-timing" in client.get("/api/auth/me", headers={**auth_headers, **INTERNAL}).headers
+
+    monkeypatch.setattr(query_stats.settings, "QUERY_STATS_SERVER_TIMING", True)
+    assert "server-timing" in client.get("/public/profile/1").headers
+
+
+def test_unknown_methods_share_one_route_key(client):
+    route_stats.clear()
+    for method in ("FOO", "BAR", "PROPFIND", "PURGE"):
+        client.request(method, "/nowhere")
+    client.request("DELETE", "/nowhere")
+    assert sorted(route_stats) == ["DELETE unmatched", "OTHER unmatched"]
+    assert route_stats["OTHER unmatched"].requests == 4
+
+
+def test_repeated_statements_are_flagged_as_nplusone(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(query_stats.settings, "QUERY_STATS_SERVER_TIMING", True)
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/loop/{times}")
+    async def loop(times: int, db=Depends(get_db)):
+        for user_id in range(times):
+            await db.scalar(select(User).where(User.id == user_id))
+        await db.execute(text("SELECT 1"))
+        return {}
+
+    route_stats.clear()
+    with TestClient(app) as bench:
+        assert bench.get("/loop/2").headers["server-timing"].endswith('desc="3 queries"')
+        bench.get("/loop/8")
+
+    stats = route_stats["GET /loop/{times}"].snapshot()
+    assert (stats["requests"], stats["queries"], stats["max_queries"]) == (2, 12, 9)
+    assert stats["nplusone_requests"] == 1
+    [repeat] = stats["repeated_statements"]
+    assert repeat["max_per_request"] == 8
+    assert repeat["statement"].startswith("SELECT users.")
@@ -0,0 +1,84 @@
+# backend/tests/test_rate_limit.py
+import asyncio
+
+from fastapi.testclient import TestClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app.api.endpoints import auth as auth_endpoints
+from app.core import rate_limit
+from app.core.rate_limit import MemoryBackend, parse_rate
+
+
+def test_login_is_limited_per_account_before_any_work(client, auth_headers, monkeypatch, query_budget):
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_LOGIN_PER_ACCOUNT", "4/minute")
+    checks = []
+    verify = auth_endpoints.verify_password
+
+    async def counting_verify(*args):
+        checks.append(args)
+        return await verify(*args)
+
+    monkeypatch.setattr(auth_endpoints, "verify_password", counting_verify)
+    # auth_headers already logged in once; the account key ignores case
+    wrong = {"username": "Host@Example.com", "password": "guess"}
+    assert [client.post("/api/auth/token", data=wrong).status_code for _ in range(2)] == [401, 401]
+    right = {"username": "host@example.com", "password": "secret-password"}
+    assert client.post("/api/auth/token", data=right).status_code == 200
+
+    with query_budget(0):
+        response = client.post("/api/auth/token", data=wrong)
+    assert response.status_code == 429
+    assert 0 < int(response.headers["retry-after"]) <= 15
+    assert len(checks) == 1
+
+    # Other accounts from the same address are unaffected
+    assert client.post("/api/auth/token", data={"username": "other@example.com", "password": "x"}).status_code == 401
+
+
+def test_public_reads_are_limited_per_ip(client, monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_PUBLIC_PER_IP", "2/minute")
+    codes = [client.get("/public/profile/1").status_code for _ in range(3)]
+    assert codes == [404, 404, 429]
+    assert rate_limit.limiter.metrics()["rejected"]["public-ip"] >= 1
+
+
+def test_clients_behind_a_trusted_proxy_get_their_own_limits(client, monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_PUBLIC_PER_IP", "2/minute")
+    monkeypatch.setattr(rate_limit.limiter, "unresolved_proxy_requests", 0)
+    # What uvicorn does when FORWARDED_ALLOW_IPS covers the proxy
+    with TestClient(ProxyHeadersMiddleware(client.app, trusted_hosts="testclient")) as proxied:
+        first = [proxied.get("/public/profile/1", headers={"X-Forwarded-For": "203.0.113.7"}).status_code for _ in range(3)]
+        second = proxied.get("/public/profile/1", headers={"X-Forwarded-For": "198.51.100.2, 203.0.113.9"}).status_code
+    assert first == [404, 404, 429] and second == 404
+    assert rate_limit.limiter.unresolved_proxy_requests == 0
+
+
+def test_untrusted_proxy_headers_are_reported(client, monkeypatch, capsys):
+    monkeypatch.setattr(rate_limit.limiter, "unresolved_proxy_requests", 0)
+    for address in ("203.0.113.7", "198.51.100.2"):
+        client.get("/public/profile/1", headers={"X-Forwarded-For": address})
+    assert capsys.readouterr().out.count("FORWARDED_ALLOW_IPS") == 1
+    assert rate_limit.limiter.metrics()["unresolved_proxy_requests"] == 2
+
+    # A header naming where the address comes from resolves it
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_FORWARDED_HEADER", "X-Forwarded-For")
+    client.get("/public/profile/1", headers={"X-Forwarded-For": "203.0.113.7"})
+    assert rate_limit.limiter.unresolved_proxy_requests == 2
+
+
+def test_gcra_allows_the_burst_then_one_per_interval():
+    async def scenario():
+        backend = MemoryBackend(max_keys=2)
+        interval, tolerance = parse_rate("3/second")
+        burst = [await backend.hit("a", interval, tolerance) for _ in range(4)]
+        assert burst[:3] == [0.0, 0.0, 0.0]
+        assert 0 < burst[3] <= interval
+        await asyncio.sleep(burst[3])
+        assert await backend.hit("a", interval, tolerance) == 0.0
+
+        # Bounded state: the least recently used key is forgotten
+        await backend.hit("b", interval, tolerance)
+        await backend.hit("c", interval, tolerance)
+        assert [await backend.hit("a", interval, tolerance) for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    asyncio.run(scenario())
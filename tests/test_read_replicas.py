@@ -0,0 +1,110 @@
+# backend/tests/test_read_replicas.py
+"""Read-only endpoints go to a replica; a client that just wrote reads the primary.
+
+A second SQLite file stands in for the replica. It never receives the
+primary's writes, which makes "which database answered" easy to observe.
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db import replicas
+from app.db.database import Base
+from app.db.replicas import PIN_COOKIE, ReplicaSet
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    path = tmp_path / "replica.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+    replica_set = ReplicaSet([f"sqlite:///{path}"], 30)
+    monkeypatch.setattr(replicas, "replica_set", replica_set)
+    yield sync_engine
+    sync_engine.dispose()
+
+
+def test_reads_are_served_by_replica(client, replica):
+    with replica.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, hashed_password, is_active) "
+            "VALUES (1000, 'replica@example.com', 'x', 1)"
+        ))
+        conn.execute(text(
+            "INSERT INTO events (id, user_id, event_type_id, title, start_time, end_time, attendee_name, "
+            "attendee_email, attendee_phone, location, created_at) VALUES (1000, 1000, 1, 'Call', "
+            "'2030-01-01 09:00:00', '2030-01-01 09:30:00', 'Replica Only', 'replica@example.com', "
+            "'+15551234567', 'Phone', '2029-12-01 00:00:00')"
+        ))
+
+    response = client.get("/public/bookings/1000")
+    assert response.status_code == 200
+    assert response.json()["attendee_name"] == "Replica Only"
+
+
+def test_public_page_cache_is_filled_from_the_primary(client, auth_headers, replica):
+    event_type = client.post(
+        "/api/event-types",
+        json={"name": "Intro Call", "duration": 30},
+        headers=auth_headers
+    ).json()
+    user_id = event_type["user_id"]
+    client.put("/api/profile/me", data={"profile_data": '{"full_name": "Ada Host"}'}, headers=auth_headers)
+    # The replica lags behind both edits
+    with replica.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, hashed_password, is_active) VALUES (:id, 'stale@example.com', 'x', 1)"
+        ), {"id": user_id})
+        conn.execute(text("INSERT INTO profiles (user_id, full_name) VALUES (:id, 'Stale Host')"), {"id": user_id})
+        conn.execute(text(
+            "INSERT INTO event_types (id, user_id, name, slug, duration, color, is_active) "
+            "VALUES (:id, :user_id, 'Stale Call', :slug, 15, '#3B82F6', 1)"
+        ), {"id": event_type["id"], "user_id": user_id, "slug": event_type["slug"]})
+
+    client.cookies.clear()
+    public = client.get(f"/public/event-types/{event_type['slug']}").json()
+    assert (public["name"], public["host_name"]) == ("Intro Call", "Ada Host")
+    assert client.get(f"/public/profile/{user_id}").json()["full_name"] == "Ada Host"
+
+
+def test_booking_pins_reads_to_primary(client, auth_headers, replica):
+    event_type = client.post(
+        "/api/event-types",
+        json={"name": "Intro Call", "duration": 30},
+        headers=auth_headers
+    ).json()
+    day = (date.today() + timedelta(days=3)).isoformat()
+
+    response = client.post("/public/bookings", json={
+        "event_type_id": event_type["id"],
+        "date": day,
+        "time": "11:00",
+        "name": "Attendee",
+        "email": "attendee@example.com",
+        "phone": "+15551234567",
+        "location": "Phone"
+    })
+    assert response.status_code == 200
+    assert PIN_COOKIE in response.cookies
+    booking_id = response.json()["id"]
+
+    assert client.get(f"/public/bookings/{booking_id}").status_code == 200
+
+    # Without the pin the read goes to the replica, which has not seen the booking
+    client.cookies.clear()
+    assert client.get(f"/public/bookings/{booking_id}").status_code == 404
+
+
+def test_unreachable_replica_is_ejected(client, auth_headers, tmp_path, monkeypatch):
+    replica_set = ReplicaSet([f"sqlite:///{tmp_path}/missing/replica.db"], 30)
+    monkeypatch.setattr(replicas, "replica_set", replica_set)
+
+    response = client.get("/api/event-types", headers=auth_headers)
+    assert response.status_code == 200
+    assert replica_set.status()[0]["healthy"] is False
+    assert replica_set.status()[0]["ejections"] == 1
+
+    # Ejected replicas are skipped without another connection attempt
+    client.get("/api/event-types", headers=auth_headers)
+    assert replica_set.status()[0]["ejections"] == 1
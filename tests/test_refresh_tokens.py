@@ -0,0 +1,66 @@
+# backend/tests/test_refresh_tokens.py
+from app.api.endpoints import auth as auth_endpoints
+from app.core.refresh_tokens import revoked_families, sync_revocations
+
+CREDENTIALS = {"username": "host@example.com", "password": "secret-password"}
+
+
+def login(client) -> dict:
+    client.post("/api/auth/signup", json={"email": CREDENTIALS["username"], "password": CREDENTIALS["password"]})
+    tokens = client.post("/api/auth/token", data=CREDENTIALS).json()
+    assert tokens["refresh_token"] and tokens["expires_in"] > 0
+    return tokens
+
+
+def bearer(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+def test_refresh_rotates_without_a_password_check(client, monkeypatch, query_budget):
+    tokens = login(client)
+
+    async def no_bcrypt(*args):
+        raise AssertionError("refresh must not verify a password")
+
+    monkeypatch.setattr(auth_endpoints, "verify_password", no_bcrypt)
+    # Lookup, claim the old token, insert its successor
+    with query_budget(3):
+        response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    renewed = response.json()
+    assert renewed["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/api/auth/verify-token", headers=bearer(renewed)).status_code == 200
+
+
+def test_reused_refresh_token_revokes_the_session(client):
+    tokens = login(client)
+    renewed = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+
+    # Replaying the old token: someone else has a copy, so the whole session ends
+    replay = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+    assert client.post("/api/auth/refresh", json={"refresh_token": renewed["refresh_token"]}).status_code == 401
+    assert client.get("/api/auth/verify-token", headers=bearer(renewed)).status_code == 401
+
+    # Other sessions of the same user carry on
+    assert client.get("/api/auth/verify-token", headers=bearer(login(client))).status_code == 200
+
+
+def test_logout_revokes_access_tokens_in_every_worker(client, query_budget):
+    tokens = login(client)
+    other_session = client.post("/api/auth/token", data=CREDENTIALS).json()
+    assert client.post("/api/auth/logout", headers=bearer(tokens)).status_code == 200
+
+    with query_budget(0):
+        assert client.get("/api/auth/verify-token", headers=bearer(tokens)).status_code == 401
+    assert client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert client.get("/api/auth/verify-token", headers=bearer(other_session)).status_code == 200
+
+    # A worker that did not handle the logout learns about it from the table
+    revoked_families.clear()
+    assert client.get("/api/auth/verify-token", headers=bearer(tokens)).status_code == 200
+    client.portal.call(sync_revocations)
+    assert client.get("/api/auth/verify-token", headers=bearer(tokens)).status_code == 401
+
+    assert client.post("/api/auth/logout", json={"refresh_token": other_session["refresh_token"]}).status_code == 200
+    assert client.get("/api/auth/verify-token", headers=bearer(other_session)).status_code == 401
@@ -0,0 +1,71 @@
+# backend/tests/test_schedule.py
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.schedule import ScheduleError, WorkingSchedule
+
+
+def test_compile_builds_minute_windows_per_weekday():
+    schedule = WorkingSchedule.compile({
+        "monday": {"start": "09:00", "end": "17:30", "enabled": True},
+        "tuesday": {"start": "09:00", "end": "17:00", "enabled": False},
+    })
+    assert schedule.windows(date(2026, 10, 19)) == ((540, 1050),)  # a Monday
+    assert schedule.windows(date(2026, 10, 20)) == ()
+    assert schedule.windows(date(2026, 10, 25)) == ()
+
+
+@pytest.mark.parametrize("working_hours", [
+    {"mondays": {"start": "09:00", "end": "17:00", "enabled": True}},
+    {"monday": {"start": "9am", "end": "17:00", "enabled": True}},
+    {"monday": {"start": "09:00", "end": "25:00", "enabled": True}},
+    {"monday": {"start": "17:00", "end": "09:00", "enabled": True}},
+    {"monday": {"enabled": True}},
+    {"monday": "09:00-17:00"},
+])
+def test_compile_rejects_invalid_hours(working_hours):
+    with pytest.raises(ScheduleError):
+        WorkingSchedule.compile(working_hours)
+
+
+def next_weekday(weekday: int) -> date:
+    day = date.today() + timedelta(days=1)
+    return day + timedelta(days=(weekday - day.weekday()) % 7)
+
+
+def test_updated_hours_replace_cached_schedule(client, auth_headers):
+    settings = client.get("/api/settings", headers=auth_headers).json()
+    event_type = client.post(
+        "/api/event-types",
+        json={"name": "Intro Call", "duration": 30},
+        headers=auth_headers
+    ).json()
+    monday = next_weekday(0).isoformat()
+
+    slots = client.get(f"/public/availability/{event_type['id']}", params={"date": monday}).json()
+    assert len(slots["available_slots"]) == 16
+
+    client.post("/public/bookings", json={
+        "event_type_id": event_type["id"],
+        "date": monday,
+        "time": "11:00",
+        "name": "Attendee",
+        "email": "attendee@example.com",
+        "phone": "+15551234567",
+        "location": "Phone"
+    })
+    slots = client.get(f"/public/availability/{event_type['id']}", params={"date": monday}).json()
+    assert "11:00" not in slots["available_slots"]
+    assert len(slots["available_slots"]) == 15
+
+    settings["working_hours"]["monday"] = {"start": "13:00", "end": "14:00", "enabled": True}
+    assert client.put("/api/settings", json=settings, headers=auth_headers).status_code == 200
+    slots = client.get(f"/public/availability/{event_type['id']}", params={"date": monday}).json()
+    assert slots["available_slots"] == ["13:00", "13:30"]
+
+    settings["working_hours"]["monday"] = {"start": "14:00", "end": "13:00", "enabled": True}
+    response = client.put("/api/settings", json=settings, headers=auth_headers)
+    assert response.status_code == 400
+    slots = client.get(f"/public/availability/{event_type['id']}", params={"date": monday}).json()
+    assert slots["available_slots"] == ["13:00", "13:30"]
@@ -0,0 +1,82 @@
+# backend/tests/test_search.py
+"""The FTS5 index is maintained by triggers; searches must follow every write."""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.core.archive import archive_events
+from app.db.database import SessionLocal
+from app.models.event import Event
+
+
+def search(client, headers, q, **params):
+    response = client.get("/api/events", params={"q": q, **params}, headers=headers)
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()["items"]]
+
+
+def indexed(table_name, term):
+    """Rowids the FTS index itself holds for `term`; a join on the content table would hide stale ones"""
+    with SessionLocal() as db:
+        return db.scalars(text(f"SELECT rowid FROM {table_name}_fts WHERE {table_name}_fts MATCH :term"), {"term": term}).all()
+
+
+def create_event(client, headers, title, days_ahead):
+    start = datetime.combine(date.today() + timedelta(days=days_ahead), datetime.min.time()).replace(hour=9)
+    return client.post("/api/events", json={
+        "title": title,
+        "attendee_name": "Grace Hopper",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=30)).isoformat()
+    }, headers=headers).json()
+
+
+def test_title_updates_are_reindexed(client, auth_headers):
+    event = create_event(client, auth_headers, "Quarterly planning", 2)
+    create_event(client, auth_headers, "Planning poker", 3)
+    assert len(search(client, auth_headers, "quarterly")) == 1
+
+    client.put(f"/api/events/{event['id']}", json={**event, "title": "Budget retro"}, headers=auth_headers)
+    assert search(client, auth_headers, "quarterly") == []
+    assert search(client, auth_headers, "retro") == [event["id"]]
+    # Columns the update didn't touch are still searchable
+    assert search(client, auth_headers, "hopper budget") == [event["id"]]
+    assert len(search(client, auth_headers, "planning")) == 1
+
+
+def test_deleted_events_leave_the_index(client, auth_headers):
+    event = create_event(client, auth_headers, "Vendor demo", 2)
+    kept = create_event(client, auth_headers, "Vendor call", 3)
+    assert sorted(search(client, auth_headers, "vendor")) == sorted([event["id"], kept["id"]])
+
+    response = client.request("DELETE", f"/api/events/{event['id']}/cancel", json={"reason": "Moved"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert search(client, auth_headers, "vendor") == [kept["id"]]
+    assert search(client, auth_headers, "demo") == []
+    assert indexed("events", "demo") == []
+
+
+def test_archived_events_move_to_the_archive_index(client, auth_headers):
+    user_id = client.get("/api/auth/me", headers=auth_headers).json()["id"]
+    long_ago = datetime.now().replace(microsecond=0) - timedelta(days=400)
+    with SessionLocal() as db:
+        old = Event(user_id=user_id, title="Kickoff workshop", start_time=long_ago, end_time=long_ago + timedelta(hours=1))
+        db.add(old)
+        db.commit()
+        old_id = old.id
+    assert search(client, auth_headers, "kickoff", status="past") == [old_id]
+
+    assert client.portal.call(lambda: archive_events(365)) == 1
+    # Searched once from the hot table, once from the archive: no stale or duplicate hit
+    assert search(client, auth_headers, "kickoff") == [old_id]
+    assert search(client, auth_headers, "kickoff", status="upcoming") == []
+    assert indexed("events", "kickoff") == [] and len(indexed("events_archive", "kickoff")) == 1
+    assert search(client, auth_headers, "kickoff", status="past") == [old_id]
+    assert search(client, auth_headers, "workshop", status="past", include_total=True) == [old_id]
+
+
+def test_queries_without_words_match_nothing(client, auth_headers):
+    create_event(client, auth_headers, "Vendor demo", 2)
+    for q in ("!!!", "-", "  "):
+        assert search(client, auth_headers, q) == []
+    assert len(search(client, auth_headers, "")) == 1
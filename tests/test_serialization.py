@@ -0,0 +1,24 @@
+# backend/tests/test_serialization.py
+from datetime import date, datetime, timedelta
+
+from app.schemas.event import EventList
+
+
+def test_event_list_fast_path_matches_the_schema(client, auth_headers):
+    start = datetime.combine(date.today() + timedelta(days=2), datetime.min.time()) + timedelta(hours=9, microseconds=1500)
+    created = client.post("/api/events", headers=auth_headers, json={
+        "title": "Planning",
+        "attendee_name": "Zoë Attendee",
+        "attendee_phone": "+15550100",
+        "answers": {"agenda": "Roadmap", "size": 3},
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=30)).isoformat()
+    }).json()
+
+    response = client.get("/api/events", params={"include_total": True}, headers=auth_headers)
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    # Same item, field for field, as the validated single-event endpoint
+    assert body["items"] == [client.get(f"/api/events/{created['id']}", headers=auth_headers).json()]
+    assert body["total"] == 1 and body["next_cursor"] is None
+    EventList.model_validate(body)
@@ -0,0 +1,83 @@
+# backend/tests/test_smtp_pool.py
+import asyncio
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtplib import SMTPException
+
+from app.core.email import pool
+from app.core.email.pool import SMTPPool, build_message, smtp_security
+
+
+class Inbox:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted"
+
+
+@pytest.fixture
+def plain_smtp_server():
+    """A server that offers no STARTTLS, like one an attacker stripped it from"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    inbox = Inbox()
+    controller = Controller(inbox, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield port, inbox
+    controller.stop()
+
+
+def account(port, **extra):
+    return {"smtp_server": "127.0.0.1", "smtp_port": port, "from_email": "host@example.com", **extra}
+
+
+def send(email_settings):
+    async def scenario():
+        smtp_pool = SMTPPool(max_idle_per_account=1, idle_timeout=60.0)
+        try:
+            await smtp_pool.send(email_settings, build_message(email_settings, "a@example.com", "Hi", "Body"))
+        finally:
+            smtp_pool.close()
+    asyncio.run(scenario())
+
+
+def test_security_defaults_by_port_and_rejects_unknown_modes():
+    assert smtp_security(account(465)) == "ssl"
+    assert smtp_security(account(587)) == "starttls"
+    assert smtp_security(account(25, smtp_security="none")) == "none"
+    with pytest.raises(ValueError):
+        smtp_security(account(587, smtp_security="maybe"))
+
+
+def test_connections_request_the_configured_tls_mode(monkeypatch):
+    opened = []
+
+    class FakeSMTP:
+        def __init__(self, **kwargs):
+            opened.append(kwargs)
+
+        async def connect(self):
+            pass
+
+    monkeypatch.setattr(pool, "SMTP", FakeSMTP)
+    for email_settings in (account(465), account(587), account(2525, smtp_security="ssl")):
+        asyncio.run(SMTPPool(1, 60.0)._open(email_settings))
+    assert [(kwargs["use_tls"], kwargs["start_tls"]) for kwargs in opened] == [
+        (True, False), (False, True), (True, False)
+    ]
+
+
+def test_starttls_is_required_rather_than_skipped(plain_smtp_server):
+    port, inbox = plain_smtp_server
+    with pytest.raises(SMTPException, match="STARTTLS"):
+        send(account(port))
+    assert inbox.messages == []
+
+    # Only an explicit opt-out sends in plain text
+    send(account(port, smtp_security="none"))
+    assert len(inbox.messages) == 1
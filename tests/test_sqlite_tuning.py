@@ -0,0 +1,60 @@
+# backend/tests/test_sqlite_tuning.py
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.db.sqlite_tuning import WriterQueue, install_pragmas, is_sqlite_file
+
+
+def test_only_file_backed_sqlite_is_tuned():
+    assert is_sqlite_file("sqlite:///./sql_app.db")
+    assert not is_sqlite_file("sqlite://")
+    assert not is_sqlite_file("sqlite:///:memory:")
+    assert not is_sqlite_file("postgresql://u:p@db/app")
+
+
+def test_writes_queue_while_reads_run_concurrently(tmp_path):
+    async def scenario():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'tuned.db'}", poolclass=AsyncAdaptedQueuePool, pool_size=4
+        )
+        install_pragmas(engine.sync_engine)
+        queue = WriterQueue(timeout=5)
+        queue.install(engine.sync_engine)
+
+        async with engine.connect() as conn:
+            assert (await conn.scalar(text("PRAGMA journal_mode"))) == "wal"
+            assert (await conn.scalar(text("PRAGMA synchronous"))) == 1  # NORMAL
+            await conn.execute(text("CREATE TABLE counter (n INTEGER)"))
+            await conn.execute(text("INSERT INTO counter VALUES (0)"))
+            await conn.commit()
+
+        writer = await engine.connect()
+        await writer.execute(text("UPDATE counter SET n = n + 1"))
+        assert queue.stats()["acquired"] == 2  # setup insert + this update
+
+        # A second writer waits for the first to go back to the pool...
+        async def second_write():
+            async with engine.connect() as conn:
+                await conn.execute(text("UPDATE counter SET n = n + 1"))
+                await conn.commit()
+
+        waiting = asyncio.create_task(second_write())
+        await asyncio.sleep(0.2)
+        assert not waiting.done()
+
+        # ...while readers are not held up and see the last committed value
+        async with engine.connect() as reader:
+            assert (await reader.scalar(text("SELECT n FROM counter"))) == 0
+
+        await writer.commit()
+        await writer.close()
+        await asyncio.wait_for(waiting, 5)
+        async with engine.connect() as reader:
+            assert (await reader.scalar(text("SELECT n FROM counter"))) == 2
+        assert queue.stats() == {"acquired": 3, "timeouts": 0}
+        await engine.dispose()
+
+    asyncio.run(scenario())
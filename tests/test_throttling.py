@@ -0,0 +1,75 @@
+# backend/tests/test_throttling.py
+import asyncio
+import time
+
+import pytest
+
+from app.core.throttling import OutboundLimiter, QueueExpiredError, QueueFullError, TokenBucket
+
+
+def test_bucket_allows_a_burst_then_refills_at_the_rate():
+    async def scenario():
+        bucket = TokenBucket(rate=50.0, capacity=3, max_queue=10, queue_ttl=1.0)
+        started = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        burst = time.monotonic() - started
+        await bucket.acquire()
+        return burst, time.monotonic() - started, bucket.granted
+
+    burst, total, granted = asyncio.run(scenario())
+    assert burst < 0.01
+    # The fourth send waits for one token at 50/s
+    assert 0.015 <= total < 0.2
+    assert granted == 4
+
+
+def test_waiters_are_served_in_arrival_order():
+    async def scenario():
+        bucket = TokenBucket(rate=100.0, capacity=1, max_queue=10, queue_ttl=1.0)
+        order = []
+
+        async def send(n):
+            await bucket.acquire()
+            order.append(n)
+
+        tasks = []
+        for n in range(5):
+            tasks.append(asyncio.create_task(send(n)))
+            await asyncio.sleep(0)  # queue them in a known order
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 3, 4]
+
+
+def test_waiters_expire_after_the_queue_ttl_and_the_queue_is_bounded():
+    async def scenario():
+        bucket = TokenBucket(rate=0.1, capacity=1, max_queue=2, queue_ttl=0.05)
+        await bucket.acquire()
+        first = asyncio.create_task(bucket.acquire())
+        second = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await bucket.acquire()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        return results, bucket
+
+    results, bucket = asyncio.run(scenario())
+    assert all(isinstance(result, QueueExpiredError) for result in results)
+    assert (bucket.expired, bucket.rejected, bucket.waiting) == (2, 1, 0)
+
+
+def test_limiter_keeps_a_bounded_number_of_accounts():
+    limiter = OutboundLimiter("email", rate=1.0, burst=2, max_queue=5, queue_ttl=1.0, max_accounts=3)
+    for n in range(10):
+        limiter.bucket(f"smtp.example.com:user{n}")
+    assert sorted(limiter.metrics()) == ["smtp.example.com:user7", "smtp.example.com:user8", "smtp.example.com:user9"]
+
+
+def test_try_acquire_never_waits():
+    limiter = OutboundLimiter("sms", rate=0.1, burst=2, max_queue=5, queue_ttl=1.0)
+    assert limiter.try_acquire("twilio:AC1") and limiter.try_acquire("twilio:AC1")
+    assert not limiter.try_acquire("twilio:AC1")
+    assert limiter.try_acquire("twilio:AC2")
+    assert limiter.metrics()["twilio:AC1"]["rejected"] == 1